@@ -0,0 +1,108 @@
+"""
+Benchmark of IPTransport, which buffers the received data and receives
+binary data into preallocated buffers, against the previous implementation
+that created a socket file for every readline and concatenated the received
+chunks of binary data.
+
+Both transports talk to the LoopbackSCPIServer used by the transport tests,
+so no hardware is needed. The server generates the binblocks for every
+request, which adds the same time to both transports.
+
+Usage:
+    python benchmarks/bench_ip_transport.py
+"""
+import time
+from pycqed.instrument_drivers.library.Transport import Transport, IPTransport
+from pycqed.instrument_drivers.library.SCPIBase import SCPIBase
+from pycqed.tests.instrument_drivers.library.test_Transport import \
+    LoopbackSCPIServer
+
+
+class PreviousIPTransport(IPTransport):
+    """
+    IPTransport before the receive buffer was added.
+    """
+
+    def write_binary(self, data: bytes) -> None:
+        exp_len = len(data)
+        act_len = 0
+        while True:
+            act_len += self._socket.send(data[act_len:exp_len])
+            if act_len == exp_len:
+                break
+
+    def read_binary(self, size: int) -> bytes:
+        data = self._socket.recv(size)
+        act_len = len(data)
+        exp_len = size
+        while act_len != exp_len:
+            data += self._socket.recv(exp_len - act_len)
+            act_len = len(data)
+        return data
+
+    def read_binary_into(self, buffer) -> None:
+        Transport.read_binary_into(self, buffer)
+
+    def readline(self) -> str:
+        return self._socket.makefile().readline()
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def benchmark(scpi, nr_queries, byte_cnts, repeat):
+    """
+    Returns the best times of nr_queries *IDN? queries and of reading the
+    binblocks with bin_block_read and bin_block_read_array.
+    """
+    t_queries = best_time(
+        lambda: [scpi._ask('*IDN?') for _ in range(nr_queries)], repeat)
+    t_bin_block, t_array = [], []
+    for byte_cnt in byte_cnts:
+        cmd = 'DATA? {}'.format(byte_cnt)
+        t_bin_block.append(best_time(lambda: scpi._ask_bin(cmd), repeat))
+
+        def read_array():
+            scpi._transport.write(cmd)
+            scpi.bin_block_read_array()
+        t_array.append(best_time(read_array, repeat))
+    return t_queries, t_bin_block, t_array
+
+
+def main(nr_queries=2000, byte_cnts=(10**5, 10**6, 10**7), repeat=5):
+    server = LoopbackSCPIServer()
+    results = {}
+    try:
+        # the server handles one connection at a time
+        for label, transport_class in [('previous', PreviousIPTransport),
+                                       ('buffered', IPTransport)]:
+            transport = transport_class('127.0.0.1', server.port)
+            try:
+                results[label] = benchmark(SCPIBase(label, transport),
+                                           nr_queries, byte_cnts, repeat)
+            finally:
+                transport.close()
+    finally:
+        server.close()
+
+    print('{} *IDN? queries (previous -> buffered):'.format(nr_queries))
+    print('  {:9.1f} ms -> {:6.1f} ms'.format(
+        1e3*results['previous'][0], 1e3*results['buffered'][0]))
+    print('Binblock reads, bin_block_read (previous -> buffered) and '
+          'bin_block_read_array (previous -> buffered):')
+    for i, byte_cnt in enumerate(byte_cnts):
+        print('  {:9d} bytes: {:7.1f} ms -> {:6.1f} ms, '
+              '{:7.1f} ms -> {:6.1f} ms'.format(
+                  byte_cnt,
+                  1e3*results['previous'][1][i], 1e3*results['buffered'][1][i],
+                  1e3*results['previous'][2][i], 1e3*results['buffered'][2][i]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the generation of randomized benchmarking sequences before and
+after the clifford hash tables were indexed in memory
+(get_clifford_hash_index) and the products of the single qubit cliffords
+were tabulated (get_single_qubit_clifford_product_table).
+
+The previous implementation is restored by patching the clifford group
+module: get_clifford_id reads and searches the hash table on every call,
+the single qubit cliffords are multiplied and inverted using their pauli
+transfer matrices and the pauli transfer matrices of the two qubit
+cliffords are constructed for every instance.
+
+Requires the clifford hash tables, which are generated using
+pycqed/measurement/randomized_benchmarking/generate_clifford_hash_tables.py
+
+Usage:
+    python benchmarks/bench_rb_sequences.py
+"""
+import time
+from contextlib import contextmanager
+from unittest import mock
+from zlib import crc32
+import numpy as np
+from pycqed.measurement.randomized_benchmarking import \
+    randomized_benchmarking as rb
+from pycqed.measurement.randomized_benchmarking import \
+    two_qubit_clifford_group as tqc
+
+
+def get_clifford_id_from_disk(pauli_transfer_matrix):
+    """
+    get_clifford_id before the hash tables were indexed in memory.
+    """
+    unique_hash = crc32(pauli_transfer_matrix.astype(int))
+    if np.array_equal(np.shape(pauli_transfer_matrix), (4, 4)):
+        hash_table = tqc.get_single_qubit_clifford_hash_table()
+    else:
+        hash_table = tqc.get_two_qubit_clifford_hash_table()
+    return hash_table.index(unique_hash)
+
+
+@contextmanager
+def previous_implementation():
+    two_qubit_clifford_init = tqc.TwoQubitClifford.__init__
+
+    def two_qubit_clifford_init_uncached(self, idx):
+        tqc._two_qubit_PTMs.pop(idx, None)
+        two_qubit_clifford_init(self, idx)
+
+    with mock.patch.object(tqc, 'get_clifford_id',
+                           get_clifford_id_from_disk), \
+            mock.patch.object(tqc.SingleQubitClifford, '__mul__',
+                              tqc.Clifford.__mul__), \
+            mock.patch.object(tqc.SingleQubitClifford, 'get_inverse',
+                              tqc.Clifford.get_inverse), \
+            mock.patch.object(tqc.TwoQubitClifford, '__init__',
+                              two_qubit_clifford_init_uncached):
+        yield
+
+
+def time_sequences(number_of_qubits, n_cl, seeds):
+    t0 = time.perf_counter()
+    sequences = [rb.randomized_benchmarking_sequence(
+        n_cl, desired_net_cl=0, number_of_qubits=number_of_qubits,
+        seed=seed) for seed in seeds]
+    t1 = time.perf_counter()
+    return t1 - t0, sequences
+
+
+def main(cases=((1, 1000, 50), (2, 200, 10))):
+    # the hash indices and the product table are computed on first use
+    for number_of_qubits in [1, 2]:
+        rb.randomized_benchmarking_sequence(
+            1, number_of_qubits=number_of_qubits, seed=0)
+
+    print('Throughput of randomized_benchmarking_sequence (before -> after):')
+    for number_of_qubits, n_cl, nr_seeds in cases:
+        seeds = range(nr_seeds)
+        with previous_implementation():
+            t_old, sequences_old = time_sequences(
+                number_of_qubits, n_cl, seeds)
+        # start without cached pauli transfer matrices
+        tqc._two_qubit_PTMs.clear()
+        t_new, sequences_new = time_sequences(number_of_qubits, n_cl, seeds)
+        for seq_old, seq_new in zip(sequences_old, sequences_new):
+            assert np.array_equal(seq_old, seq_new)
+        nr_cliffords = n_cl*nr_seeds
+        print('  {} qubit(s), n_cl={}, {} seeds: {:9.0f} -> {:9.0f} '
+              'Cliffords/s'.format(number_of_qubits, n_cl, nr_seeds,
+                                   nr_cliffords/t_old, nr_cliffords/t_new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of UHFQC.acquisition_poll, which writes the received result
+vectors into preallocated buffers, against the previous implementation that
+concatenated every received vector to the data of its channel.
+
+The UHFQC is emulated: MockDAQServer.poll returns the result vectors in
+chunks of poll_chunk_size samples, so the number of vectors that are
+collected grows with the number of samples.
+
+Usage:
+    python benchmarks/bench_uhfqc_acquisition_poll.py
+"""
+import time
+import numpy as np
+import pycqed.instrument_drivers.physical_instruments.ZurichInstruments.UHFQuantumController as UHF
+
+
+def acquisition_poll_concatenate(uhf, samples, acquisition_time=0.010):
+    """
+    UHFQC.acquisition_poll before the acquisition buffers were
+    preallocated (without arming the acquisition).
+    """
+    data = {k: [] for k, dummy in enumerate(uhf._acquisition_nodes)}
+    gotem = [False]*len(uhf._acquisition_nodes)
+    accumulated_time = 0
+
+    while accumulated_time < uhf.timeout() and not all(gotem):
+        dataset = uhf.poll(acquisition_time)
+        for n, p in enumerate(uhf._acquisition_nodes):
+            if p in dataset:
+                for v in dataset[p]:
+                    data[n] = np.concatenate((data[n], v['vector']))
+                    if len(data[n]) >= samples:
+                        gotem[n] = True
+        accumulated_time += acquisition_time
+    return data
+
+
+def time_acquisition(uhf, poll_func, samples):
+    uhf.acquisition_initialize(samples, averages=1, channels=(0, 1))
+    # the mock data is drawn using np.random
+    np.random.seed(0)
+    t0 = time.perf_counter()
+    data = poll_func(samples)
+    t1 = time.perf_counter()
+    uhf.acquisition_finalize()
+    return t1 - t0, data
+
+
+def main(chunk_size=64, nr_chunks=(1000, 2000, 4000, 8000)):
+    uhf = UHF.UHFQC(name='BENCH_UHF', server='emulator',
+                    device='dev2109', interface='1GbE')
+    try:
+        uhf.awg_sequence_acquisition()
+        uhf.daq.poll_chunk_size = chunk_size
+        print('Time to collect {}-sample vectors of 2 channels '
+              '(concatenate -> preallocated):'.format(chunk_size))
+        for n in nr_chunks:
+            samples = n*chunk_size
+            t_old, data_old = time_acquisition(
+                uhf, lambda s: acquisition_poll_concatenate(uhf, s), samples)
+            t_new, data_new = time_acquisition(
+                uhf, lambda s: uhf.acquisition_poll(s, arm=False), samples)
+            for ch in data_new:
+                assert np.array_equal(data_old[ch], data_new[ch])
+            print('  {:6d} vectors: {:9.1f} ms -> {:6.1f} ms'.format(
+                n, 1e3*t_old, 1e3*t_new))
+    finally:
+        uhf.close()
+
+
+if __name__ == '__main__':
+    main()
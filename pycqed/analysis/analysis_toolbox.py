@@ -2,18 +2,23 @@
 #
 import numpy as np
 import logging
+import hashlib
 import os
 import time
 import datetime
 import warnings
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from collections import OrderedDict as od
 from matplotlib import colors
 import pandas as pd
 from pycqed.utilities.get_default_datadir import get_default_datadir
+from pycqed.utilities import measurement_catalog
+from pycqed.analysis.tools.extraction_cache import ExtractionCache
 from scipy.interpolate import griddata
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 import h5py
+import sqlite3
 from scipy.signal import argrelextrema
 from scipy import optimize
 # to allow backwards compatibility with old a_tools code
@@ -31,6 +36,11 @@ from pycqed.analysis.tools.plotting import (set_xlabel, set_ylabel, set_cbarlabe
                                             data_to_table_png,
                                             SI_prefix_and_scale_factor)
 datadir = get_default_datadir()
+# If True, the measurement catalog in the datadir is used to look up the
+# measurement folders instead of listing the day folders.
+use_measurement_catalog = True
+# Cache used by get_data_from_timestamp_list if use_cache is True
+extraction_cache = ExtractionCache()
 print('Data directory set to:', datadir)
 
 
@@ -98,17 +108,61 @@ def is_equal(ts0, ts1, or_equal=False):
     return (dstamp0 + tstamp0) == (dstamp1 + tstamp1)
 
 
+def list_daydirs(folder):
+    """
+    Returns the sorted names of the folders in the data directory "folder".
+    Uses the measurement catalog of the data directory if
+    "use_measurement_catalog" is True and falls back to listing the data
+    directory.
+    """
+    if use_measurement_catalog:
+        catalog = measurement_catalog.get_catalog(folder)
+        if catalog is not None:
+            try:
+                return catalog.get_daydirs()
+            except sqlite3.Error as e:
+                logging.warning('Measurement catalog lookup failed: '
+                                '{}'.format(e))
+    return sorted(os.listdir(folder))
+
+
+def list_measdirs(folder, daystamp, force=False):
+    """
+    Returns the names of the measurement folders in the day folder
+    "folder/daystamp". Uses the measurement catalog of the data directory
+    if "use_measurement_catalog" is True and falls back to listing the
+    day folder.
+
+    force=True indexes the day folder again, to be used when a lookup
+    misses because the catalog is not up to date.
+    """
+    if use_measurement_catalog:
+        catalog = measurement_catalog.get_catalog(folder)
+        if catalog is not None:
+            try:
+                return catalog.get_measdirs(daystamp, force=force)
+            except sqlite3.Error as e:
+                logging.warning('Measurement catalog lookup failed: '
+                                '{}'.format(e))
+    return os.listdir(os.path.join(folder, daystamp))
+
+
 def return_last_n_timestamps(n, contains=''):
     timestamps = []
-    for i in range(n):
-        if i == 0:
-            timestamp = latest_data(contains=contains,
-                                    return_timestamp=True)[0]
+    older_than = None
+    while len(timestamps) < n:
+        # all matching measurements of the latest day are used before
+        # searching the previous days
+        search_dir, daydir, measdirs = latest_data(
+            contains=contains, older_than=older_than, return_all=True)
+        for measdir in reversed(measdirs):
+            timestamp = str(daydir) + str(measdir[:6])
+            if len(timestamps) > 0 and timestamp == timestamps[-1]:
+                continue
             timestamps.append(timestamp)
-        else:
-            timestamps.append(latest_data(contains=contains,
-                                          older_than=timestamps[-1],
-                                          return_timestamp=True)[0])
+            if len(timestamps) == n:
+                break
+        older_than = timestamps[-1]
     return timestamps
 
 
@@ -135,14 +189,12 @@ def latest_data(contains='', older_than=None, newer_than=None, or_equal=False,
     else:
         search_dir = folder
 
-    daydirs = os.listdir(search_dir)
+    daydirs = list_daydirs(search_dir)
 
     if len(daydirs) == 0:
         logging.warning('No data found in datadir')
         return None
 
-    daydirs.sort()
-
     measdirs = []
     i = len(daydirs) - 1
     while len(measdirs) == 0 and i >= 0:
@@ -150,8 +202,7 @@ def latest_data(contains='', older_than=None, newer_than=None, or_equal=False,
         # this makes sure that (most) non day dirs do not get searched
         # as they should start with a digit (e.g. YYYYMMDD)
         if daydir[0].isdigit():
-            all_measdirs = [d for d in os.listdir(
-                os.path.join(search_dir, daydir))]
+            all_measdirs = list_measdirs(search_dir, daydir)
             all_measdirs.sort()
             measdirs = []
             for d in all_measdirs:
@@ -214,10 +265,14 @@ def get_datafilepath_from_timestamp(timestamp):
     # Not only verifies but also decomposes the timestamp
     daystamp, tstamp = verify_timestamp(timestamp)
 
-    daydir = os.listdir(os.path.join(datadir, daystamp))
+    daydir = list_measdirs(datadir, daystamp)
 
     # Loooking for the folder starting with the right timestamp
     measdir_names = [item for item in daydir if item.startswith(tstamp)]
+    if len(measdir_names) == 0:
+        # the catalog can miss folders added by other processes
+        daydir = list_measdirs(datadir, daystamp, force=True)
+        measdir_names = [item for item in daydir if item.startswith(tstamp)]
 
     if len(measdir_names) > 1:
         raise ValueError('Timestamp is not unique')
@@ -238,18 +293,20 @@ def data_from_time(timestamp, folder=None):
     if (folder is None):
         folder = datadir
 
-    daydirs = os.listdir(folder)
-    if len(daydirs) == 0:
+    if len(list_daydirs(folder)) == 0:
         raise Exception('No data in the data directory specified')
 
-    daydirs.sort()
     daystamp, tstamp = verify_timestamp(timestamp)
 
     if not os.path.isdir(os.path.join(folder, daystamp)):
         raise KeyError("Requested day '%s' not found" % daystamp)
 
-    measdirs = [d for d in os.listdir(os.path.join(folder, daystamp))
+    measdirs = [d for d in list_measdirs(folder, daystamp)
                 if d[:6] == tstamp]
+    if len(measdirs) == 0:
+        # the catalog can miss folders added by other processes
+        measdirs = [d for d in list_measdirs(folder, daystamp, force=True)
+                    if d[:6] == tstamp]
     if len(measdirs) == 0:
         raise KeyError("Requested data '%s_%s' not found"
                        % (daystamp, tstamp))
@@ -525,7 +582,10 @@ def append_data_from_ma(ma, param_names, data, data_version=2,
 
     new_data = get_data_from_ma(ma, param_names_filter, data_version=data_version,
                                 numeric_params=numeric_params)
+    _append_data(new_data, param_names, data, filter_dict=filter_dict)
+
 
+def _append_data(new_data, param_names, data, filter_dict=None):
     if filter_dict is not None:
         for k, v in filter_dict.items():
             if new_data[k] != str(v):
@@ -538,6 +598,293 @@ def append_data_from_ma(ma, param_names, data, data_version=2,
             data[param].append(new_data[param])
 
 
+class _DatafileView:
+    """
+    Read-only view of a datafile that can be used instead of a
+    MeasurementAnalysis object to extract parameters with get_data_from_ma.
+
+    Only the requested paths are read from the datafile, the naming and
+    values of the experimental data (see
+    MeasurementAnalysis.get_naming_and_values) are read when one of them
+    is first accessed.
+    """
+    _naming_and_values_v1 = ('sweep_name', 'sweep_unit', 'value_names',
+                             'sweep_points', 'measured_values', 'ylabels',
+                             'xlabel')
+    _naming_and_values_v2 = ('parameter_names', 'sweep_name',
+                             'parameter_units', 'sweep_unit', 'value_names',
+                             'value_units', 'data', 'sweep_points',
+                             'measured_values', 'xlabel', 'parameter_labels',
+                             'ylabels')
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.h5filepath = measurement_filename(folder)
+        self.data_file = h5py.File(self.h5filepath, 'r')
+        for k in list(self.data_file.keys()):
+            if type(self.data_file[k]) == h5py.Group:
+                self.name = k
+        self.g = self.data_file['Experimental Data']
+        self.measurementstring = os.path.split(folder)[1]
+        daystamp = os.path.split(os.path.split(folder)[0])[1]
+        self.timestamp = daystamp + '/' + self.measurementstring[:6]
+        self.timestamp_string = daystamp + '_' + self.measurementstring[:6]
+        self.measurementstring = self.measurementstring[7:]
+        self.default_plot_title = self.measurementstring
+
+        if 'datasaving_format' in self.g.attrs:
+            self.datasaving_format = self.get_key('datasaving_format')
+        else:
+            self.datasaving_format = 'Version 1'
+        self._naming_and_values_read = False
+
+    def _naming_and_values(self):
+        if self.datasaving_format == 'Version 1':
+            return self._naming_and_values_v1
+        elif 'optimization_result' in self.g:
+            return self._naming_and_values_v2 + ('optimization_result', )
+        else:
+            return self._naming_and_values_v2
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(self._naming_and_values())
+
+    def __getattr__(self, name):
+        # only called for attributes that have not been set (yet)
+        if (name.startswith('_') or self._naming_and_values_read or
+                name not in self._naming_and_values()):
+            raise AttributeError(name)
+        self._naming_and_values_read = True
+        self.get_naming_and_values()
+        return getattr(self, name)
+
+    def get_key(self, key):
+        s = self.g.attrs[key]
+        # converts byte type to string because of h5py datasaving
+        if type(s) == bytes:
+            s = s.decode('utf-8')
+        # If it is an array of value decodes individual entries
+        if type(s) == np.ndarray:
+            s = [s.decode('utf-8') for s in s]
+        return s
+
+    def get_values(self, key):
+        if key in self.g:
+            # "Data" (Version 2) or one of the datasets of Version 1
+            values = self.g[key][()]
+        elif key in self.get_key('sweep_parameter_names'):
+            ind = self.get_key('sweep_parameter_names').index(key)
+            values = self.g['Data'][:, ind]
+        else:
+            ind = (self.get_key('value_names').index(key) +
+                   len(self.get_key('sweep_parameter_names')))
+            values = self.g['Data'][:, ind]
+        return np.asarray(values, dtype=np.float64)
+
+    def get_naming_and_values(self):
+        """
+        Reads the naming and values of the experimental data in the same
+        way as MeasurementAnalysis.get_naming_and_values (1D only).
+        """
+        if self.datasaving_format == 'Version 1':
+            self.sweep_name = self.get_key('sweep_parameter_name')
+            self.sweep_unit = self.get_key('sweep_parameter_unit')
+            self.value_names = self.get_key('value_names')
+            value_units = self.get_key('value_units')
+
+            self.sweep_points = self.get_values(self.sweep_name)
+            self.measured_values = [self.get_values(name)
+                                    for name in self.value_names]
+            self.ylabels = [str(name + '(' + unit + ')') for name, unit in
+                            zip(self.value_names, value_units)]
+            self.xlabel = str(self.sweep_name + '(' + self.sweep_unit + ')')
+
+        elif self.datasaving_format == 'Version 2':
+            self.parameter_names = self.get_key('sweep_parameter_names')
+            self.sweep_name = self.parameter_names[0]
+            self.parameter_units = self.get_key('sweep_parameter_units')
+            self.sweep_unit = self.parameter_units  # for legacy reasons
+            self.value_names = self.get_key('value_names')
+            self.value_units = self.get_key('value_units')
+
+            self.data = self.get_values('Data').transpose()
+            if len(self.parameter_names) == 1:
+                self.sweep_points = self.data[0, :]
+            else:
+                self.sweep_points = self.data[0:len(self.parameter_names), :]
+            self.measured_values = self.data[-len(self.value_names):, :]
+
+            self.xlabel = self.parameter_names[0] + ' (' + \
+                self.parameter_units[0] + ')'
+            self.parameter_labels = [a + ' (' + b + ')' for a, b in zip(
+                self.parameter_names, self.parameter_units)]
+            self.ylabels = [a + ' (' + b + ')' for a, b in zip(
+                self.value_names, self.value_units)]
+
+            if 'optimization_result' in self.g:
+                n = len(self.parameter_names)
+                opt_res = self.g['optimization_result'][()]
+                self.optimization_result = od({
+                    'generation': opt_res[:, 0],
+                    'evals': opt_res[:, 1],
+                    'xfavorite': opt_res[:, 2:2 + n],
+                    'stds': opt_res[:, 2 + n:2 + 2 * n],
+                    'fbest': opt_res[:, -n - 1],
+                    'xbest': opt_res[:, -n:]})
+        else:
+            raise ValueError('datasaving_format "%s " not recognized'
+                             % self.datasaving_format)
+
+    def finish(self):
+        self.data_file.close()
+
+
+def _get_content_signature(filepath, param_names, filter_no_analysis=False):
+    """
+    Returns a hash of the groups of the datafile the parameters are read
+    from by get_data_from_ma. Unlike the modification time of the
+    datafile, it does not change when an analysis saves its results to the
+    datafile, unless these results are extracted.
+    """
+    group_names = set()
+    for param in param_names:
+        if param == 'fit_params':
+            group_names.update(['Experimental Data', 'Analysis',
+                                'Instrument settings/MC',
+                                'Instrument settings/TD_Meas'])
+        elif '.' not in param:
+            group_names.update(['Experimental Data', 'Analysis/' + param])
+        else:
+            first = param.split('.')[0]
+            group_names.update(['Instrument settings/' + first,
+                                'Analysis/' + first, first])
+    if filter_no_analysis:
+        group_names.add('Analysis')
+
+    sha = hashlib.sha1()
+    with h5py.File(filepath, 'r') as data_file:
+        if 'name' in param_names:
+            sha.update(repr(list(data_file.keys())).encode('utf-8'))
+        for group_name in sorted(group_names):
+            sha.update(group_name.encode('utf-8'))
+            if group_name in data_file:
+                _hash_h5_object(sha, data_file[group_name])
+            else:
+                sha.update(b'\0')
+    return sha.hexdigest()
+
+
+def _hash_h5_object(sha, obj):
+    for name in sorted(obj.attrs.keys()):
+        sha.update(name.encode('utf-8'))
+        _hash_value(sha, obj.attrs[name])
+    if isinstance(obj, h5py.Dataset):
+        _hash_value(sha, obj[()])
+    else:
+        for name in sorted(obj.keys()):
+            sha.update(name.encode('utf-8'))
+            _hash_h5_object(sha, obj[name])
+
+
+def _hash_value(sha, value):
+    value = np.asarray(value)
+    if value.dtype.kind == 'O':
+        sha.update(repr(value.tolist()).encode('utf-8'))
+    else:
+        sha.update(repr((value.dtype.str, value.shape)).encode('utf-8'))
+        sha.update(value.tobytes())
+
+
+def _extract_data_from_timestamp(timestamp, param_names, TwoD=False,
+                                 filter_no_analysis=False,
+                                 ma_type='MeasurementAnalysis',
+                                 cache=None):
+    """
+    Extracts the parameters from the datafile of a single timestamp.
+    If cache (ExtractionCache) is specified, the extracted parameters are
+    read from and stored in the cache.
+
+    Returns a tuple (status, result) where status is one of
+        'data': result is the dictionary of extracted parameters,
+        'remove': the timestamp should be removed, result is None
+        'key_error': a KeyError occured, result is the exception,
+        'error': another exception occured, result is the exception.
+    """
+    if cache is not None:
+        cache_key = (timestamp, tuple(param_names), TwoD, filter_no_analysis,
+                     ma_type)
+        if ma_type == 'MeasurementAnalysis' and not TwoD:
+            def content_signature():
+                return _get_content_signature(filepath, param_names,
+                                              filter_no_analysis)
+        else:
+            # other analysis types can read any part of the datafile
+            content_signature = None
+        try:
+            filepath = get_datafilepath_from_timestamp(timestamp)
+            new_data = cache.get(cache_key, filepath, content_signature)
+        except (ValueError, OSError):
+            # The datafile could not be found, this is handled below
+            cache = None
+        else:
+            if new_data is not None:
+                return 'data', new_data
+
+    try:
+        if ma_type == 'MeasurementAnalysis' and not TwoD:
+            # Only the requested parameters are read from the datafile
+            ana = _DatafileView(data_from_time(timestamp))
+        else:
+            # dirty import inside this function to prevent circular import
+            from pycqed.analysis import measurement_analysis as ma
+            if ma_type == 'MeasurementAnalysis':
+                # The datafile is only read from, which allows opening the
+                # same file from multiple workers.
+                ma_kw = {'h5mode': 'r'}
+            else:
+                ma_kw = {}
+            ana = getattr(ma, ma_type)(timestamp=timestamp, auto=False,
+                                       close_file=False, **ma_kw)
+    except Exception as e:
+        logging.warning(e)
+        return 'remove', None
+
+    try:
+        if filter_no_analysis and 'Analysis' not in ana.data_file.keys():
+            return 'remove', None
+
+        if not isinstance(ana, _DatafileView):
+            if TwoD:
+                ana.get_naming_and_values_2D()
+            else:
+                ana.get_naming_and_values()
+
+        if 'datasaving_format' in ana.data_file[
+                'Experimental Data'].attrs:
+            datasaving_format = ana.get_key('datasaving_format')
+        else:
+            print('Using legacy data loading, assuming old formatting')
+            datasaving_format = 'Version 1'
+
+        new_data = None
+        if datasaving_format == 'Version 1':
+            new_data = get_data_from_ma(ana, param_names, data_version=1)
+        elif datasaving_format == 'Version 2':
+            new_data = get_data_from_ma(ana, param_names, data_version=2)
+    except KeyError as e:
+        return 'key_error', e
+    except Exception as e:
+        return 'error', e
+    finally:
+        ana.finish()
+    if cache is not None and new_data is not None:
+        try:
+            cache.put(cache_key, filepath, new_data, content_signature)
+        except OSError as e:
+            logging.warning('Could not write extraction cache: {}'.format(e))
+    return 'data', new_data
+
+
 def get_data_from_timestamp_list(timestamps,
                                  param_names,
                                  TwoD=False,
@@ -545,13 +892,25 @@ def get_data_from_timestamp_list(timestamps,
                                  filter_no_analysis=False,
                                  numeric_params=None,
                                  filter_dict=None,
-                                 ma_type='MeasurementAnalysis'):
-    # dirty import inside this function to prevent circular import
+                                 ma_type='MeasurementAnalysis',
+                                 nr_workers=None,
+                                 use_processes=False,
+                                 use_cache=False):
+    """
+    Extracts parameters from the datafiles of a list of timestamps.
+
+    The datafiles are read in parallel using a pool of nr_workers threads,
+    or processes if use_processes is True. By default the number of
+    workers is min(8, number of timestamps). The order of the extracted
+    data is the order of the timestamps.
+
+    If use_cache is True, the extracted parameters are stored in the
+    on-disk extraction_cache, entries are invalidated when the part of a
+    datafile they were extracted from changes.
+    """
     # FIXME: this function is at the base of the analysis v2 but relies
     # on the old analysis in the most dirty way. Also not completely clear
     # how the data extraction works here
-    from pycqed.analysis import measurement_analysis as ma
-    ma_func = getattr(ma, ma_type)
 
     if type(timestamps) is str:
         timestamps = [timestamps]
@@ -570,72 +929,53 @@ def get_data_from_timestamp_list(timestamps,
     else:
         get_timestamps = timestamps
 
-    remove_timestamps = []
-    for timestamp in get_timestamps:
-        try:
-            ana = ma_func(timestamp=timestamp, auto=False, close_file=False)
-        except Exception as e:
-            try:
-                ana.finish()
-                del ana
-            except Exception:
-                pass
-            logging.warning(e)
-            remove_timestamps.append(timestamp)
+    if filter_dict is not None and not single_timestamp:
+        param_names_extract = list(param_names.values()) + \
+            list(filter_dict.keys())
+    else:
+        param_names_extract = list(param_names.values())
+
+    extract_kw = {'param_names': param_names_extract, 'TwoD': TwoD,
+                  'filter_no_analysis': filter_no_analysis,
+                  'ma_type': ma_type,
+                  'cache': extraction_cache if use_cache else None}
+    if nr_workers is None:
+        nr_workers = min(8, len(get_timestamps))
+    if nr_workers <= 1:
+        results = (_extract_data_from_timestamp(timestamp, **extract_kw)
+                   for timestamp in get_timestamps)
+    else:
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=nr_workers)
         else:
-            try:
-                do_analysis = True
-                if filter_no_analysis:
-                    if 'Analysis' in ana.data_file.keys():
-                        do_analysis = True
-                    else:
-                        do_analysis = False
-
-                if do_analysis:
-                    if TwoD:
-                        ana.get_naming_and_values_2D()
-                    else:
-                        ana.get_naming_and_values()
-
-                    if 'datasaving_format' in ana.data_file[
-                            'Experimental Data'].attrs:
-                        datasaving_format = ana.get_key('datasaving_format')
-                    else:
-                        print(
-                            'Using legacy data loading, assuming old formatting')
-                        datasaving_format = 'Version 1'
-
-                    if datasaving_format == 'Version 1':
-                        if single_timestamp:
-                            data = get_data_from_ma(ana, param_names.values(),
-                                                    data_version=1)
-                        else:
-                            append_data_from_ma(ana, param_names.values(), data,
-                                                data_version=1, filter_dict=filter_dict)
-
-                    elif datasaving_format == 'Version 2':
-                        if single_timestamp:
-                            data = get_data_from_ma(ana, param_names.values(),
-                                                    data_version=2)
-                        else:
-                            append_data_from_ma(
-                                ana, param_names.values(), data, data_version=2,
-                                filter_dict=filter_dict)
+            executor = ThreadPoolExecutor(max_workers=nr_workers)
+        with executor:
+            futures = [executor.submit(_extract_data_from_timestamp,
+                                       timestamp, **extract_kw)
+                       for timestamp in get_timestamps]
+            results = [future.result() for future in futures]
 
-                else:
-                    remove_timestamps.append(timestamp)
-                    do_analysis = True
-                ana.finish()
-            except KeyError as e:
+    if use_cache:
+        extraction_cache.evict()
 
-                logging.warning('KeyError "%s" when processing timestamp %s' %
-                                (e, timestamp))
-                logging.warning(e)
-
-            except Exception as e:
-                logging.warning('Error "%s" when processing timestamp %s' %
-                                (e, timestamp))
-                raise(e)
+    remove_timestamps = []
+    for timestamp, (status, result) in zip(list(get_timestamps), results):
+        if status == 'remove':
+            remove_timestamps.append(timestamp)
+        elif status == 'key_error':
+            logging.warning('KeyError "%s" when processing timestamp %s' %
+                            (result, timestamp))
+            logging.warning(result)
+        elif status == 'error':
+            logging.warning('Error "%s" when processing timestamp %s' %
+                            (result, timestamp))
+            raise(result)
+        elif result is not None:
+            if single_timestamp:
+                data = result
+            else:
+                _append_data(result, param_names.values(), data,
+                             filter_dict=filter_dict)
 
     if len(remove_timestamps) > 0:
         for timestamp in remove_timestamps:
@@ -820,8 +1160,7 @@ def get_timestamps_in_range(timestamp_start, timestamp_end=None,
         date = datetime_start + datetime.timedelta(days=day)
         datemark = timestamp_from_datetime(date)[:8]
         try:
-            all_measdirs = [d for d in os.listdir(
-                os.path.join(folder, datemark))]
+            all_measdirs = list_measdirs(folder, datemark)
         except FileNotFoundError:
             # Sometimes, when choosing multiples days, there is a day
             # with no measurements
@@ -0,0 +1,212 @@
+'''
+On-disk cache for data extracted from datafiles.
+
+Entries are keyed by a (picklable, hashable) key, e.g., the timestamp and
+the extracted parameters, and the path of the datafile they were extracted
+from. An entry is valid as long as the modification time and the size of
+the datafile do not change. When the datafile changed, e.g., because an
+analysis saved its fit results in it, the entry is still valid if the
+content signature of the entry (a hash of the parts of the datafile the
+value was extracted from) did not change. The least recently used entries
+are removed when the total size of the cache exceeds max_size.
+
+Entries are pickled, as the extracted data can be of any type. Loading a
+pickle can execute code, so the cache directory must only be writable by
+the user: it is created with mode 0o700 and is not used if it is owned by
+another user or writable by others.
+'''
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+from pycqed.utilities.user_cache_dir import get_user_cache_dir
+
+log = logging.getLogger(__name__)
+
+default_cache_dir = get_user_cache_dir('extraction_cache')
+
+
+class ExtractionCache:
+    """
+    Args:
+        cache_dir (str): directory in which the cache entries are stored.
+        max_size (int): maximum total size of the cache in bytes.
+    """
+
+    def __init__(self, cache_dir: str = None, max_size: int = 2**30):
+        if cache_dir is None:
+            cache_dir = default_cache_dir
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._warned_not_private = False
+        # statistics of the cache lookups
+        self.nr_hits = 0
+        self.nr_misses = 0
+
+    def _entry_path(self, key, filepath: str):
+        key_hash = hashlib.sha1(repr(
+            (key, os.path.abspath(filepath))).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key_hash + '.pkl')
+
+    def _cache_dir_is_private(self):
+        """
+        Returns True if the cache directory exists and can only be written
+        by the user.
+        """
+        try:
+            stat = os.stat(self.cache_dir)
+        except FileNotFoundError:
+            return False
+        if os.name == 'nt':
+            # the user directories are not accessible to other users
+            return True
+        private = (stat.st_uid == os.getuid() and
+                   not stat.st_mode & 0o022)
+        if not private and not self._warned_not_private:
+            log.warning('Not using extraction cache {}: it is not owned by '
+                        'the user or writable by others.'.format(
+                            self.cache_dir))
+            self._warned_not_private = True
+        return private
+
+    @staticmethod
+    def _file_signature(filepath: str):
+        stat = os.stat(filepath)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, key, filepath: str, content_signature=None):
+        """
+        Returns the cached value for key or None if there is no valid
+        entry for the current version of the datafile at filepath.
+
+        Args:
+            content_signature (callable): function without arguments that
+                returns the content signature of the datafile, used to
+                validate the entry when the datafile changed.
+        """
+        value = self._get(key, filepath, content_signature)
+        if value is None:
+            self.nr_misses += 1
+        else:
+            self.nr_hits += 1
+        return value
+
+    def _get(self, key, filepath: str, content_signature):
+        if not self._cache_dir_is_private():
+            return None
+        filepath = os.path.abspath(filepath)
+        entry_path = self._entry_path(key, filepath)
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning('Could not read cache entry {}: {}'.format(
+                entry_path, e))
+            self._remove(entry_path)
+            return None
+
+        if entry.get('key') != key or entry.get('filepath') != filepath:
+            self._remove(entry_path)
+            return None
+        file_signature = self._file_signature(filepath)
+        if entry.get('file_signature') == file_signature:
+            # used to determine the least recently used entries
+            os.utime(entry_path)
+            return entry['value']
+
+        if (content_signature is None or
+                entry.get('content_signature') is None or
+                entry['content_signature'] != content_signature()):
+            self._remove(entry_path)
+            return None
+        # the part of the datafile the value was extracted from did not
+        # change, the entry is valid for the current version of the file
+        entry['file_signature'] = file_signature
+        try:
+            self._write(entry_path, pickle.dumps(
+                entry, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            log.warning('Could not update cache entry {}: {}'.format(
+                entry_path, e))
+        return entry['value']
+
+    def put(self, key, filepath: str, value, content_signature=None):
+        """
+        Stores value for key, valid for the current version of the datafile
+        at filepath. Values that cannot be pickled are not stored.
+
+        Args:
+            content_signature (callable): function without arguments that
+                returns the content signature of the datafile (see get).
+        """
+        filepath = os.path.abspath(filepath)
+        entry = {'key': key, 'filepath': filepath,
+                 'file_signature': self._file_signature(filepath),
+                 'content_signature': (None if content_signature is None
+                                       else content_signature()),
+                 'value': value}
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            log.debug('Could not cache value for {}: {}'.format(key, e))
+            return
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        if not self._cache_dir_is_private():
+            return
+        self._write(self._entry_path(key, filepath), data)
+
+    def _write(self, entry_path: str, data: bytes):
+        # writing to a temporary file makes writing the entry atomic
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the total size of
+        the cache is at most max_size.
+        """
+        try:
+            entries = [os.path.join(self.cache_dir, fn)
+                       for fn in os.listdir(self.cache_dir)
+                       if fn.endswith('.pkl')]
+        except FileNotFoundError:
+            return
+        stats = []
+        for entry_path in entries:
+            try:
+                stats.append((os.stat(entry_path), entry_path))
+            except FileNotFoundError:
+                pass
+        total_size = sum(stat.st_size for stat, _ in stats)
+        for stat, entry_path in sorted(stats, key=lambda s: s[0].st_mtime_ns):
+            if total_size <= self.max_size:
+                break
+            self._remove(entry_path)
+            total_size -= stat.st_size
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        max_size = self.max_size
+        self.max_size = 0
+        try:
+            self.evict()
+        finally:
+            self.max_size = max_size
+
+    @staticmethod
+    def _remove(entry_path):
+        try:
+            os.remove(entry_path)
+        except FileNotFoundError:
+            pass
@@ -137,6 +137,10 @@ class BaseDataAnalysis(object):
                                     dictionary of parameter names as keys and
                                     values as values. Only datasets with specified values
                                     of parameters will be extracted and used in analysis
+                                -'use_extraction_cache'
+                                    if True (default), the extracted data is
+                                    cached on disk and reused as long as the
+                                    datafiles do not change.
         :param extract_only: Should we also do the plots?
         :param do_fitting: Should the run_fitting method be executed?
         :param save_qois: Should the save save_quantities_of_interest method be executed?
@@ -330,7 +334,8 @@ class BaseDataAnalysis(object):
             ma_type=self.ma_type,
             TwoD=TwoD, numeric_params=self.numeric_params,
             filter_no_analysis=self.filter_no_analysis,
-            filter_dict=filter_dict)
+            filter_dict=filter_dict,
+            use_cache=self.options_dict.get('use_extraction_cache', True))
 
         # Use timestamps to calculate datetimes and add to dictionary
         self.raw_data_dict['datetime'] = [a_tools.datetime_from_timestamp(
@@ -15,6 +15,7 @@ import pycqed.measurement.hdf5_data as h5d
 import copy
 import lmfit
 from scipy.optimize import minimize
+from scipy.sparse import csr_matrix
 from pycqed.analysis.fitting_models import ro_gauss, ro_CDF, ro_CDF_discr,\
      gaussian_2D, gauss_2D_guess, gaussianCDF, ro_double_gauss_guess
 
@@ -1152,51 +1153,86 @@ class Multiplexed_Weights_Analysis(ba.BaseDataAnalysis):
                 tag_tstamp=self.options_dict.get('tag_tstamp', True))
 
 
-def calc_assignment_prob_matrix(combinations, digitized_data):
+def calc_assignment_prob_matrix(combinations, digitized_data,
+                                sparse: bool = False):
+    """
+    Calculates the assignment probability matrix. Entry (i, j) is the
+    probability to declare combinations[j] when combinations[i] is prepared.
+
+    The digitized shots of all channels are packed into an integer outcome
+    code per shot, such that every row is obtained with a single bincount.
+
+    Args:
+        combinations (list): states, e.g., ['00', '01', '10', '11'], the
+            k-th character corresponds to the k-th channel in
+            digitized_data.
+        digitized_data (dict): digitized_data[ch][comb] contains the
+            digitized shots of channel ch when comb is prepared.
+        sparse (bool): if True a scipy.sparse.csr_matrix is returned, which
+            is useful for large numbers of qubits.
+    """
+    channels = list(digitized_data.keys())
+    base = 1 + max(int(c) for comb in combinations for c in comb)
+    weights = base**np.arange(len(channels) - 1, -1, -1)
 
-    assignment_prob_matrix = np.zeros((len(combinations), len(combinations)))
+    # maps the outcome codes to the index of the declared state
+    code_to_idx = np.full(base**len(channels), -1)
+    for j, comb in enumerate(combinations):
+        code_to_idx[np.dot(weights, [int(c) for c in comb])] = j
 
+    rows, cols, probs = [], [], []
     for i, input_state in enumerate(combinations):
-        for j, outcome in enumerate(combinations):
-            first_key = next(iter(digitized_data))
-            Check = np.ones(len(digitized_data[first_key][input_state]))
-            for k, ch in enumerate(digitized_data.keys()):
-                check = digitized_data[ch][input_state] == int(outcome[k])
-                Check *= check
+        shots = np.array([digitized_data[ch][input_state]
+                          for ch in channels], dtype=int)
+        nr_shots = shots.shape[1]
+        # shots with outcomes that are not part of any combination are
+        # not declared as any state
+        valid = np.all((shots >= 0) & (shots < base), axis=0)
+        declared = code_to_idx[np.dot(weights, shots[:, valid])]
+        declared = declared[declared >= 0]
+        if sparse:
+            idxs, counts = np.unique(declared, return_counts=True)
+        else:
+            counts = np.bincount(declared, minlength=len(combinations))
+            idxs = np.arange(len(combinations))
+        rows.append(np.full(len(idxs), i))
+        cols.append(idxs)
+        probs.append(counts/nr_shots)
 
-            assignment_prob_matrix[i][j] = sum(Check)/len(Check)
+    shape = (len(combinations), len(combinations))
+    if sparse:
+        return csr_matrix((np.concatenate(probs), (np.concatenate(rows),
+                           np.concatenate(cols))), shape=shape)
+    return np.reshape(probs, shape)
 
-    return assignment_prob_matrix
 
 def calc_cross_fidelity_matrix(combinations, assignment_prob_matrix):
+    """
+    Calculates the cross fidelity matrix from the marginal probabilities
+    to declare each qubit in 0 or 1, 1 - P(e_i|0_j) - P(g_i|pi_j).
 
+    Args:
+        combinations (list): states, e.g., ['00', '01', '10', '11'].
+        assignment_prob_matrix (array or sparse matrix): see
+            calc_assignment_prob_matrix.
+    """
     n = int(np.log2(len(combinations)))
-    crossFidMat = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            P_eiIj = 0  # P(e_i|0_j)
-            P_giPj = 0  # P(g_i|pi_j)
-
-            # Loop over all entries in the Assignment probability matrix
-            for prep_idx, c_prep in enumerate(combinations):
-                for decl_idx, c_decl in enumerate(combinations):
-                    # Select all entries in the assignment matrix for ei|Ij
-                    if (c_decl[i]=='1') and (c_prep[j] == '0'):
-                        P_eiIj += assignment_prob_matrix[prep_idx, decl_idx]
-                    # Select all entries in the assignment matrix for ei|Ij
-                    elif (c_decl[i]=='0') and (c_prep[j] == '1'): # gi|Pj
-                        P_giPj += assignment_prob_matrix[prep_idx, decl_idx]
-
-            # Normalize probabilities
-            normalization_factor = (len(combinations)/2)
-
-            P_eiIj = P_eiIj/normalization_factor
-            P_giPj = P_giPj/normalization_factor
-
-            # Add entry to cross fidelity matrix
-            Fc = 1 - P_eiIj - P_giPj
-            crossFidMat[i,j] = Fc
-
+    # in_0[k, i] (in_1[k, i]) is 1 if qubit i is 0 (1) in combinations[k]
+    in_0 = np.array([[c[i] == '0' for i in range(n)] for c in combinations],
+                    dtype=float)
+    in_1 = np.array([[c[i] == '1' for i in range(n)] for c in combinations],
+                    dtype=float)
+
+    # marginal probabilities to declare qubit i in 0 (1) for every
+    # prepared state
+    P_decl_0 = assignment_prob_matrix @ in_0
+    P_decl_1 = assignment_prob_matrix @ in_1
+
+    normalization_factor = (len(combinations)/2)
+    P_eiIj = np.dot(in_0.T, P_decl_1).T/normalization_factor  # P(e_i|0_j)
+    P_giPj = np.dot(in_1.T, P_decl_0).T/normalization_factor  # P(g_i|pi_j)
+
+    crossFidMat = 1 - P_eiIj - P_giPj
     return crossFidMat
 
 def plot_assignment_prob_matrix(assignment_prob_matrix,
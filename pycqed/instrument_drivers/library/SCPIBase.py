@@ -14,6 +14,7 @@
 """
 
 import logging
+import numpy as np
 from .Transport import Transport
 
 log = logging.getLogger(__name__)
@@ -154,7 +155,25 @@ class SCPIBase:
     def bin_block_read(self) -> bytes:
         """ read IEEE488.2 binblock
         """
-        # get and decode header
+        byte_cnt = self._bin_block_read_header()
+        bin_block = self._transport.read_binary(byte_cnt)
+        self._transport.read_binary(2)                                  # consume <CR><LF>
+        return bin_block
+
+    def bin_block_read_array(self, dtype=np.uint8) -> np.ndarray:
+        """ read IEEE488.2 binblock into a numpy array of type dtype, the
+            data is received directly into the array without copying
+        """
+        byte_cnt = self._bin_block_read_header()
+        bin_block = np.empty(byte_cnt, dtype=np.uint8)
+        self._transport.read_binary_into(bin_block)
+        self._transport.read_binary(2)                                  # consume <CR><LF>
+        return bin_block.view(dtype)
+
+    def _bin_block_read_header(self) -> int:
+        """ read IEEE488.2 binblock header, returns the number of bytes
+            in the binblock
+        """
         header_a = self._transport.read_binary(2)                        # read '#N'
         header_a_str = header_a.decode()
         if header_a_str[0] != '#':
@@ -162,10 +181,7 @@ class SCPIBase:
             raise RuntimeError(s)
         digit_cnt = int(header_a_str[1])
         header_b = self._transport.read_binary(digit_cnt)
-        byte_cnt = int(header_b.decode())
-        bin_block = self._transport.read_binary(byte_cnt)
-        self._transport.read_binary(2)                                  # consume <CR><LF>
-        return bin_block
+        return int(header_b.decode())
 
     ##########################################################################
     # Helpers
@@ -32,6 +32,14 @@ class Transport:
     def read_binary(self, size: int) -> bytes:
         pass
 
+    def read_binary_into(self, buffer) -> None:
+        """
+        read len(buffer) bytes into a writable buffer (e.g. a bytearray or
+        numpy array), transports can override this to avoid copying
+        """
+        mv = memoryview(buffer).cast('B')
+        mv[:] = self.read_binary(len(mv))
+
     def readline(self) -> str:
         pass
 
@@ -45,10 +53,20 @@ class IPTransport(Transport):
     def __init__(self, host: str,
                  port: int = 5025,
                  timeout = 10.0,
-                 snd_buf_size: int = 512 * 1024) -> None:
+                 snd_buf_size: int = 512 * 1024,
+                 rcv_buf_size: int = 64 * 1024) -> None:
         """
         establish connection, e.g. IPTransport('192.168.0.16', 4000)
+
+        received data is buffered in a single receive buffer of (initially)
+        rcv_buf_size bytes, which is shared by readline and read_binary.
+        Large binary reads are received directly into the destination
         """
+        # receive buffer, self._rx_buf[self._rx_start:self._rx_end] holds
+        # data that was received but not yet read
+        self._rx_buf = bytearray(rcv_buf_size)
+        self._rx_start = 0
+        self._rx_end = 0
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._socket.settimeout(timeout)  # first set timeout (before connect)
         self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, snd_buf_size) # beef up buffer
@@ -63,24 +81,64 @@ class IPTransport(Transport):
         self.write_binary(out_str.encode('ascii'))
 
     def write_binary(self, data: bytes) -> None:
-        exp_len = len(data)
-        act_len = 0
-        while True:
-            act_len += self._socket.send(data[act_len:exp_len])
-            if act_len == exp_len:
-                break
+        self._socket.sendall(data)
 
     def read_binary(self, size: int) -> bytes:
-        data = self._socket.recv(size)
-        act_len = len(data)
-        exp_len = size
-        while act_len != exp_len:
-            data += self._socket.recv(exp_len - act_len)
-            act_len = len(data)
-        return data
+        data = bytearray(size)
+        self.read_binary_into(data)
+        return bytes(data)
+
+    def read_binary_into(self, buffer) -> None:
+        mv = memoryview(buffer).cast('B')
+        size = len(mv)
+        # first use data that is already buffered
+        act_len = min(size, self._rx_end - self._rx_start)
+        mv[:act_len] = self._rx_buf[self._rx_start:self._rx_start + act_len]
+        self._rx_start += act_len
+        # receive the remainder directly into the destination
+        while act_len < size:
+            act_len += self._recv_into(mv[act_len:])
 
     def readline(self) -> str:
-        return self._socket.makefile().readline()
+        """
+        read a line, including the line terminator
+        """
+        searched = 0  # number of pending bytes without line terminator
+        while True:
+            idx = self._rx_buf.find(
+                b'\n', self._rx_start + searched, self._rx_end)
+            if idx >= 0:
+                line = self._rx_buf[self._rx_start:idx + 1].decode()
+                self._rx_start = idx + 1
+                return line
+            searched = self._rx_end - self._rx_start
+            self._fill_rx_buf()
+
+    def _fill_rx_buf(self) -> None:
+        """
+        receive more data into the receive buffer
+        """
+        if self._rx_start == self._rx_end:
+            self._rx_start = self._rx_end = 0
+        elif self._rx_end == len(self._rx_buf):
+            pending = self._rx_end - self._rx_start
+            if self._rx_start == 0:
+                # buffer is full: grow it
+                self._rx_buf.extend(bytearray(len(self._rx_buf)))
+            else:
+                # move pending data to the start of the buffer
+                self._rx_buf[:pending] = self._rx_buf[self._rx_start:self._rx_end]
+                self._rx_start = 0
+                self._rx_end = pending
+        # release the memoryview, an exported bytearray cannot be resized
+        with memoryview(self._rx_buf) as mv:
+            self._rx_end += self._recv_into(mv[self._rx_end:])
+
+    def _recv_into(self, mv: memoryview) -> int:
+        nbytes = self._socket.recv_into(mv)
+        if nbytes == 0:
+            raise ConnectionError('connection closed by instrument')
+        return nbytes
 
 
 class VisaTransport(Transport):
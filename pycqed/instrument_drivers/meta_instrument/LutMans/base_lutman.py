@@ -7,6 +7,7 @@ from qcodes.instrument.parameter import InstrumentRefParameter
 from qcodes.utils import validators as vals
 from pycqed.analysis.fit_toolbox.functions import PSD
 from pycqed.analysis.tools.plotting import set_xlabel, set_ylabel
+from pycqed.utilities.general import get_fingerprint
 
 
 class Base_LutMan(Instrument):
@@ -38,6 +39,15 @@ class Base_LutMan(Instrument):
                 "a UHFQC or a CBox as these also contain AWG's"),
             vals=vals.Strings())
         self._add_cfg_parameters()
+        self.add_parameter(
+            'cfg_skip_unchanged_uploads', docstring=(
+                'If True, waveforms are not uploaded if the AWG already '
+                'contains them. If additionally none of the parameters of '
+                'the LutMan changed since the last time the waveforms were '
+                'regenerated and uploaded, regenerating the waveforms is '
+                'skipped as well. See also "invalidate_upload_cache".'),
+            initial_value=True, vals=vals.Bool(),
+            parameter_class=ManualParameter)
         self._add_waveform_parameters()
         self.add_parameter(
             'LutMap', docstring=(
@@ -59,6 +69,15 @@ class Base_LutMan(Instrument):
         self._wave_dict = {}
         self.set_default_lutmap()
 
+        # (fingerprint of the parameters, {AWG parameter: fingerprint of the
+        # waveform}) of the last time all waveforms were regenerated and
+        # uploaded, used to skip unchanged uploads
+        self._last_upload = None
+        # collects the waveforms set while loading all waveforms
+        self._uploaded_waveforms = None
+        self._force_upload = False
+        self.upload_statistics = {'uploaded': 0, 'skipped': 0}
+
     def time_to_sample(self, time):
         """
         Takes a time in seconds and returns the corresponding sample
@@ -109,15 +128,99 @@ class Base_LutMan(Instrument):
 
         if stop_start:
             AWG.stop()
-        if regenerate_waveforms:
-            self.generate_standard_waveforms()
 
-        for waveform_name, lookuptable in self.LutMap().items():
-            self.load_waveform_onto_AWG_lookuptable(waveform_name)
+        def load_all():
+            if regenerate_waveforms:
+                self.generate_standard_waveforms()
+
+            for waveform_name, lookuptable in self.LutMap().items():
+                self.load_waveform_onto_AWG_lookuptable(waveform_name)
+
+        self._load_all_waveforms_if_changed(load_all, regenerate_waveforms)
 
         if stop_start:
             AWG.start()
 
+    def invalidate_upload_cache(self):
+        """
+        Forces the next call of load_waveforms_onto_AWG_lookuptable to
+        regenerate and upload all waveforms, e.g., after the AWG was reset.
+        """
+        self._last_upload = None
+        self._force_upload = True
+
+    def _get_fingerprint_instruments(self):
+        """
+        Returns the instruments whose parameters determine the waveforms.
+        """
+        return [self]
+
+    def _get_upload_fingerprint(self):
+        """
+        Returns a fingerprint of everything that determines the waveforms
+        uploaded by load_waveforms_onto_AWG_lookuptable.
+        """
+        return get_fingerprint(
+            [(instr.name, [(name, par.get_latest())
+                           for name, par in sorted(instr.parameters.items())])
+             for instr in self._get_fingerprint_instruments()])
+
+    def _upload_is_current(self):
+        """
+        True if none of the parameters changed since the waveforms were last
+        regenerated and uploaded, and the AWG still contains those waveforms.
+        """
+        if (not self.cfg_skip_unchanged_uploads() or self._force_upload or
+                self._last_upload is None):
+            return False
+        fingerprint, uploaded = self._last_upload
+        if fingerprint != self._get_upload_fingerprint():
+            return False
+        AWG = self.AWG.get_instr()
+        return all(get_fingerprint(AWG.parameters[name].get_latest()) == wf_fp
+                   for name, wf_fp in uploaded.items())
+
+    def _load_all_waveforms_if_changed(self, load_all, regenerate_waveforms: bool):
+        """
+        Calls load_all, which (re)generates and uploads all waveforms, unless
+        nothing changed since the last time it was called with
+        regenerate_waveforms.
+        """
+        if regenerate_waveforms and self._upload_is_current():
+            self.upload_statistics['skipped'] += len(self._last_upload[1])
+            logging.info('{}: waveforms unchanged, skipping upload'.format(
+                self.name))
+            return
+
+        fingerprint = self._get_upload_fingerprint()
+        self._uploaded_waveforms = {}
+        try:
+            load_all()
+            if regenerate_waveforms and self._uploaded_waveforms:
+                self._last_upload = (fingerprint, self._uploaded_waveforms)
+            else:
+                self._last_upload = None
+            self._force_upload = False
+        finally:
+            self._uploaded_waveforms = None
+
+    def _upload_waveform(self, par_name: str, waveform):
+        """
+        Sets the waveform parameter par_name of the AWG, unless the AWG
+        already contains the waveform.
+        """
+        AWG = self.AWG.get_instr()
+        wf_fingerprint = get_fingerprint(waveform)
+        if (self.cfg_skip_unchanged_uploads() and not self._force_upload and
+                get_fingerprint(AWG.parameters[par_name].get_latest())
+                == wf_fingerprint):
+            self.upload_statistics['skipped'] += 1
+        else:
+            AWG.set(par_name, waveform)
+            self.upload_statistics['uploaded'] += 1
+        if self._uploaded_waveforms is not None:
+            self._uploaded_waveforms[par_name] = wf_fingerprint
+
     def render_wave(self, wave_id,
                     show=True, time_units='lut_index',
                     reload_pulses=True):
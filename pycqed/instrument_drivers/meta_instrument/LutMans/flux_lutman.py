@@ -1122,7 +1122,7 @@ class HDAWG_Flux_LutMan(Base_Flux_LutMan):
             waveform = self._append_zero_samples(waveform)
             self._wave_dict_dist[waveform_name] = waveform
 
-        self.AWG.get_instr().set(codeword_str, waveform)
+        self._upload_waveform(codeword_str, waveform)
 
     def load_waveforms_onto_AWG_lookuptable(
             self, regenerate_waveforms: bool = True, stop_start: bool = True):
@@ -1142,10 +1142,13 @@ class HDAWG_Flux_LutMan(Base_Flux_LutMan):
         if stop_start:
             AWG.stop()
 
-        for idx, waveform in self.LutMap().items():
-            self.load_waveform_onto_AWG_lookuptable(
-                wave_id=idx,
-                regenerate_waveforms=regenerate_waveforms)
+        def load_all():
+            for idx, waveform in self.LutMap().items():
+                self.load_waveform_onto_AWG_lookuptable(
+                    wave_id=idx,
+                    regenerate_waveforms=regenerate_waveforms)
+
+        self._load_all_waveforms_if_changed(load_all, regenerate_waveforms)
 
         self.cfg_awg_channel_amplitude()
         self.cfg_awg_channel_range()
@@ -1153,6 +1156,12 @@ class HDAWG_Flux_LutMan(Base_Flux_LutMan):
         if stop_start:
             AWG.start()
 
+    def _get_fingerprint_instruments(self):
+        instruments = [self]
+        if self.cfg_distort() and self.instr_distortion_kernel() is not None:
+            instruments.append(self.instr_distortion_kernel.get_instr())
+        return instruments
+
     def _append_zero_samples(self, waveform):
         """
         Helper method to ensure waveforms have the desired length
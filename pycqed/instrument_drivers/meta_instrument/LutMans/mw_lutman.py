@@ -527,8 +527,8 @@ class AWG8_MW_LutMan(Base_MW_LutMan):
         wf_name_I = 'wave_ch{}_cw{:03}'.format(self.channel_I(), wave_id)
         wf_name_Q = 'wave_ch{}_cw{:03}'.format(self.channel_Q(), wave_id)
 
-        self.AWG.get_instr().set(wf_name_I, wf_I)
-        self.AWG.get_instr().set(wf_name_Q, wf_Q)
+        self._upload_waveform(wf_name_I, wf_I)
+        self._upload_waveform(wf_name_Q, wf_Q)
 
     def load_waveforms_onto_AWG_lookuptable(
             self, regenerate_waveforms: bool=True, stop_start: bool = True,
@@ -614,10 +614,10 @@ class AWG8_VSM_MW_LutMan(AWG8_MW_LutMan):
         wf_name_DI = 'wave_ch{}_cw{:03}'.format(self.channel_DI(), wave_id)
         wf_name_DQ = 'wave_ch{}_cw{:03}'.format(self.channel_DQ(), wave_id)
 
-        self.AWG.get_instr().set(wf_name_GI, GI)
-        self.AWG.get_instr().set(wf_name_GQ, GQ)
-        self.AWG.get_instr().set(wf_name_DI, DI)
-        self.AWG.get_instr().set(wf_name_DQ, DQ)
+        self._upload_waveform(wf_name_GI, GI)
+        self._upload_waveform(wf_name_GQ, GQ)
+        self._upload_waveform(wf_name_DI, DI)
+        self._upload_waveform(wf_name_DQ, DQ)
 
     def _set_channel_amp(self, val):
         AWG = self.AWG.get_instr()
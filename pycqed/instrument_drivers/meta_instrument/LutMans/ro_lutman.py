@@ -1,5 +1,6 @@
 from .base_lutman import Base_LutMan, get_wf_idx_from_name
 from pycqed.measurement.waveform_control_CC import waveform as wf
+from pycqed.utilities.general import get_fingerprint
 from qcodes.instrument.parameter import ManualParameter
 from qcodes.utils import validators as vals
 import numpy as np
@@ -367,6 +368,11 @@ class UHFQC_RO_LutMan(Base_RO_LutMan):
         # Sample rate of the instrument
         self.sampling_rate(1.8e9)
 
+    def _get_upload_fingerprint(self):
+        # the mode determines to which codewords the waveforms are uploaded
+        return get_fingerprint(super()._get_upload_fingerprint(),
+                               self._mode, self._single_pulse_name)
+
     def load_single_pulse_sequence_onto_UHFQC(self, pulse_name,
                                               regenerate_waveforms=True):
         '''
@@ -439,12 +445,12 @@ class UHFQC_RO_LutMan(Base_RO_LutMan):
             # With this extra if-statement we prevent uploading to other waveforms
             # than codeword 0 with the waveform selected by the user.
             if self._single_pulse_name == self.LutMap()[wave_id]['name']:
-                self.AWG.get_instr().set('wave_ch1_cw000', I_wave)
-                self.AWG.get_instr().set('wave_ch2_cw000', Q_wave)
+                self._upload_waveform('wave_ch1_cw000', I_wave)
+                self._upload_waveform('wave_ch2_cw000', Q_wave)
         else:
-            self.AWG.get_instr().set(
+            self._upload_waveform(
                 'wave_ch1_cw{:03}'.format(wave_id), I_wave)
-            self.AWG.get_instr().set(
+            self._upload_waveform(
                 'wave_ch2_cw{:03}'.format(wave_id), Q_wave)
 
     def load_waveforms_onto_AWG_lookuptable(
@@ -5,7 +5,9 @@ import warnings
 import adaptive
 import networkx as nx
 import datetime
+import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from importlib import reload
 
 from qcodes.instrument.base import Instrument
@@ -22,7 +24,7 @@ from pycqed.measurement import sweep_functions as swf
 from pycqed.analysis import measurement_analysis as ma
 from pycqed.analysis import tomography as tomo
 from pycqed.analysis_v2 import measurement_analysis as ma2
-from pycqed.utilities.general import check_keyboard_interrupt
+from pycqed.utilities.general import check_keyboard_interrupt, get_fingerprint
 
 from pycqed.instrument_drivers.physical_instruments.QuTech_AWG_Module import (
     QuTech_AWG_Module,
@@ -331,6 +333,37 @@ class DeviceCCL(Instrument):
             vals=vals.Dict(),
         )
 
+        self.add_parameter(
+            "cfg_prepare_parallel",
+            docstring="If True, prepare_readout, prepare_fluxing and "
+            "prepare_for_timedomain configure independent instruments "
+            "concurrently. Qubits that share an instrument (e.g., an AWG, "
+            "LutMan or LO) are prepared sequentially, in the order given.",
+            parameter_class=ManualParameter,
+            initial_value=False,
+            vals=vals.Bool(),
+        )
+
+        self.add_parameter(
+            "cfg_prepare_force_upload",
+            docstring="If True, prepare_readout, prepare_fluxing and "
+            "prepare_for_timedomain regenerate and upload all waveforms and "
+            "integration weights, also if none of the parameters that "
+            "determine them changed since they were last uploaded.",
+            parameter_class=ManualParameter,
+            initial_value=False,
+            vals=vals.Bool(),
+        )
+
+        # Duration in seconds of the most recent run of each prepare stage,
+        # see self._run_prepare_stage
+        self.prepare_timings = OrderedDict()
+        # Number of integration weights and thresholds that were uploaded or
+        # skipped because they did not change, see self._prep_if_changed
+        self.prepare_statistics = {"uploaded": 0, "skipped": 0}
+        self._prepare_statistics_lock = threading.Lock()
+        self._prepared_fingerprints = {}
+
     def _set_dio_map(self, dio_map_dict):
         allowed_keys = {"ro_", "mw_", "flux_"}
         for key in dio_map_dict:
@@ -464,7 +497,113 @@ class DeviceCCL(Instrument):
                                 ch_not_ready += AWG.geti("sigouts/{}/busy".format(i))
                             check_keyboard_interrupt()
 
+    def _run_prepare_stage(self, stage: str, qubits, prepare_func, instr_refs):
+        """
+        Runs prepare_func(qubits) and stores its duration in
+        self.prepare_timings[stage].
+
+        If cfg_prepare_parallel is True, the qubits are split into groups
+        that do not share any of the instruments returned by
+        instr_refs(qb) and prepare_func is called for every group in a
+        separate thread. Within a group the qubits keep the given order.
+        The durations of the groups are stored in
+        self.prepare_timings["{stage}: {instruments of the group}"].
+        If any group fails, a PrepareError listing all failures is raised
+        after the other groups have finished.
+        """
+        for key in [k for k in self.prepare_timings if k.startswith(stage + ": ")]:
+            del self.prepare_timings[key]
+        if self.cfg_prepare_force_upload():
+            self.invalidate_upload_caches(qubits)
+        t0 = time.time()
+        if not self.cfg_prepare_parallel() or len(qubits) < 2:
+            prepare_func(qubits)
+        else:
+            groups = _group_by_instruments(
+                qubits,
+                lambda qb_name: instr_refs(self.find_instrument(qb_name)))
+
+            def run_group(group_qubits):
+                t_group = time.time()
+                prepare_func(group_qubits)
+                return time.time() - t_group
+
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                futures = [(instr_names, executor.submit(run_group, group_qubits))
+                           for instr_names, group_qubits in groups]
+            errors = []
+            for instr_names, future in futures:
+                label = "{}: {}".format(stage, ", ".join(instr_names))
+                if future.exception() is not None:
+                    errors.append((label, future.exception()))
+                else:
+                    self.prepare_timings[label] = future.result()
+            if errors:
+                raise PrepareError(errors)
+        self.prepare_timings[stage] = time.time() - t0
+        log.info("Prepared {} in {:.3f} s".format(stage, self.prepare_timings[stage]))
+
+    def invalidate_upload_caches(self, qubits=None):
+        """
+        Forces the next prepare to upload all waveforms and integration
+        weights of the qubits, e.g., after instruments were reset.
+        """
+        if qubits is None:
+            qubits = self.qubits()
+        for qb_name in qubits:
+            qb = self.find_instrument(qb_name)
+            for lutman_ref in ["instr_LutMan_RO", "instr_LutMan_MW",
+                               "instr_LutMan_Flux"]:
+                if lutman_ref in qb.parameters and qb.get(lutman_ref) is not None:
+                    qb.parameters[lutman_ref].get_instr().invalidate_upload_cache()
+        self._prepared_fingerprints.clear()
+
+    def get_prepare_statistics(self, qubits=None):
+        """
+        Returns the number of items that were uploaded and skipped (because
+        they did not change) by the device and by the LutMans of the qubits.
+        """
+        if qubits is None:
+            qubits = self.qubits()
+        statistics = OrderedDict([(self.name, dict(self.prepare_statistics))])
+        for qb_name in qubits:
+            qb = self.find_instrument(qb_name)
+            for lutman_ref in ["instr_LutMan_RO", "instr_LutMan_MW",
+                               "instr_LutMan_Flux"]:
+                if lutman_ref in qb.parameters and qb.get(lutman_ref) is not None:
+                    lutman = qb.parameters[lutman_ref].get_instr()
+                    statistics[lutman.name] = dict(lutman.upload_statistics)
+        return statistics
+
+    def _prep_if_changed(self, key, inputs, instr, par_names, prepare):
+        """
+        Calls prepare, which sets the parameters par_names of instr based on
+        inputs, unless the inputs did not change since the last call with the
+        same key and the parameters still have the values set by prepare.
+        """
+        def settings_fingerprint():
+            return get_fingerprint(
+                [instr.parameters[par_name].get_latest() for par_name in par_names])
+
+        inputs_fingerprint = get_fingerprint(instr.name, inputs)
+        record = self._prepared_fingerprints.get(key)
+        if (not self.cfg_prepare_force_upload() and record is not None and
+                record == (inputs_fingerprint, settings_fingerprint())):
+            result = "skipped"
+        else:
+            prepare()
+            self._prepared_fingerprints[key] = (
+                inputs_fingerprint, settings_fingerprint())
+            result = "uploaded"
+        with self._prepare_statistics_lock:
+            self.prepare_statistics[result] += 1
+
     def prepare_fluxing(self, qubits):
+        self._run_prepare_stage(
+            "fluxing", qubits, self._prep_fluxing,
+            lambda qb: _lutman_instr_names(qb.instr_LutMan_Flux))
+
+    def _prep_fluxing(self, qubits):
         for qb_name in qubits:
             qb = self.find_instrument(qb_name)
             try:
@@ -485,8 +624,10 @@ class DeviceCCL(Instrument):
         log.info("Configuring readout for {}".format(qubits))
         self._prep_ro_sources(qubits=qubits)
         acq_ch_map = self._prep_ro_assign_weights(qubits=qubits)
-        self._prep_ro_integration_weights(qubits=qubits)
-        self._prep_ro_pulses(qubits=qubits)
+        self._run_prepare_stage(
+            "readout", qubits, self._prep_ro_weights_and_pulses,
+            lambda qb: [qb.instr_acquisition()]
+            + _lutman_instr_names(qb.instr_LutMan_RO))
 
         self._prep_ro_instantiate_detectors(qubits=qubits, acq_ch_map=acq_ch_map)
 
@@ -513,6 +654,10 @@ class DeviceCCL(Instrument):
 
         #     ro_lm.set_mixer_offsets()
 
+    def _prep_ro_weights_and_pulses(self, qubits):
+        self._prep_ro_integration_weights(qubits=qubits)
+        self._prep_ro_pulses(qubits=qubits)
+
     def _prep_ro_sources(self, qubits):
         """
         turn on and configure the RO LO's of all qubits to be measured and
@@ -615,12 +760,21 @@ class DeviceCCL(Instrument):
             for qb_name in qubits:
                 qb = self.find_instrument(qb_name)
                 acq_instr = qb.instr_acquisition.get_instr()
-
-                acq_instr.prepare_SSB_weight_and_rotation(
-                    IF=qb.ro_freq_mod(),
-                    weight_function_I=qb.ro_acq_weight_chI(),
-                    weight_function_Q=qb.ro_acq_weight_chQ(),
-                )
+                IF = qb.ro_freq_mod()
+                chI = qb.ro_acq_weight_chI()
+                chQ = qb.ro_acq_weight_chQ()
+                par_names = []
+                for ch in [chI, chQ]:
+                    par_names += [
+                        "qas_0_integration_weights_{}_real".format(ch),
+                        "qas_0_integration_weights_{}_imag".format(ch),
+                        "qas_0_rotations_{}".format(ch)]
+
+                self._prep_if_changed(
+                    ("SSB weights", acq_instr.name, chI), [IF, chI, chQ],
+                    acq_instr, par_names,
+                    lambda: acq_instr.prepare_SSB_weight_and_rotation(
+                        IF=IF, weight_function_I=chI, weight_function_Q=chQ))
 
         elif 'optimal' in self.ro_acq_weight_type():
             log.info("using optimal weights")
@@ -638,29 +792,45 @@ class DeviceCCL(Instrument):
                         " {}, not updating weights".format(qb_name)
                     )
                 else:
-                    acq_instr.set(
-                        "qas_0_integration_weights_{}_real".format(
-                            qb.ro_acq_weight_chI()
-                        ),
-                        opt_WI,
-                    )
-                    acq_instr.set(
-                        "qas_0_integration_weights_{}_imag".format(
-                            qb.ro_acq_weight_chI()
-                        ),
-                        opt_WQ,
-                    )
-                    acq_instr.set(
-                        "qas_0_rotations_{}".format(qb.ro_acq_weight_chI()), 1.0 - 1.0j
-                    )
+                    chs = [qb.ro_acq_weight_chI()]
                     if self.ro_acq_weight_type() == 'optimal IQ':
-                        print('setting the optimal Q')
-                        acq_instr.set('qas_0_integration_weights_{}_real'.format(
-                            qb.ro_acq_weight_chQ()), opt_WQ)
-                        acq_instr.set('qas_0_integration_weights_{}_imag'.format(
-                            qb.ro_acq_weight_chQ()), opt_WI)
-                        acq_instr.set('qas_0_rotations_{}'.format(
-                            qb.ro_acq_weight_chQ()), 1.0 + 1.0j)
+                        chs.append(qb.ro_acq_weight_chQ())
+                    par_names = []
+                    for ch in chs:
+                        par_names += [
+                            "qas_0_integration_weights_{}_real".format(ch),
+                            "qas_0_integration_weights_{}_imag".format(ch),
+                            "qas_0_rotations_{}".format(ch)]
+
+                    def set_optimal_weights():
+                        acq_instr.set(
+                            "qas_0_integration_weights_{}_real".format(
+                                qb.ro_acq_weight_chI()
+                            ),
+                            opt_WI,
+                        )
+                        acq_instr.set(
+                            "qas_0_integration_weights_{}_imag".format(
+                                qb.ro_acq_weight_chI()
+                            ),
+                            opt_WQ,
+                        )
+                        acq_instr.set(
+                            "qas_0_rotations_{}".format(qb.ro_acq_weight_chI()), 1.0 - 1.0j
+                        )
+                        if self.ro_acq_weight_type() == 'optimal IQ':
+                            print('setting the optimal Q')
+                            acq_instr.set('qas_0_integration_weights_{}_real'.format(
+                                qb.ro_acq_weight_chQ()), opt_WQ)
+                            acq_instr.set('qas_0_integration_weights_{}_imag'.format(
+                                qb.ro_acq_weight_chQ()), opt_WI)
+                            acq_instr.set('qas_0_rotations_{}'.format(
+                                qb.ro_acq_weight_chQ()), 1.0 + 1.0j)
+
+                    self._prep_if_changed(
+                        ("optimal weights", acq_instr.name, chs[0]),
+                        [self.ro_acq_weight_type(), chs, opt_WI, opt_WQ],
+                        acq_instr, par_names, set_optimal_weights)
 
                 if self.ro_acq_digitized():
                     # Update the RO theshold
@@ -678,10 +848,12 @@ class DeviceCCL(Instrument):
                     else:
                         threshold = qb.ro_acq_threshold()
 
-                    qb.instr_acquisition.get_instr().set(
-                        "qas_0_thresholds_{}_level".format(qb.ro_acq_weight_chI()),
-                        threshold,
-                    )
+                    threshold_par = "qas_0_thresholds_{}_level".format(
+                        qb.ro_acq_weight_chI())
+                    self._prep_if_changed(
+                        ("threshold", acq_instr.name, qb.ro_acq_weight_chI()),
+                        [threshold], acq_instr, [threshold_par],
+                        lambda: acq_instr.set(threshold_par, threshold))
                     log.info("Setting threshold of {} to {}".format(qb.name, threshold))
 
             # Note, no support for optimal IQ in mux RO
@@ -994,13 +1166,19 @@ class DeviceCCL(Instrument):
             self.prepare_fluxing(qubits=qubits)
         self.prepare_timing()
 
+        self._run_prepare_stage(
+            "microwave", qubits, self._prep_td_sources_and_mw_pulses,
+            lambda qb: [qb.instr_LO_mw(), qb.instr_spec_source()]
+            + _lutman_instr_names(qb.instr_LutMan_MW))
+
+        # self._prep_td_configure_VSM()
+
+    def _prep_td_sources_and_mw_pulses(self, qubits):
         for qb_name in qubits:
             qb = self.find_instrument(qb_name)
             qb._prep_td_sources()
             qb._prep_mw_pulses()
 
-        # self._prep_td_configure_VSM()
-
     ########################################################
     # Measurement methods
     ########################################################
@@ -4311,3 +4489,58 @@ def _acq_ch_map_to_IQ_ch_map(acq_ch_map):
             acq_ch_map_IQ[acq_instr]["{} I".format(qubit)] = ch
             acq_ch_map_IQ[acq_instr]["{} Q".format(qubit)] = ch + 1
     return acq_ch_map_IQ
+
+
+class PrepareError(Exception):
+    """
+    Raised when preparing one or more groups of qubits failed in a
+    concurrent prepare. `errors` is a list of (label, exception) tuples.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("\n".join(
+            "{}: {!r}".format(label, e) for label, e in errors))
+
+
+def _lutman_instr_names(lutman_ref):
+    """
+    Returns the names of a LutMan and of the AWG it uploads to, given the
+    instrument reference parameter of the LutMan.
+    """
+    if lutman_ref() is None:
+        return []
+    try:
+        lutman = lutman_ref.get_instr()
+    except KeyError:
+        # the LutMan does not exist, this is handled when preparing
+        return []
+    return [lutman.name, lutman.AWG()]
+
+
+def _group_by_instruments(items, get_instr_names):
+    """
+    Groups items such that items that use a common instrument are in the
+    same group.
+
+    Args:
+        items (list): items to group, e.g., qubit names.
+        get_instr_names (callable): returns the names of the instruments
+            used by an item, None entries are ignored.
+
+    Returns:
+        list of (instrument names, items) tuples. The groups are ordered by
+        their first item and the items in a group keep the given order.
+    """
+    groups = []
+    for idx, item in enumerate(items):
+        names = {name for name in get_instr_names(item) if name is not None}
+        group = (names, [(idx, item)])
+        for other in [g for g in groups if g[0] & names]:
+            groups.remove(other)
+            group[0].update(other[0])
+            group[1].extend(other[1])
+        groups.append(group)
+    groups.sort(key=lambda g: min(idx for idx, _ in g[1]))
+    return [(sorted(names), [item for _, item in sorted(members, key=lambda m: m[0])])
+            for names, members in groups]
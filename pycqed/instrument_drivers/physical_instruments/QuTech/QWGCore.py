@@ -253,8 +253,7 @@ class QWGCore(SCPIBase, DIO.CalInterface):
         Compatibility: QWG
         """
         self._transport.write(f'wlist:waveform:data? "{name}"')
-        bin_block = self.bin_block_read()
-        waveform = np.frombuffer(bin_block, dtype=np.float32)  # extract waveform
+        waveform = self.bin_block_read_array(dtype=np.float32)  # extract waveform
         return waveform
 
     def send_waveform_data_real(self, name: str, waveform):
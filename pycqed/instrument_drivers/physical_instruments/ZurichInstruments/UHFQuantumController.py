@@ -230,6 +230,23 @@ class UHFQC(zibase.ZI_base_instrument):
         # Disable disfunctional parameters from snapshot
         self._params_to_exclude = set(['features_code', 'system_fwlog', 'system_fwlogenable'])
 
+        # Parameters of the device nodes are created when first accessed,
+        # make sure the acquisition and signal settings are part of the snapshot
+        self._snapshot_whitelist = set(self.create_node_parameters([
+            'clockbase', 'system_extclk', 'oscs_0_freq', 'dios_0_mode',
+            'sigins_*_range', 'sigins_*_imp50', 'sigins_*_ac',
+            'sigouts_*_on', 'sigouts_*_offset', 'sigouts_*_range',
+            'sigouts_*_imp50', 'sigouts_*_amplitudes_*', 'sigouts_*_enables_*',
+            'awgs_0_enable', 'awgs_0_outputs_*_amplitude', 'awgs_0_outputs_*_mode',
+            'awgs_0_userregs_*', 'awgs_0_dio_*',
+            'qas_0_delay', 'qas_0_integration_length', 'qas_0_integration_mode',
+            'qas_0_integration_sources_*', 'qas_0_rotations_*',
+            'qas_0_thresholds_*', 'qas_0_correlations_*',
+            'qas_0_crosstalk_bypass', 'qas_0_crosstalk_rows_*_cols_*',
+            'qas_0_deskew_rows_*_cols_*', 'qas_0_result_length',
+            'qas_0_result_averages', 'qas_0_result_source',
+            'qas_0_monitor_length', 'qas_0_monitor_averages']))
+
         # Set default waveform length to 20 ns at 1.8 GSa/s
         self._default_waveform_length = 32
 
@@ -831,6 +848,12 @@ setUserReg(4, err_cnt);"""
         """
         Polls the UHFQC for data.
 
+        The data of each channel is written into a buffer of the expected
+        number of samples, which is allocated when the first vector of that
+        channel arrives. Samples received beyond the expected number are
+        kept in a list of chunks and appended once at the end, so the time
+        spent on collecting the data is linear in the number of samples.
+
         Args:
             samples (int): the expected number of samples
             arm    (bool): if true arms the acquisition, disable when you
@@ -838,15 +861,21 @@ setUserReg(4, err_cnt);"""
             acquisition_time (float): time in sec between polls? # TODO check with Niels H
             timeout (float): time in seconds before timeout Error is raised.
 
+        Returns:
+            data (dict): channel index -> array of the acquired samples.
+                The arrays are views of the acquisition buffers.
         """
-        data = {k: [] for k, dummy in enumerate(self._acquisition_nodes)}
+        nr_nodes = len(self._acquisition_nodes)
+        buffers = [None]*nr_nodes
+        filled = [0]*nr_nodes
+        chunks = [[] for _ in range(nr_nodes)]
 
         # Start acquisition
         if arm:
             self.acquisition_arm()
 
         # Acquire data
-        gotem = [False]*len(self._acquisition_nodes)
+        gotem = [False]*nr_nodes
         accumulated_time = 0
 
         while accumulated_time < self.timeout() and not all(gotem):
@@ -863,11 +892,29 @@ setUserReg(4, err_cnt);"""
             for n, p in enumerate(self._acquisition_nodes):
                 if p in dataset:
                     for v in dataset[p]:
-                        data[n] = np.concatenate((data[n], v['vector']))
-                        if len(data[n]) >= samples:
+                        vector = np.asarray(v['vector'])
+                        if buffers[n] is None:
+                            buffers[n] = np.empty(samples, dtype=vector.dtype)
+                        nr_fit = min(len(vector), samples - filled[n])
+                        if nr_fit > 0:
+                            buffers[n][filled[n]:filled[n]+nr_fit] = \
+                                vector[:nr_fit]
+                        if nr_fit < len(vector):
+                            chunks[n].append(vector[max(nr_fit, 0):])
+                        filled[n] += len(vector)
+                        if filled[n] >= samples:
                             gotem[n] = True
             accumulated_time += acquisition_time
 
+        data = {}
+        for n in range(nr_nodes):
+            if buffers[n] is None:
+                data[n] = np.array([])
+            elif chunks[n]:
+                data[n] = np.concatenate([buffers[n]] + chunks[n])
+            else:
+                data[n] = buffers[n][:filled[n]]
+
         if not all(gotem):
             self.acquisition_finalize()
             for n, _c in enumerate(self._acquisition_nodes):
@@ -878,6 +925,71 @@ setUserReg(4, err_cnt);"""
 
         return data
 
+    def acquisition_poll_chunks(self, samples, arm=True,
+                                acquisition_time=0.010):
+        """
+        Polls the UHFQC for data and yields the data as it arrives.
+
+        In contrast to acquisition_poll, the acquired samples are not
+        collected, so the memory used does not depend on the number of
+        samples. Samples of channels that arrive before the corresponding
+        samples of the other channels are held back until all channels
+        have delivered them.
+
+        Args:
+            samples (int): the expected number of samples
+            arm    (bool): if true arms the acquisition, disable when you
+                           need synchronous acquisition with some external dev
+            acquisition_time (float): time in sec between polls
+
+        Yields:
+            data (dict): channel index -> array of the new samples, the
+                arrays of all channels have the same length.
+        """
+        nr_nodes = len(self._acquisition_nodes)
+        pending = [[] for _ in range(nr_nodes)]
+        nr_pending = [0]*nr_nodes
+        nr_yielded = 0
+
+        # Start acquisition
+        if arm:
+            self.acquisition_arm()
+
+        accumulated_time = 0
+        while accumulated_time < self.timeout() and nr_yielded < samples:
+            dataset = self.poll(acquisition_time)
+
+            # Enable the user to interrupt long (or buggy) acquisitions
+            try:
+                check_keyboard_interrupt()
+            except KeyboardInterrupt as e:
+                # Finalize acquisition before raising exception
+                self.acquisition_finalize()
+                raise e
+
+            for n, p in enumerate(self._acquisition_nodes):
+                if p in dataset:
+                    for v in dataset[p]:
+                        pending[n].append(np.asarray(v['vector']))
+                        nr_pending[n] += len(v['vector'])
+            accumulated_time += acquisition_time
+
+            nr_new = min(min(nr_pending), samples - nr_yielded)
+            if nr_new > 0:
+                data = {}
+                for n in range(nr_nodes):
+                    vector = np.concatenate(pending[n])
+                    data[n] = vector[:nr_new]
+                    pending[n] = [vector[nr_new:]]
+                    nr_pending[n] -= nr_new
+                nr_yielded += nr_new
+                yield data
+
+        if nr_yielded < samples:
+            self.acquisition_finalize()
+            print("\t: Got {} of {} samples".format(nr_yielded, samples))
+            raise TimeoutError("Error: Didn't get all results!")
+
     def acquisition_finalize(self) -> None:
         self.stop()
 
@@ -153,7 +153,11 @@ class ZI_HDAWG8(zicore.ZI_HDAWG_core):
                 'sigouts_{}_direct'.format(i), 'sigouts_{}_offset'.format(i),
                 'sigouts_{}_on'.format(i) , 'sigouts_{}_range'.format(i)})
 
-        self._params_to_exclude = set(self.parameters.keys()) - self._snapshot_whitelist
+        # Parameters of the device nodes are created when first accessed,
+        # make sure the whitelisted ones are part of the snapshot
+        self.create_node_parameters(self._snapshot_whitelist)
+        self._params_to_exclude = (set(self.parameters.keys()) | set(self._node_index.keys())) \
+            - self._snapshot_whitelist
 
         t1 = time.time()
         log.info(f'{self.devname}: Initialized ZI_HDAWG in {t1 - t0}s')
@@ -437,7 +441,7 @@ while (1) {
             self.set('awgs_{}_enable'.format(awg_nr), 1)
 
         # Disable all function generators
-        for param in [key for key in self.parameters.keys() if
+        for param in [key for key in self._node_index.keys() if
                       re.match(r'sines_\d+_enables_\d+', key)]:
             self.set(param, 0)
 
@@ -454,7 +458,7 @@ while (1) {
                 self.set('sigouts_{}_range'.format(ch), .8)
 
         # Turn on all outputs
-        for param in [key for key in self.parameters.keys() if re.match(r'sigouts_\d+_on', key)]:
+        for param in [key for key in self._node_index.keys() if re.match(r'sigouts_\d+_on', key)]:
             self.set(param, 1)
 
     def _debug_report_dio(self):
@@ -1,14 +1,18 @@
 import json
 import os
+import hashlib
+import tempfile
+import fnmatch
 import time
 import numpy as np
 import matplotlib.pyplot as plt
 import logging
 import re
+from collections import namedtuple
 
 from qcodes.instrument.base import Instrument
 from qcodes.utils import validators
-from qcodes.instrument.parameter import ManualParameter
+from qcodes.instrument.parameter import ManualParameter, Parameter
 
 import zhinst.ziPython as zi
 
@@ -172,6 +176,156 @@ def _gen_get_cmd(dev_get_func, node_path: str):
         return dev_get_func(node_path)
     return get_cmd
 
+
+# Information about a node, as listed in a node_doc JSON file, that is
+# required to create the corresponding parameter
+NodeInfo = namedtuple(
+    'NodeInfo', ['node', 'type', 'unit', 'docstring', 'nr_options',
+                 'readable', 'writable'])
+
+# Increment when the format of the node index changes
+_NODE_INDEX_VERSION = 2
+if os.name == 'nt':
+    _node_index_cache_dir = os.path.join(
+        os.environ.get('LOCALAPPDATA', os.path.expanduser('~')),
+        'pycqed', 'zi_node_index')
+else:
+    _node_index_cache_dir = os.path.join(
+        os.environ.get('XDG_CACHE_HOME',
+                       os.path.join(os.path.expanduser('~'), '.cache')),
+        'pycqed', 'zi_node_index')
+
+
+def _parse_parameter_file(filename: str) -> dict:
+    """
+    Parses a node_doc JSON file into a dict of parameter name -> NodeInfo.
+    """
+    with open(filename) as f:
+        node_pars = json.load(f)
+    node_index = {}
+    for par in node_pars.values():
+        node = par['Node'].split('/')
+        # The parfile is valid for all devices of a certain type
+        # so the device name is not part of the node.
+        parname = '_'.join(node).lower()
+        docstring = par['Description']
+        if "Options" in par.keys():
+            # options can be done better, this is not sorted
+            docstring += '\nOptions:\n' + str(par['Options'])
+        node_index[parname] = NodeInfo(
+            node='/'.join(node), type=par['Type'], unit=par['Unit'],
+            docstring=docstring, nr_options=len(par.get('Options', ())),
+            readable='Read' in par['Properties'],
+            writable='Write' in par['Properties'])
+    return node_index
+
+
+def load_node_index(filename: str) -> dict:
+    """
+    Returns the node index (parameter name -> NodeInfo) of a node_doc JSON
+    file.
+
+    Parsing the JSON files is slow, so the index is cached in a compact
+    JSON file in the cache directory of the user. The cache is invalidated
+    when the modification time or the size of the JSON file changes.
+    """
+    filename = os.path.abspath(filename)
+    stat = os.stat(filename)
+    signature = [_NODE_INDEX_VERSION, filename, stat.st_mtime_ns, stat.st_size]
+    cache_path = os.path.join(
+        _node_index_cache_dir,
+        hashlib.sha1(filename.encode('utf-8')).hexdigest() + '.json')
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+        if cache['signature'] == signature:
+            return {parname: NodeInfo(*info)
+                    for parname, info in cache['nodes'].items()}
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log.debug('Could not read node index cache {}: {}'.format(
+            cache_path, e))
+
+    node_index = _parse_parameter_file(filename)
+    try:
+        os.makedirs(_node_index_cache_dir, mode=0o700, exist_ok=True)
+        # writing to a temporary file makes writing the cache atomic
+        fd, tmp_path = tempfile.mkstemp(dir=_node_index_cache_dir,
+                                        suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'signature': signature, 'nodes': node_index}, f,
+                      separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.debug('Could not write node index cache {}: {}'.format(
+            cache_path, e))
+    return node_index
+
+
+class _LazyParameterDict(dict):
+    """
+    Parameter dict in which the parameters of the device nodes are only
+    created when they are first accessed.
+
+    Membership tests include the nodes whose parameters have not been
+    created yet, iterating over the dict (e.g., when taking a snapshot) only
+    yields the parameters that have been created.
+
+    Args:
+        parameters (dict): parameters that have already been created.
+        create_parameter (callable): creates the parameter for a name of
+            a node, the parameter is stored in the dict.
+    """
+
+    def __init__(self, parameters: dict, create_parameter):
+        super().__init__(parameters)
+        self._create_parameter = create_parameter
+        self._lazy_names = set()
+
+    def add_lazy_names(self, names):
+        self._lazy_names.update(name for name in names
+                                if not dict.__contains__(self, name))
+
+    @property
+    def lazy_names(self):
+        """Names of the parameters that have not been created yet."""
+        return set(self._lazy_names)
+
+    def __missing__(self, key):
+        if key not in self._lazy_names:
+            raise KeyError(key)
+        # the name is removed first so that the parameter does not appear
+        # to exist while it is being created
+        self._lazy_names.discard(key)
+        try:
+            param = self._create_parameter(key)
+        except Exception:
+            self._lazy_names.add(key)
+            raise
+        dict.__setitem__(self, key, param)
+        return param
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._lazy_names
+
+    def __delitem__(self, key):
+        if key in self._lazy_names:
+            self._lazy_names.discard(key)
+            if not dict.__contains__(self, key):
+                return
+        dict.__delitem__(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, *default):
+        self._lazy_names.discard(key)
+        return dict.pop(self, key, *default)
+
 ##########################################################################
 # Exceptions
 ##########################################################################
@@ -255,6 +409,9 @@ class MockDAQServer():
         self.devtype = None
         self.poll_nodes = []
         self.verbose = verbose
+        # Maximum number of samples returned per vector by poll, when set
+        # the result vectors are returned in several chunks
+        self.poll_chunk_size = None
 
     def awgModule(self):
         return MockAwgModule(self)
@@ -444,14 +601,14 @@ class MockDAQServer():
                 print('poll', path)
             m = re.match(r'/(\w+)/qas/0/result/data/(\d+)/wave', path)
             if m:
-                poll_data[path] = [{'vector': np.random.rand(
-                    self.getInt('/' + m.group(1) + '/qas/0/result/length'))}]
+                poll_data[path] = self._poll_vectors(np.random.rand(
+                    self.getInt('/' + m.group(1) + '/qas/0/result/length')))
                 continue
 
             m = re.match(r'/(\w+)/qas/0/monitor/inputs/(\d+)/wave', path)
             if m:
-                poll_data[path] = [{'vector': np.random.rand(
-                    self.getInt('/' + m.group(1) + '/qas/0/monitor/length'))}]
+                poll_data[path] = self._poll_vectors(np.random.rand(
+                    self.getInt('/' + m.group(1) + '/qas/0/monitor/length')))
                 continue
 
             m = re.match(r'/(\w+)/awgs/(\d+)/ready', path)
@@ -463,6 +620,12 @@ class MockDAQServer():
 
         return poll_data
 
+    def _poll_vectors(self, vector):
+        if not self.poll_chunk_size:
+            return [{'vector': vector}]
+        return [{'vector': vector[i:i+self.poll_chunk_size]}
+                for i in range(0, len(vector), self.poll_chunk_size)]
+
     def subscribe(self, path):
         if self.verbose:
             print('subscribe', path)
@@ -481,24 +644,21 @@ class MockDAQServer():
         Takes in a node_doc JSON file auto generates paths based on
         the contents of this file.
         """
-        f = open(filename).read()
-        node_pars = json.loads(f)
-        for par in node_pars.values():
-            node = par['Node'].split('/')
+        for info in load_node_index(filename).values():
             # The parfile is valid for all devices of a certain type
             # so the device name has to be split out.
-            parpath = '/' + self.device + '/' + '/'.join(node)
-            if par['Type'].startswith('Integer'):
-                self.nodes[parpath.lower()] = {'type': par['Type'], 'value': 0}
-            elif par['Type'].startswith('Double'):
+            parpath = '/' + self.device + '/' + info.node
+            if info.type.startswith('Integer'):
+                self.nodes[parpath.lower()] = {'type': info.type, 'value': 0}
+            elif info.type.startswith('Double'):
                 self.nodes[parpath.lower()] = {
-                    'type': par['Type'], 'value': 0.0}
-            elif par['Type'].startswith('Complex'):
+                    'type': info.type, 'value': 0.0}
+            elif info.type.startswith('Complex'):
                 self.nodes[parpath.lower()] = {
-                    'type': par['Type'], 'value': 0 + 0j}
-            elif par['Type'].startswith('String'):
+                    'type': info.type, 'value': 0 + 0j}
+            elif info.type.startswith('String'):
                 self.nodes[parpath.lower()] = {
-                    'type': par['Type'], 'value': ''}
+                    'type': info.type, 'value': ''}
 
 
 class MockAwgModule():
@@ -583,8 +743,10 @@ class ZI_base_instrument(Instrument):
     of the firmware are installed on the instrument.
 
     The base class also manages waveforms for the instruments. The waveforms
-    are kept in a table, which is kept synchronized with CSV files in the
-    awg/waves folder belonging to LabOne. The base class will select whether
+    are kept in a table, which is kept synchronized with binary (.npy) files in
+    the awg/waves folder belonging to LabOne. The CSV files read by the AWG
+    compiler are written to the same folder before a program is compiled.
+    The base class will select whether
     to compile and configure an instrument based on changes to the waveforms
     and to the requested AWG program. Basically, if a waveform changes length
     or if the AWG program changes, then the program will be compiled and
@@ -606,6 +768,7 @@ class ZI_base_instrument(Instrument):
                  port: int= 8004,
                  apilevel: int= 5,
                  num_codewords: int= 0,
+                 lazy_parameters: bool= True,
                  **kw) -> None:
         """
         Input arguments:
@@ -616,9 +779,16 @@ class ZI_base_instrument(Instrument):
             port            (int) the port to connect to for the ziDataServer (don't change)
             apilevel        (int) the API version level to use (don't change unless you know what you're doing)
             num_codewords   (int) the number of codeword-based waveforms to prepare
+            lazy_parameters (bool) if True, the parameters of the device nodes are
+                            only created when they are first accessed. Only created
+                            parameters are included in the snapshot, see
+                            'create_node_parameters'.
         """
         t0 = time.time()
         super().__init__(name=name, **kw)
+        self.parameters = _LazyParameterDict(
+            self.parameters, self._create_node_parameter)
+        self._lazy_parameters = lazy_parameters
 
         # Decide which server to use based on name
         if server == 'emulator':
@@ -681,6 +851,11 @@ class ZI_base_instrument(Instrument):
         self._awg_needs_configuration = [False]*(self._num_channels()//2)
         self._awg_program = [None]*(self._num_channels()//2)
 
+        # Hashes of the last successfully compiled program for each AWG, used
+        # to skip compilation of unchanged programs. Starts empty for every
+        # new connection to the device.
+        self._awg_program_hashes = {}
+
         # Create waveform parameters
         self._num_codewords = 0
         self._add_codeword_waveform_parameters(num_codewords)
@@ -752,6 +927,17 @@ class ZI_base_instrument(Instrument):
             initial_value=30,
             parameter_class=ManualParameter,
             vals=validators.Ints())
+        self.add_parameter(
+            'cfg_write_csv_waveforms',
+            initial_value=False,
+            parameter_class=ManualParameter,
+            docstring=('If True, the CSV file of a waveform is written every '
+                       'time the waveform changes, e.g., for debugging. '
+                       'Otherwise the CSV files, which are read by the AWG '
+                       'compiler, are only written before compiling a '
+                       'program. Waveforms are always stored in binary '
+                       'format.'),
+            vals=validators.Bool())
 
     ##########################################################################
     # Private methods
@@ -800,109 +986,110 @@ class ZI_base_instrument(Instrument):
     def _load_parameter_file(self, filename: str):
         """
         Takes in a node_doc JSON file auto generates parameters based on
-        the contents of this file.
+        the contents of this file. Unless lazy_parameters is False, the
+        parameters are created when they are first accessed.
         """
-        f = open(filename).read()
-        node_pars = json.loads(f)
-        for par in node_pars.values():
-            node = par['Node'].split('/')
-            # The parfile is valid for all devices of a certain type
-            # so the device name has to be split out.
-            parname = '_'.join(node).lower()
-            parpath = '/' + self.devname + '/' + '/'.join(node)
-
-            # This block provides the mapping between the ZI node and QCoDes
-            # parameter.
-            par_kw = {}
-            par_kw['name'] = parname
-            if par['Unit'] != 'None':
-                par_kw['unit'] = par['Unit']
-            else:
-                par_kw['unit'] = 'arb. unit'
-
-            par_kw['docstring'] = par['Description']
-            if "Options" in par.keys():
-                # options can be done better, this is not sorted
-                par_kw['docstring'] += '\nOptions:\n' + str(par['Options'])
-
-            # Creates type dependent get/set methods
-            if par['Type'] == 'Integer (64 bit)':
-                par_kw['set_cmd'] = _gen_set_cmd(self.seti, parpath)
-                par_kw['get_cmd'] = _gen_get_cmd(self.geti, parpath)
-                # min/max not implemented yet for ZI auto docstrings #352
-                par_kw['vals'] = validators.Ints()
-
-            elif par['Type'] == 'Integer (enumerated)':
-                par_kw['set_cmd'] = _gen_set_cmd(self.seti, parpath)
-                par_kw['get_cmd'] = _gen_get_cmd(self.geti, parpath)
-                par_kw['vals'] = validators.Ints(min_value=0,
-                                                 max_value=len(par["Options"]))
-
-            elif par['Type'] == 'Double':
-                par_kw['set_cmd'] = _gen_set_cmd(self.setd, parpath)
-                par_kw['get_cmd'] = _gen_get_cmd(self.getd, parpath)
-                # min/max not implemented yet for ZI auto docstrings #352
-                par_kw['vals'] = validators.Numbers()
-
-            elif par['Type'] == 'Complex Double':
-                par_kw['set_cmd'] = _gen_set_cmd(self.setc, parpath)
-                par_kw['get_cmd'] = _gen_get_cmd(self.getc, parpath)
-                # min/max not implemented yet for ZI auto docstrings #352
-                par_kw['vals'] = validators.Anything()
-
-            elif par['Type'] == 'ZIVectorData':
-                par_kw['set_cmd'] = _gen_set_cmd(self.setv, parpath)
-                par_kw['get_cmd'] = _gen_get_cmd(self.getv, parpath)
-                # min/max not implemented yet for ZI auto docstrings #352
-                par_kw['vals'] = validators.Arrays()
-
-            elif par['Type'] == 'String':
-                par_kw['set_cmd'] = _gen_set_cmd(self.sets, parpath)
-                par_kw['get_cmd'] = _gen_get_cmd(self.gets, parpath)
-                par_kw['vals'] = validators.Strings()
-
-            elif par['Type'] == 'CoreString':
-                par_kw['get_cmd'] = _gen_get_cmd(self.getd, parpath)
-                par_kw['set_cmd'] = None  # Not implemented
-                par_kw['vals'] = validators.Strings()
-
-            elif par['Type'] == 'ZICntSample':
-                par_kw['get_cmd'] = None  # Not implemented
-                par_kw['set_cmd'] = None  # Not implemented
-                par_kw['vals'] = None  # Not implemented
-
-            elif par['Type'] == 'ZITriggerSample':
-                par_kw['get_cmd'] = None  # Not implemented
-                par_kw['set_cmd'] = None  # Not implemented
-                par_kw['vals'] = None  # Not implemented
-
-            elif par['Type'] == 'ZIDIOSample':
-                par_kw['get_cmd'] = None  # Not implemented
-                par_kw['set_cmd'] = None  # Not implemented
-                par_kw['vals'] = None  # Not implemented
-
-            elif par['Type'] == 'ZIAuxInSample':
-                par_kw['get_cmd'] = None  # Not implemented
-                par_kw['set_cmd'] = None  # Not implemented
-                par_kw['vals'] = None  # Not implemented
-
-            elif par['Type'] == 'ZIScopeWave':
-                par_kw['get_cmd'] = None  # Not implemented
-                par_kw['set_cmd'] = None  # Not implemented
-                par_kw['vals'] = None  # Not implemented
+        self._node_index = load_node_index(filename)
+        self.parameters.add_lazy_names(self._node_index.keys())
+        if not self._lazy_parameters:
+            self.create_node_parameters()
 
-            else:
-                raise NotImplementedError(
-                    "Parameter '{}' of type '{}' not supported".format(
-                        parname, par['Type']))
-
-            # If not readable/writable the methods are removed after the type
-            # dependent loop to keep this more readable.
-            if 'Read' not in par['Properties']:
-                par_kw['get_cmd'] = None
-            if 'Write' not in par['Properties']:
-                par_kw['set_cmd'] = None
-            self.add_parameter(**par_kw)
+    def _create_node_parameter(self, parname: str):
+        """
+        Creates the parameter of a node in the node index. The parameter is
+        not added to the instrument.
+        """
+        info = self._node_index[parname]
+        parpath = '/' + self.devname + '/' + info.node
+
+        # This block provides the mapping between the ZI node and QCoDes
+        # parameter.
+        par_kw = {}
+        if info.unit != 'None':
+            par_kw['unit'] = info.unit
+        else:
+            par_kw['unit'] = 'arb. unit'
+
+        par_kw['docstring'] = info.docstring
+
+        # Creates type dependent get/set methods
+        if info.type == 'Integer (64 bit)':
+            par_kw['set_cmd'] = _gen_set_cmd(self.seti, parpath)
+            par_kw['get_cmd'] = _gen_get_cmd(self.geti, parpath)
+            # min/max not implemented yet for ZI auto docstrings #352
+            par_kw['vals'] = validators.Ints()
+
+        elif info.type == 'Integer (enumerated)':
+            par_kw['set_cmd'] = _gen_set_cmd(self.seti, parpath)
+            par_kw['get_cmd'] = _gen_get_cmd(self.geti, parpath)
+            par_kw['vals'] = validators.Ints(min_value=0,
+                                             max_value=info.nr_options)
+
+        elif info.type == 'Double':
+            par_kw['set_cmd'] = _gen_set_cmd(self.setd, parpath)
+            par_kw['get_cmd'] = _gen_get_cmd(self.getd, parpath)
+            # min/max not implemented yet for ZI auto docstrings #352
+            par_kw['vals'] = validators.Numbers()
+
+        elif info.type == 'Complex Double':
+            par_kw['set_cmd'] = _gen_set_cmd(self.setc, parpath)
+            par_kw['get_cmd'] = _gen_get_cmd(self.getc, parpath)
+            # min/max not implemented yet for ZI auto docstrings #352
+            par_kw['vals'] = validators.Anything()
+
+        elif info.type == 'ZIVectorData':
+            par_kw['set_cmd'] = _gen_set_cmd(self.setv, parpath)
+            par_kw['get_cmd'] = _gen_get_cmd(self.getv, parpath)
+            # min/max not implemented yet for ZI auto docstrings #352
+            par_kw['vals'] = validators.Arrays()
+
+        elif info.type == 'String':
+            par_kw['set_cmd'] = _gen_set_cmd(self.sets, parpath)
+            par_kw['get_cmd'] = _gen_get_cmd(self.gets, parpath)
+            par_kw['vals'] = validators.Strings()
+
+        elif info.type == 'CoreString':
+            par_kw['get_cmd'] = _gen_get_cmd(self.getd, parpath)
+            par_kw['set_cmd'] = None  # Not implemented
+            par_kw['vals'] = validators.Strings()
+
+        elif info.type == 'ZICntSample':
+            par_kw['get_cmd'] = None  # Not implemented
+            par_kw['set_cmd'] = None  # Not implemented
+            par_kw['vals'] = None  # Not implemented
+
+        elif info.type == 'ZITriggerSample':
+            par_kw['get_cmd'] = None  # Not implemented
+            par_kw['set_cmd'] = None  # Not implemented
+            par_kw['vals'] = None  # Not implemented
+
+        elif info.type == 'ZIDIOSample':
+            par_kw['get_cmd'] = None  # Not implemented
+            par_kw['set_cmd'] = None  # Not implemented
+            par_kw['vals'] = None  # Not implemented
+
+        elif info.type == 'ZIAuxInSample':
+            par_kw['get_cmd'] = None  # Not implemented
+            par_kw['set_cmd'] = None  # Not implemented
+            par_kw['vals'] = None  # Not implemented
+
+        elif info.type == 'ZIScopeWave':
+            par_kw['get_cmd'] = None  # Not implemented
+            par_kw['set_cmd'] = None  # Not implemented
+            par_kw['vals'] = None  # Not implemented
+
+        else:
+            raise NotImplementedError(
+                "Parameter '{}' of type '{}' not supported".format(
+                    parname, info.type))
+
+        # If not readable/writable the methods are removed after the type
+        # dependent loop to keep this more readable.
+        if not info.readable:
+            par_kw['get_cmd'] = None
+        if not info.writable:
+            par_kw['set_cmd'] = None
+        return Parameter(name=parname, instrument=self, **par_kw)
 
     def _create_parameter_file(self, filename: str):
         """
@@ -1000,23 +1187,54 @@ class ZI_base_instrument(Instrument):
                 log.debug(f"{self.devname}: Length of waveform has changed. Flagging awg as requiring recompilation.")
                 self._awg_needs_configuration[awg_nr] = True
 
-            # Update the associated CSV file
-            log.debug(f"{self.devname}: Updating csv waveform {wf_name}, for ch{ch}, cw{cw}")
-            self._write_csv_waveform(ch=ch, cw=cw, wf_name=wf_name,
-                                     waveform=waveform)
-
-            # And the entry in our table and mark it for update
+            # Update the entry in our table and the associated files
             self._awg_waveforms[wf_name]['waveform'] = waveform
+            log.debug(f"{self.devname}: Updating waveform files {wf_name}, for ch{ch}, cw{cw}")
+            self._write_waveform_files(ch=ch, cw=cw, wf_name=wf_name)
+
+            # And mark it for update
             log.debug(f"{self.devname}: Marking waveform as dirty.")
             self._awg_waveforms[wf_name]['dirty'] = True
 
         return write_func
 
-    def _write_csv_waveform(self, ch: int, cw: int, wf_name: str, waveform) -> None:
-        filename = os.path.join(
+    def _get_waveform_filename(self, wf_name: str, extension: str) -> str:
+        return os.path.join(
             self._get_awg_directory(), 'waves',
-            self.devname + '_' + wf_name + '.csv')
+            self.devname + '_' + wf_name + extension)
+
+    def _write_waveform_files(self, ch: int, cw: int, wf_name: str) -> None:
+        """
+        Stores a waveform in binary format. The CSV file that is read by
+        the AWG compiler is only marked as outdated, it is written before the
+        next compilation (see _write_outdated_csv_waveforms), unless
+        cfg_write_csv_waveforms is set.
+        """
+        waveform = self._awg_waveforms[wf_name]['waveform']
+        np.save(self._get_waveform_filename(wf_name, '.npy'), waveform)
+        self._awg_waveforms[wf_name]['csv_outdated'] = True
+        # NB: the parameter does not exist yet while the waveforms are
+        # initialized in the constructor
+        if 'cfg_write_csv_waveforms' in self.parameters and \
+                self.cfg_write_csv_waveforms():
+            self._write_csv_waveform(ch=ch, cw=cw, wf_name=wf_name,
+                                     waveform=waveform)
+
+    def _write_csv_waveform(self, ch: int, cw: int, wf_name: str, waveform) -> None:
+        filename = self._get_waveform_filename(wf_name, '.csv')
         np.savetxt(filename, waveform, delimiter=",")
+        self._awg_waveforms[wf_name]['csv_outdated'] = False
+
+    def _write_outdated_csv_waveforms(self) -> None:
+        """
+        Writes the CSV files of all waveforms that changed since their CSV
+        file was last written.
+        """
+        for wf_name, wf in self._awg_waveforms.items():
+            if wf.get('csv_outdated', False):
+                log.debug(f"{self.devname}: Writing csv waveform {wf_name}")
+                self._write_csv_waveform(ch=None, cw=None, wf_name=wf_name,
+                                         waveform=wf['waveform'])
 
     def _gen_read_waveform(self, ch, cw):
         def read_func():
@@ -1028,23 +1246,32 @@ class ZI_base_instrument(Instrument):
             log.debug(f"{self.devname}: Reading waveform {wf_name} for ch{ch} cw{cw}")
             # Check if the waveform data is in our dictionary
             if wf_name not in self._awg_waveforms:
-                log.debug(f"{self.devname}: Waveform not in self._awg_waveforms: reading from csv file.")
+                log.debug(f"{self.devname}: Waveform not in self._awg_waveforms: reading from file.")
                 # Initialize elements
                 self._awg_waveforms[wf_name] = {
-                    'waveform': None, 'dirty': False, 'readonly': False}
+                    'waveform': None, 'dirty': False, 'readonly': False,
+                    'csv_outdated': True}
                 # Make sure everything gets recompiled
                 log.debug(f"{self.devname}: Flagging awg as requiring recompilation.")
                 self._awg_needs_configuration[awg_nr] = True
-                # It isn't, so try to read the data from CSV
-                waveform = self._read_csv_waveform(ch, cw, wf_name)
+                # It isn't, so try to read the data from file
+                waveform = self._read_npy_waveform(ch, cw, wf_name)
+                if waveform is None:
+                    # One-time migration of waveforms that are only stored
+                    # in CSV format
+                    waveform = self._read_csv_waveform(ch, cw, wf_name)
+                    if waveform is not None:
+                        log.debug(f"{self.devname}: Converting csv waveform {wf_name} to binary format.")
+                        np.save(self._get_waveform_filename(wf_name, '.npy'), waveform)
+                        self._awg_waveforms[wf_name]['csv_outdated'] = False
                 # Check whether  we got something
                 if waveform is None:
-                    log.debug(f"{self.devname}: Waveform CSV does not exist, initializing to zeros.")
+                    log.debug(f"{self.devname}: Waveform file does not exist, initializing to zeros.")
                     # Nope, initialize to zeros
                     waveform = np.zeros(32)
                     self._awg_waveforms[wf_name]['waveform'] = waveform
-                    # write the CSV file
-                    self._write_csv_waveform(ch, cw, wf_name, waveform)
+                    # write the waveform files
+                    self._write_waveform_files(ch, cw, wf_name)
                 else:
                     # Got data, update dictionary
                     self._awg_waveforms[wf_name]['waveform'] = waveform
@@ -1055,10 +1282,18 @@ class ZI_base_instrument(Instrument):
 
         return read_func
 
+    def _read_npy_waveform(self, ch: int, cw: int, wf_name: str):
+        filename = self._get_waveform_filename(wf_name, '.npy')
+        try:
+            log.debug(f"{self.devname}: reading waveform from '{filename}'")
+            return np.load(filename)
+        except (OSError, ValueError) as e:
+            # if the waveform does not exist yet dont raise exception
+            log.debug(e)
+            return None
+
     def _read_csv_waveform(self, ch: int, cw: int, wf_name: str):
-        filename = os.path.join(
-            self._get_awg_directory(), 'waves',
-            self.devname + '_' + wf_name + '.csv')
+        filename = self._get_waveform_filename(wf_name, '.csv')
         try:
             log.debug(f"{self.devname}: reading waveform from csv '{filename}'")
             return np.genfromtxt(filename, delimiter=',')
@@ -1187,6 +1422,23 @@ class ZI_base_instrument(Instrument):
         """
         raise NotImplementedError('Virtual method with no implementation!')
 
+    def _get_awg_program_hash(self, program_string: str) -> str:
+        """
+        Returns a hash identifying an AWG program. It includes the contents
+        of the waveform files referenced in the program, as the compiler
+        reads the waveforms from these files.
+        """
+        program_hash = hashlib.sha1(program_string.encode('utf-8'))
+        waves_dir = os.path.join(self._get_awg_directory(), 'waves')
+        for wave_name in sorted(set(re.findall(r'"([^"]+)"', program_string))):
+            program_hash.update(wave_name.encode('utf-8'))
+            try:
+                with open(os.path.join(waves_dir, wave_name + '.csv'), 'rb') as f:
+                    program_hash.update(f.read())
+            except OSError:
+                pass
+        return program_hash.hexdigest()
+
     def _configure_awg_from_variable(self, awg_nr):
         """
         Configures an AWG with the program stored in the object in the self._awg_program[awg_nr] member.
@@ -1362,11 +1614,41 @@ class ZI_base_instrument(Instrument):
         t1 = time.time()
         log.info('Set all waveforms to zeros in {:.1f} ms'.format(1.0e3*(t1-t0)))
 
+    def create_node_parameters(self, patterns=('*',)) -> list:
+        """
+        Creates the parameters of the device nodes whose names match any of
+        the given patterns (e.g., 'sigouts_*_on'), so that they are included
+        in the snapshot. Returns the names of the matching parameters.
+        """
+        if isinstance(patterns, str):
+            patterns = (patterns,)
+        names = [name for name in self._node_index
+                 if any(fnmatch.fnmatchcase(name, p) for p in patterns)]
+        for name in names:
+            self.parameters[name]
+        return names
+
+    def invalidate_awg_program_cache(self, awg_nr: int=None):
+        """
+        Forgets the last compiled program of an AWG (or of all AWGs if awg_nr
+        is None), such that the next call to configure_awg_from_string
+        compiles the program.
+        """
+        if awg_nr is None:
+            self._awg_program_hashes.clear()
+        else:
+            self._awg_program_hashes.pop(awg_nr, None)
+
     def configure_awg_from_string(self, awg_nr: int, program_string: str,
-                                  timeout: float=15):
+                                  timeout: float=15, force: bool=False):
         """
         Uploads a program string to one of the AWGs in a UHF-QA or AWG-8.
 
+        The compilation is skipped if the program (including the waveform
+        files it references) is identical to the last program that was
+        successfully compiled for this AWG and the AWG is still ready.
+        Set force to True to always compile the program.
+
         This function is tested to work and give the correct error messages
         when compilation fails.
         """
@@ -1374,6 +1656,18 @@ class ZI_base_instrument(Instrument):
         # Check that awg_nr is set in accordance with devtype
         self._check_awg_nr(awg_nr)
 
+        # The compiler reads the waveforms from the CSV files
+        self._write_outdated_csv_waveforms()
+        program_hash = self._get_awg_program_hash(program_string)
+        if not force and self._awg_program_hashes.get(awg_nr) == program_hash:
+            # The program is no longer loaded if, e.g., the device was reset
+            ready = self.getdeep('awgs/{}/ready'.format(awg_nr))
+            if ready is not None and ready['value'][0] == 1:
+                log.info(f'{self.devname}: Program of AWG {awg_nr} is unchanged, skipping compilation.')
+                return
+        # Forget the previous program, e.g., in case the compilation fails
+        self.invalidate_awg_program_cache(awg_nr)
+
         t0 = time.time()
         success_and_ready = False
 
@@ -1427,6 +1721,7 @@ class ZI_base_instrument(Instrument):
         t1 = time.time()
         print(self._awgModule.get('awgModule/compiler/statusstring')
               ['compiler']['statusstring'][0] + ' in {:.2f}s'.format(t1-t0))
+        self._awg_program_hashes[awg_nr] = program_hash
 
         # Check status
         if self.get('awgs_{}_waveform_memoryusage'.format(awg_nr)) > 1.0:
@@ -1,4 +1,6 @@
 import time
+import logging
+import threading
 import PyQt5
 import pyqtgraph as pg
 import pyqtgraph.multiprocess as pgmp
@@ -6,11 +8,22 @@ import pyqtgraph.multiprocess as pgmp
 from qcodes.instrument.base import Instrument
 from qcodes.utils import validators as vals
 from qcodes.instrument.parameter import ManualParameter
+from pycqed.utilities.general import get_fingerprint
+
+log = logging.getLogger(__name__)
 
 
 class InstrumentMonitor(Instrument):
     """
-    Creates a pyqtgraph widget that displays
+    Creates a pyqtgraph widget that displays the parameters of the
+    instruments in a station.
+
+    The monitor only shows the latest known values of the parameters (it
+    never queries the instruments) and only sends the parameters that
+    changed since the previous update to the widget. If update_in_background
+    is True, the widget is updated from a background thread every
+    update_interval and calling update (e.g., from the MeasurementControl)
+    returns immediately.
     """
     proc = None
     rpg = None
@@ -29,7 +42,13 @@ class InstrumentMonitor(Instrument):
                            vals=vals.Numbers(min_value=0.001),
                            initial_value=5,
                            parameter_class=ManualParameter)
-        # self.add_parameter
+        # signatures of the parameter snapshots that were sent to the widget
+        self._sent_signatures = {}
+        self._update_lock = threading.Lock()
+        self._update_requested = threading.Event()
+        self._stop_updates = threading.Event()
+        self._update_thread = None
+        self._remote = remote
         if remote:
             if not self.__class__.proc:
                 self._init_qt()
@@ -39,13 +58,117 @@ class InstrumentMonitor(Instrument):
         # initial value is fake but ensures it will update the first time
         self.last_update_time = 0
         self.create_tree(figsize=figsize)
+        self.add_parameter(
+            'update_in_background',
+            docstring=(
+                'If True, the monitor is updated from a background thread. '
+                'Only supported for a remote monitor, as the widget of a '
+                'local monitor lives in the main (Qt) thread.'),
+            vals=vals.Bool(),
+            get_cmd=self._get_update_in_background,
+            set_cmd=self._set_update_in_background)
+        self.update_in_background(remote)
+
+    def update(self, force: bool=False):
+        """
+        Updates the monitor if update_interval elapsed since the last update
+        or if force is True. If the monitor is updated in the background,
+        this only requests an update (if force) and returns immediately.
+        """
+        if self._get_update_in_background():
+            if force:
+                self._update_requested.set()
+            return
+        self._update(force=force)
+
+    def _update(self, force: bool=False):
+        with self._update_lock:
+            time_since_last_update = time.time()-self.last_update_time
+            if force or time_since_last_update > self.update_interval():
+                self.last_update_time = time.time()
+                changes = self.get_snapshot_changes()
+                if changes:
+                    self.tree.setData(changes)
+
+    def get_snapshot_changes(self):
+        """
+        Returns a snapshot of the parameters of the station that changed
+        since the last call, in the format of the 'instruments' entry of a
+        station snapshot.
+
+        The snapshot contains the latest known values of the parameters, the
+        instruments are not queried.
+        """
+        changes = {}
+        for ins_name, ins in list(self.station.components.items()):
+            if not hasattr(ins, 'parameters'):
+                continue
+            par_snaps = {}
+            for par_name, par in list(ins.parameters.items()):
+                try:
+                    par_snap = par.snapshot(update=False)
+                except Exception as e:
+                    log.debug('Could not snapshot {}.{}: {}'.format(
+                        ins_name, par_name, e))
+                    continue
+                signature = (par_snap.get('ts'), par_snap.get('unit'),
+                             get_fingerprint(par_snap.get('value')))
+                if self._sent_signatures.get((ins_name, par_name)) != signature:
+                    self._sent_signatures[(ins_name, par_name)] = signature
+                    par_snaps[par_name] = par_snap
+            if par_snaps:
+                changes[ins_name] = {'parameters': par_snaps}
+        return changes
+
+    def _get_update_in_background(self):
+        return self._update_thread is not None and self._update_thread.is_alive()
+
+    def _set_update_in_background(self, val):
+        if val:
+            self.start_background_updates()
+        else:
+            self.stop_background_updates()
+
+    def start_background_updates(self):
+        """
+        Starts updating the monitor from a background thread.
+        """
+        if not self._remote:
+            raise ValueError('Background updates are only supported for a '
+                             'remote instrument monitor.')
+        if self._get_update_in_background():
+            return
+        self._stop_updates.clear()
+        self._update_thread = threading.Thread(
+            target=self._run_background_updates,
+            name='{}_updates'.format(self.name), daemon=True)
+        self._update_thread.start()
+
+    def stop_background_updates(self):
+        """
+        Stops updating the monitor from a background thread.
+        """
+        if self._update_thread is None:
+            return
+        self._stop_updates.set()
+        self._update_requested.set()
+        self._update_thread.join()
+        self._update_thread = None
+
+    def _run_background_updates(self):
+        while not self._stop_updates.is_set():
+            self._update_requested.wait(timeout=self.update_interval())
+            self._update_requested.clear()
+            if self._stop_updates.is_set():
+                break
+            try:
+                self._update(force=True)
+            except Exception as e:
+                log.warning('Could not update {}: {}'.format(self.name, e))
 
-    def update(self):
-        time_since_last_update = time.time()-self.last_update_time
-        if time_since_last_update > self.update_interval():
-            self.last_update_time = time.time()
-            snapshot = self.station.snapshot()
-            self.tree.setData(snapshot['instruments'])
+    def close(self):
+        self.stop_background_updates()
+        super().close()
 
     def _init_qt(self):
         # starting the process for the pyqtgraph plotting
@@ -60,7 +183,8 @@ class InstrumentMonitor(Instrument):
     def create_tree(self, figsize=(1000, 600)):
 
         self.tree = self.rpg.QcSnaphotWidget()
-        self.update()
+        self._sent_signatures = {}
+        self._update(force=True)
         self.tree.show()
         self.tree.setWindowTitle('Instrument Monitor')
         self.tree.resize(*figsize)
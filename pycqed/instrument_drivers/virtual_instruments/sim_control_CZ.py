@@ -215,6 +215,14 @@ class SimControlCZ(Instrument):
             initial_value="",  # Use empty string to evaluate to false
         )
 
+        self.add_parameter(
+            "propagator_engine",
+            docstring="Engine used to compute the propagator. 'qutip' builds the Liouvillian and its exponential for every time step using qutip objects, 'numpy' computes all time steps at once on dense numpy arrays (see czf.time_evolution_dense).",
+            parameter_class=ManualParameter,
+            vals=vals.Enum("qutip", "numpy"),
+            initial_value="qutip",
+        )
+
         # for ramsey/Rabi simulations
 
         self.add_parameter(
@@ -8,6 +8,8 @@ import numpy as np
 import logging
 import time
 from string import ascii_uppercase
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pycqed.analysis import analysis_toolbox as a_tools
 from pycqed.analysis.fit_toolbox import functions as fn
 from pycqed.measurement.waveform_control import pulse
@@ -232,9 +234,28 @@ class Multi_Detector(Detector_Function):
 
 class Multi_Detector_UHF(Multi_Detector):
     """
-    Special multi detector
+    Special multi detector for UHFQC detectors. All UHFQCs are started
+    together by the AWG of the first detector and their results are
+    retrieved concurrently.
     """
 
+    def __init__(self, detectors: list,
+                 detector_labels: list = None,
+                 det_idx_prefix: bool = True, *,
+                 parallel_retrieval: bool = True, **kw):
+        """
+        detectors     (list):
+            a list of UHFQC detectors to combine.
+        detector_labels, det_idx_prefix:
+            see Multi_Detector.
+        parallel_retrieval (bool):
+            if True the different UHFQCs are polled concurrently, detectors
+            that share a UHFQC are always read out sequentially.
+        """
+        super().__init__(detectors, detector_labels=detector_labels,
+                         det_idx_prefix=det_idx_prefix, **kw)
+        self.parallel_retrieval = parallel_retrieval
+
     def get_values(self):
         values_list = []
 
@@ -252,12 +273,39 @@ class Multi_Detector_UHF(Multi_Detector):
         self.detectors[0].AWG.start()
 
         # Get data
-        for detector in self.detectors:
-            new_values = detector.get_values(arm=False, is_single_detector=False)
-            values_list.append(new_values)
+        values_list = self._retrieve_values()
         values = np.concatenate(values_list)
         return values
 
+    def _retrieve_values(self):
+        """
+        Returns the values of the armed detectors, in the order of
+        self.detectors.
+        """
+        # Every UHFQC has its own data server connection, detectors that
+        # share a UHFQC are read out sequentially by the same thread.
+        groups = OrderedDict()
+        for i, detector in enumerate(self.detectors):
+            groups.setdefault(id(detector.UHFQC), []).append(i)
+
+        def get_group_values(det_idxs):
+            return [(i, self.detectors[i].get_values(
+                arm=False, is_single_detector=False)) for i in det_idxs]
+
+        if self.parallel_retrieval and len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                group_values = list(
+                    executor.map(get_group_values, groups.values()))
+        else:
+            group_values = [get_group_values(det_idxs)
+                            for det_idxs in groups.values()]
+
+        values_list = [None] * len(self.detectors)
+        for det_values in group_values:
+            for i, new_values in det_values:
+                values_list[i] = new_values
+        return values_list
+
     def acquire_data_point(self):
         # N.B. get_values and acquire_data point are virtually identical.
         # the only reason for their existence is a historical distinction
@@ -421,7 +469,7 @@ class QX_Hard_Detector(Hard_Detector):
 
 class Dummy_Shots_Detector(Hard_Detector):
 
-    def __init__(self, max_shots=10, **kw):
+    def __init__(self, max_shots=10, streaming=False, chunk_size=3, **kw):
         super().__init__()
         self.set_kw()
         self.detector_control = 'hard'
@@ -429,6 +477,8 @@ class Dummy_Shots_Detector(Hard_Detector):
         self.value_units = ['m']
         self.max_shots = max_shots
         self.times_called = 0
+        self.streaming = streaming
+        self.chunk_size = chunk_size
 
     def prepare(self, sweep_points):
         self.sweep_points = sweep_points
@@ -442,6 +492,11 @@ class Dummy_Shots_Detector(Hard_Detector):
         self.times_called += 1
         return dat
 
+    def get_values_chunks(self):
+        dat = self.get_values()
+        for i in range(0, len(dat), self.chunk_size):
+            yield dat[i:i+self.chunk_size]
+
 
 class Sweep_pts_detector(Detector_Function):
 
@@ -2148,6 +2203,7 @@ class UHFQC_integration_logging_det(Hard_Detector):
                  always_prepare: bool = False,
                  prepare_function=None,
                  prepare_function_kwargs: dict = None,
+                 streaming: bool = False,
                  **kw):
         """
         Args:
@@ -2170,6 +2226,11 @@ class UHFQC_integration_logging_det(Hard_Detector):
             first call the prepare statement. This is particularly important
             when it is both a single_int_avg detector and acquires multiple
             segments per point.
+        streaming (bool) : when True the MeasurementControl acquires the
+            shots using get_values_chunks, which yields the shots as they
+            are polled from the UHFQC. The shots are written to the
+            datafile directly, so the memory used does not depend on the
+            number of shots.
         """
         super().__init__()
 
@@ -2214,6 +2275,7 @@ class UHFQC_integration_logging_det(Hard_Detector):
         self.always_prepare = always_prepare
         self.prepare_function = prepare_function
         self.prepare_function_kwargs = prepare_function_kwargs
+        self.streaming = streaming
 
     def _get_readout(self):
         return sum([(1 << c) for c in self.channels])
@@ -2222,7 +2284,7 @@ class UHFQC_integration_logging_det(Hard_Detector):
         # UHFQC internal readout counters reset as part of the call to acquisition_initialize
         self.UHFQC.acquisition_arm()
 
-    def get_values(self, arm=True, is_single_detector=True):
+    def _start_acquisition(self, arm=True, is_single_detector=True):
         if is_single_detector:
             if self.always_prepare:
                 self.prepare()
@@ -2238,19 +2300,37 @@ class UHFQC_integration_logging_det(Hard_Detector):
             if self.AWG is not None:
                 self.AWG.start()
 
+    def _get_offsets(self):
+        # Corrects offsets after crosstalk suppression matrix in UFHQC
+        if self.result_logging_mode == 'lin_trans':
+            return np.array([[self.UHFQC.get(
+                'qas_0_trans_offset_weightfunction_{}'.format(channel))]
+                for channel in self.channels])
+        return 0
+
+    def get_values(self, arm=True, is_single_detector=True):
+        self._start_acquisition(arm, is_single_detector)
+
         # Get the data
         data_raw = self.UHFQC.acquisition_poll(
             samples=self.nr_shots, arm=False, acquisition_time=0.01)
         data = np.array([data_raw[key]
         # data = np.array([data_raw[key][-1]
                          for key in sorted(data_raw.keys())])*self.scaling_factor
+        return data - self._get_offsets()
 
-        # Corrects offsets after crosstalk suppression matrix in UFHQC
-        if self.result_logging_mode == 'lin_trans':
-            for i, channel in enumerate(self.channels):
-                data[i] = data[i]-self.UHFQC.get(
-                    'qas_0_trans_offset_weightfunction_{}'.format(channel))
-        return data
+    def get_values_chunks(self, arm=True, is_single_detector=True):
+        """
+        Yields the shots in chunks of shape (len(channels), nr_new_shots)
+        as they are polled from the UHFQC.
+        """
+        self._start_acquisition(arm, is_single_detector)
+        offsets = self._get_offsets()
+        for data_raw in self.UHFQC.acquisition_poll_chunks(
+                samples=self.nr_shots, arm=False, acquisition_time=0.01):
+            data = np.array([data_raw[key]
+                             for key in sorted(data_raw.keys())])
+            yield data*self.scaling_factor - offsets
 
     def prepare(self, sweep_points):
         if self.AWG is not None:
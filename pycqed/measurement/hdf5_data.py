@@ -12,6 +12,8 @@ Contains:
 
 import os
 import time
+import json
+import hashlib
 import h5py
 import numpy as np
 import logging
@@ -122,6 +124,246 @@ class Data(h5py.File):
         self.flush()
 
 
+class PreallocatedDataset:
+    """
+    Wrapper around a resizable 2D h5py dataset that separates the number of
+    rows in use from the number of rows allocated in the file.
+
+    Supports the part of the h5py.Dataset interface that is used by the
+    MeasurementControl (shape, len, resize, indexing and attrs), indexing
+    is relative to the rows in use.
+    Resizing beyond the allocated number of rows grows the dataset
+    geometrically. Calling "trim" resizes the dataset in the file to the
+    rows in use, after which the content of the file is identical to
+    writing directly to the h5py dataset.
+
+    Args:
+        dset (h5py.Dataset): resizable 2D dataset, its current shape is
+            the allocated shape.
+        nr_rows (int): number of rows in use.
+    """
+
+    def __init__(self, dset, nr_rows: int = 0):
+        self.dset = dset
+        self._nr_rows = nr_rows
+        # highest number of rows that has been in use, rows below this
+        # value can contain stale data if the dataset was shrunk
+        self._max_nr_rows = nr_rows
+
+    @property
+    def shape(self):
+        return (self._nr_rows, self.dset.shape[1])
+
+    @property
+    def dtype(self):
+        return self.dset.dtype
+
+    @property
+    def attrs(self):
+        return self.dset.attrs
+
+    def __len__(self):
+        return self._nr_rows
+
+    def __getitem__(self, key):
+        return self.dset[self._translate_key(key)]
+
+    def __setitem__(self, key, value):
+        self.dset[self._translate_key(key)] = value
+
+    def _translate_key(self, key):
+        """
+        Translates an index relative to the rows in use to an index of
+        the allocated dataset.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) == 0:
+            return (slice(0, self._nr_rows),)
+        row_key, col_key = key[0], key[1:]
+        if row_key is Ellipsis:
+            row_key = slice(None)
+        if isinstance(row_key, slice):
+            start, stop, step = row_key.indices(self._nr_rows)
+            if step < 0:
+                raise ValueError('Negative steps are not supported.')
+            row_key = slice(start, max(start, stop), step)
+        elif isinstance(row_key, (int, np.integer)):
+            row = int(row_key)
+            if row < 0:
+                row += self._nr_rows
+            if not 0 <= row < self._nr_rows:
+                raise IndexError('Index {} is out of range for dataset with '
+                                 '{} rows.'.format(row_key, self._nr_rows))
+            row_key = row
+        else:
+            rows = np.asarray(row_key)
+            if rows.dtype == bool:
+                rows = np.nonzero(rows)[0]
+            row_key = np.where(rows < 0, rows + self._nr_rows, rows)
+        return (row_key,) + col_key
+
+    def resize(self, size):
+        nr_rows, nr_cols = size
+        if nr_cols != self.dset.shape[1]:
+            raise ValueError('Only the number of rows of a '
+                             'PreallocatedDataset can be changed.')
+        nr_rows_alloc = self.dset.shape[0]
+        if nr_rows > nr_rows_alloc:
+            self.dset.resize((max(nr_rows, 2 * nr_rows_alloc), nr_cols))
+        if nr_rows > self._nr_rows and self._max_nr_rows > self._nr_rows:
+            # rows can contain stale values if the dataset was shrunk before
+            self.dset[self._nr_rows:min(nr_rows, self._max_nr_rows)] = 0
+        self._nr_rows = nr_rows
+        self._max_nr_rows = max(self._max_nr_rows, nr_rows)
+
+    def trim(self):
+        """
+        Resizes the dataset in the file to the rows in use.
+        """
+        if self.dset.shape[0] != self._nr_rows:
+            self.dset.resize(self.shape)
+
+
+class BufferedDataset:
+    """
+    In-memory write-behind buffer for a resizable 2D h5py dataset.
+
+    Supports the part of the h5py.Dataset interface that is used by the
+    MeasurementControl (shape, len, resize, indexing and attrs).
+    All reads are served from memory. Writes are kept in memory and are only
+    written to the underlying dataset when "flush" is called, or when one of
+    the flush conditions is met when calling "flush_if_due".
+    The content of the dataset after a flush is identical to writing
+    directly to the h5py dataset.
+
+    Args:
+        dset (h5py.Dataset): resizable 2D dataset to write to.
+        nr_rows_hint (int): expected number of rows, used to preallocate
+            the buffer. The buffer grows if more rows are required.
+        flush_interval (float): maximum time in seconds between flushes.
+        flush_nr_rows (int): maximum number of modified rows that is held
+            in memory before flushing.
+    """
+
+    def __init__(self, dset, nr_rows_hint: int = None,
+                 flush_interval: float = 10, flush_nr_rows: int = 1000):
+        self.dset = dset
+        self.flush_interval = flush_interval
+        self.flush_nr_rows = flush_nr_rows
+
+        nr_rows, nr_cols = dset.shape
+        nr_rows_alloc = max(nr_rows, nr_rows_hint or 0, 1)
+        self._data = np.zeros((nr_rows_alloc, nr_cols), dtype=dset.dtype)
+        if nr_rows > 0:
+            self._data[:nr_rows] = dset[()]
+        self._nr_rows = nr_rows
+        # shape of the dataset on disk, tracked here so that flushing
+        # does not require accessing the file when there is nothing to write
+        self._flushed_shape = dset.shape
+        self._dirty_start = None
+        self._dirty_stop = None
+        self._last_flush_time = time.time()
+
+    @property
+    def shape(self):
+        return (self._nr_rows, self._data.shape[1])
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def attrs(self):
+        return self.dset.attrs
+
+    def __len__(self):
+        return self._nr_rows
+
+    def __getitem__(self, key):
+        val = self._data[:self._nr_rows][key]
+        # copy to match the behaviour of h5py, which never returns views
+        if isinstance(val, np.ndarray):
+            return val.copy()
+        return val
+
+    def __setitem__(self, key, value):
+        self._data[:self._nr_rows][key] = value
+        rows = self._get_row_range(key)
+        if rows is not None:
+            start, stop = rows
+            if self._dirty_start is None:
+                self._dirty_start, self._dirty_stop = start, stop
+            else:
+                self._dirty_start = min(self._dirty_start, start)
+                self._dirty_stop = max(self._dirty_stop, stop)
+
+    def _get_row_range(self, key):
+        """
+        Returns the (start, stop) range of rows addressed by key or None if
+        no rows are addressed.
+        """
+        row_key = key[0] if isinstance(key, tuple) else key
+        if isinstance(row_key, slice):
+            rows = range(*row_key.indices(self._nr_rows))
+            if len(rows) == 0:
+                return None
+            return min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+        elif isinstance(row_key, (int, np.integer)):
+            row = int(row_key) % self._nr_rows
+            return row, row + 1
+        else:
+            rows = np.arange(self._nr_rows)[row_key]
+            if np.size(rows) == 0:
+                return None
+            return int(np.min(rows)), int(np.max(rows)) + 1
+
+    def resize(self, size):
+        nr_rows, nr_cols = size
+        if nr_cols != self._data.shape[1]:
+            raise ValueError('Only the number of rows of a BufferedDataset '
+                             'can be changed.')
+        if nr_rows > len(self._data):
+            # grow geometrically to avoid copying the buffer on every resize
+            new_data = np.zeros((max(nr_rows, 2 * len(self._data)), nr_cols),
+                                dtype=self._data.dtype)
+            new_data[:self._nr_rows] = self._data[:self._nr_rows]
+            self._data = new_data
+        elif nr_rows > self._nr_rows:
+            # rows can contain stale values if the dataset was shrunk before
+            self._data[self._nr_rows:nr_rows] = 0
+        self._nr_rows = nr_rows
+
+    def flush(self):
+        """
+        Writes all modified rows and the current shape to the dataset.
+        """
+        if self._flushed_shape != self.shape:
+            self.dset.resize(self.shape)
+            self._flushed_shape = self.shape
+        if self._dirty_start is not None:
+            start = self._dirty_start
+            stop = min(self._dirty_stop, self._nr_rows)
+            if stop > start:
+                self.dset[start:stop] = self._data[start:stop]
+        self._dirty_start = None
+        self._dirty_stop = None
+        self._last_flush_time = time.time()
+
+    def flush_if_due(self):
+        """
+        Flushes if the flush interval has passed or if the number of
+        modified rows exceeds flush_nr_rows.
+        """
+        if self._dirty_start is None:
+            nr_dirty_rows = 0
+        else:
+            nr_dirty_rows = self._dirty_stop - self._dirty_start
+        if (nr_dirty_rows >= self.flush_nr_rows or
+                time.time() - self._last_flush_time >= self.flush_interval):
+            self.flush()
+
+
 def encode_to_utf8(s):
     '''
     Required because h5py does not support python3 strings
@@ -320,22 +562,184 @@ def extract_pars_from_datafile(filepath: str, param_spec: dict)-> dict:
             dictionary containing the extracted parameters.
     """
     param_dict = {}
-    f = h5py.File(filepath, 'r')
     with h5py.File(filepath, 'r') as f:
         for par_name, par_spec in param_spec.items():
-            entry = f[par_spec[0]]
-            if par_spec[1].startswith('dset'):
-                param_dict[par_name] = entry.value
-            elif par_spec[1].startswith('attr:all_attr'):
-                param_dict[par_name] = dict()
-                for attribute_name in entry.attrs.keys():
-                    param_dict[par_name][attribute_name] = entry.attrs[attribute_name]
-            elif par_spec[1].startswith('attr'):
-                param_dict[par_name] = entry.attrs[par_spec[1][5:]]
+            try:
+                entry = f[par_spec[0]]
+            except KeyError:
+                # Entries of unchanged instruments in a deduplicated
+                # snapshot are stored in the reference datafile
+                ref_path = _get_reference_filepath(f, par_spec[0])
+                if ref_path is None:
+                    raise
+                with h5py.File(ref_path, 'r') as ref_file:
+                    param_dict[par_name] = _extract_par(
+                        ref_file[par_spec[0]], par_spec[1])
+            else:
+                param_dict[par_name] = _extract_par(entry, par_spec[1])
 
     return param_dict
 
 
+def _extract_par(entry, spec: str):
+    if spec.startswith('dset'):
+        return entry[()]
+    elif spec.startswith('attr:all_attr'):
+        return {attribute_name: entry.attrs[attribute_name]
+                for attribute_name in entry.attrs.keys()}
+    elif spec.startswith('attr'):
+        return entry.attrs[spec[5:]]
+
+
+def _get_reference_filepath(h5_file, path: str):
+    """
+    Returns the path of the reference datafile if path refers to an
+    instrument stored in the reference snapshot, else None.
+    """
+    path_parts = path.strip('/').split('/')
+    if (len(path_parts) < 3 or path_parts[:2] != ['Snapshot', 'instruments']
+            or 'Snapshot' not in h5_file):
+        return None
+    ref_path, ref_instruments = _get_snapshot_reference(h5_file)
+    if path_parts[2] not in ref_instruments:
+        return None
+    return ref_path
+
+
+def hash_snapshot(snapshot: dict):
+    """
+    Returns a content hash of a (cleaned) snapshot dictionary or None if
+    the snapshot cannot be serialized to determine the hash.
+    """
+    def default(obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        elif isinstance(obj, np.generic):
+            return obj.item()
+        return repr(obj)
+    try:
+        serialized = json.dumps(snapshot, sort_keys=True, default=default)
+    except (TypeError, ValueError):
+        # e.g., dictionaries with keys of mixed types can not be sorted
+        return None
+    return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Writes station snapshots to datafiles, storing only the instruments
+    that changed with respect to the last full snapshot.
+
+    The snapshot group of a deduplicated datafile contains the attributes
+    "reference_snapshot", the path of the datafile containing the last full
+    snapshot relative to the folder of the datafile, and
+    "reference_instruments", the names of the instruments that are
+    unchanged and have to be read from the reference datafile.
+    Use "read_snapshot" to read the full snapshot.
+
+    Args:
+        full_snapshot_interval (int): maximum number of deduplicated
+            snapshots written before writing a new full snapshot.
+    """
+
+    def __init__(self, full_snapshot_interval: int = 100):
+        self.full_snapshot_interval = full_snapshot_interval
+        self.reset()
+
+    def reset(self):
+        """
+        Ensures that the next snapshot is written in full.
+        """
+        self._reference_filepath = None
+        self._instrument_hashes = {}
+        self._nr_deduplicated = 0
+
+    def write(self, snapshot: dict, snap_grp, filepath: str):
+        """
+        Args:
+            snapshot (dict): cleaned snapshot of the station.
+            snap_grp (hdf5 group): group to write the snapshot to.
+            filepath (str): path of the datafile that contains snap_grp.
+        """
+        instruments = snapshot.get('instruments', {})
+        hashes = {name: hash_snapshot(ins_snap)
+                  for name, ins_snap in instruments.items()}
+
+        if (self._reference_filepath is None or
+                self._nr_deduplicated >= self.full_snapshot_interval or
+                not os.path.isfile(self._reference_filepath)):
+            write_dict_to_hdf5(snapshot, entry_point=snap_grp)
+            self._reference_filepath = os.path.abspath(filepath)
+            self._instrument_hashes = hashes
+            self._nr_deduplicated = 0
+            return
+
+        changed_instruments = {}
+        reference_instruments = []
+        for name, ins_snap in instruments.items():
+            if (hashes[name] is not None and
+                    hashes[name] == self._instrument_hashes.get(name)):
+                reference_instruments.append(name)
+            else:
+                changed_instruments[name] = ins_snap
+        snap_diff = dict(snapshot)
+        snap_diff['instruments'] = changed_instruments
+        write_dict_to_hdf5(snap_diff, entry_point=snap_grp)
+        snap_grp.attrs['reference_snapshot'] = encode_to_utf8(
+            os.path.relpath(self._reference_filepath,
+                            os.path.dirname(os.path.abspath(filepath))))
+        snap_grp.attrs['reference_instruments'] = encode_to_utf8(
+            reference_instruments)
+        self._nr_deduplicated += 1
+
+
+def _get_snapshot_reference(h5_file):
+    """
+    Returns the path of the reference datafile and the names of the
+    instruments stored in it for a deduplicated snapshot, or (None, [])
+    if the snapshot in the datafile is complete.
+    """
+    snap_attrs = h5_file['Snapshot'].attrs
+    if 'reference_snapshot' not in snap_attrs:
+        return None, []
+    ref_path = _decode(snap_attrs['reference_snapshot'])
+    ref_path = os.path.join(os.path.dirname(h5_file.filename), ref_path)
+    ref_instruments = [_decode(name) for name in
+                       snap_attrs['reference_instruments']]
+    return ref_path, ref_instruments
+
+
+def _decode(s):
+    return s.decode('utf-8') if isinstance(s, bytes) else str(s)
+
+
+def read_snapshot(h5_file) -> dict:
+    """
+    Reads the station snapshot from a datafile, reconstructing the full
+    snapshot if it was written by a SnapshotStore.
+
+    Args:
+        h5_file (h5py.File or str): opened datafile or path to a datafile.
+    """
+    if isinstance(h5_file, str):
+        with h5py.File(h5_file, 'r') as f:
+            return read_snapshot(f)
+
+    snapshot = read_dict_from_hdf5({}, h5_group=h5_file['Snapshot'])
+    ref_path, ref_instruments = _get_snapshot_reference(h5_file)
+    if ref_path is None:
+        return snapshot
+    del snapshot['reference_snapshot']
+    del snapshot['reference_instruments']
+
+    instruments = snapshot.setdefault('instruments', {})
+    with h5py.File(ref_path, 'r') as ref_file:
+        ref_grp = ref_file['Snapshot']['instruments']
+        for name in ref_instruments:
+            instruments[name] = read_dict_from_hdf5({}, h5_group=ref_grp[name])
+    return snapshot
+
+
 def RepresentsInt(s):
     try:
         int(s)
@@ -355,29 +355,30 @@ def first_order_bounce_corr(sig, delay, amp, awg_sample_rate,
     if scope_sample_rate is None:
         scope_sample_rate = awg_sample_rate
 
-    # Reserve buffer space for bounce compensation
-    shift_reg = np.zeros(delay_n_samples)
-
+    sig = np.asarray(sig, dtype=np.float64)
     awg_sample_incr = awg_sample_rate/scope_sample_rate
-
-    previous_awg_sample_cnt = 0
-    present_awg_sample_cnt = 0
-
     amp_hw = coef_round(amp, force_bshift=0)
 
-    sigout = np.zeros(len(sig))
-
-    for i, s in enumerate(sig):
-        # Compute output signal
-        sigout[i] = s + amp_hw*shift_reg[-1]
-
-        present_awg_sample_cnt += awg_sample_incr
-        awg_sample_diff = int(present_awg_sample_cnt) - previous_awg_sample_cnt
-        if awg_sample_diff >= 1:
-            # Update shift register with present scope sample
-            shift_reg[awg_sample_diff:] = shift_reg[:-awg_sample_diff]
-            shift_reg[:awg_sample_diff] = s*np.ones(awg_sample_diff)
-            previous_awg_sample_cnt = int(present_awg_sample_cnt)
+    # The hardware keeps a shift register of delay_n_samples AWG samples.
+    # Every scope sample i advances the AWG sample counter to
+    # awg_sample_cnt[i] (the cumulative sum reproduces the accumulation of
+    # the hardware counter exactly) and all AWG samples up to that count are
+    # filled with the present scope sample.
+    awg_sample_cnt = np.cumsum(np.full(len(sig), awg_sample_incr)).astype(
+        np.int64)
+    prev_awg_sample_cnt = np.concatenate(([0], awg_sample_cnt))[:-1]
+
+    # The output of scope sample i uses the oldest AWG sample in the
+    # register, which was filled by the first scope sample that advanced
+    # the counter to (at least) delayed_awg_sample.
+    delayed_awg_sample = prev_awg_sample_cnt - (delay_n_samples - 1)
+    filled = delayed_awg_sample >= 1
+    src_idx = np.searchsorted(awg_sample_cnt, delayed_awg_sample[filled],
+                              side='left')
+    shift_reg_out = np.zeros(len(sig))
+    shift_reg_out[filled] = sig[src_idx]
+
+    sigout = sig + amp_hw*shift_reg_out
 
     if sim_hw_delay:
         sigout = sigdelay(sigout, int(round(8*(4+5)/awg_sample_incr)))
@@ -1,6 +1,9 @@
 import types
 import logging
 import time
+import threading
+import queue
+import sqlite3
 import numpy as np
 from collections.abc import Iterable
 import operator
@@ -15,6 +18,7 @@ from pycqed.utilities.general import (
     get_git_revision_hash,
 )
 from pycqed.utilities.get_default_datadir import get_default_datadir
+from pycqed.utilities import measurement_catalog
 from pycqed.utilities.general import get_module_name
 
 # Used for auto qcodes parameter wrapping
@@ -128,6 +132,9 @@ class MeasurementControl(Instrument):
         self.add_parameter(
             "plotting_max_pts",
             label="Maximum number of live plotting points",
+            docstring="Maximum number of points plotted per trace in the main "
+            "plotmon. Longer traces are decimated, keeping the minimum and "
+            "maximum of every segment of the trace.",
             parameter_class=ManualParameter,
             vals=vals.Ints(1),
             initial_value=4000,
@@ -176,6 +183,105 @@ class MeasurementControl(Instrument):
             initial_value=False,
         )
 
+        self.add_parameter(
+            "cfg_buffered_datawriting",
+            vals=vals.Bool(),
+            docstring="When True the experimental data (including the running "
+            "soft averages) is kept in memory and written to the datafile in "
+            "batches, see `cfg_flush_interval` and `cfg_flush_nr_rows`. "
+            "The data in the datafile is identical to the unbuffered mode.",
+            parameter_class=ManualParameter,
+            initial_value=False,
+        )
+        self.add_parameter(
+            "cfg_flush_interval",
+            unit="s",
+            vals=vals.Numbers(min_value=0),
+            docstring="Maximum time between writing buffered data to the "
+            "datafile. This determines how much data can be lost on a crash "
+            "when `cfg_buffered_datawriting` is enabled.",
+            parameter_class=ManualParameter,
+            initial_value=10,
+        )
+        self.add_parameter(
+            "cfg_flush_nr_rows",
+            vals=vals.Ints(1),
+            docstring="Maximum number of modified datapoints (rows) that are "
+            "held in memory before writing to the datafile when "
+            "`cfg_buffered_datawriting` is enabled.",
+            parameter_class=ManualParameter,
+            initial_value=1000,
+        )
+        self.add_parameter(
+            "cfg_pipelined_hard_sweeps",
+            vals=vals.Bool(),
+            docstring="When True the next chunk of a hard sweep is acquired "
+            "in a worker thread while the previous chunk is being stored and "
+            "plotted, see `cfg_pipeline_depth`. The stored data (including "
+            "soft averages) is identical to the sequential mode.",
+            parameter_class=ManualParameter,
+            initial_value=False,
+        )
+        self.add_parameter(
+            "cfg_pipeline_depth",
+            vals=vals.Ints(1),
+            docstring="Maximum number of acquired chunks that wait to be "
+            "stored when `cfg_pipelined_hard_sweeps` is enabled.",
+            parameter_class=ManualParameter,
+            initial_value=2,
+        )
+
+        self.add_parameter(
+            "cfg_background_snapshot_saving",
+            vals=vals.Bool(),
+            docstring="When True the instrument snapshot is taken at the "
+            "start of the measurement and written to the datafile in a "
+            "background thread while the measurement is running. The "
+            "datafile is always complete when `run` returns.",
+            parameter_class=ManualParameter,
+            initial_value=True,
+        )
+        self.add_parameter(
+            "cfg_save_legacy_instrument_settings",
+            vals=vals.Bool(),
+            docstring="When True the parameter values are also saved in the "
+            "deprecated \"Instrument settings\" group of the datafile, in "
+            "addition to the \"Snapshot\" group.",
+            parameter_class=ManualParameter,
+            initial_value=True,
+        )
+
+        self.add_parameter(
+            "cfg_snapshot_deduplication",
+            vals=vals.Bool(),
+            docstring="When True only the instruments whose snapshot changed "
+            "with respect to the last full snapshot are written to the "
+            "\"Snapshot\" group of the datafile, together with a reference "
+            "to the datafile containing the full snapshot. "
+            "Use `hdf5_data.read_snapshot` to read the full snapshot.",
+            parameter_class=ManualParameter,
+            initial_value=False,
+        )
+        self.add_parameter(
+            "cfg_full_snapshot_interval",
+            vals=vals.Ints(1),
+            docstring="Maximum number of deduplicated snapshots written "
+            "before writing a full snapshot when "
+            "`cfg_snapshot_deduplication` is enabled.",
+            parameter_class=ManualParameter,
+            initial_value=100,
+        )
+
+        self.add_parameter(
+            "cfg_data_compression",
+            vals=vals.Enum(None, "lzf", "gzip"),
+            docstring="Compression filter used for the experimental data in "
+            "the datafile. \"lzf\" is fast and is recommended for large "
+            "datasets, None disables compression.",
+            parameter_class=ManualParameter,
+            initial_value=None,
+        )
+
         self.add_parameter(
             "instrument_monitor",
             parameter_class=ManualParameter,
@@ -208,6 +314,9 @@ class MeasurementControl(Instrument):
         self.Learner_Minimizer_detected = False
         self.CMA_detected = False
 
+        # Keeps track of the last full snapshot for snapshot deduplication
+        self._snapshot_store = h5d.SnapshotStore()
+
     ##############################################
     # Functions used to control the measurements #
     ##############################################
@@ -251,6 +360,9 @@ class MeasurementControl(Instrument):
         """
         # Setting to zero at the start of every run, used in soft avg
         self.soft_iteration = 0
+        # The dataset of a previous run must not be finalized if this run
+        # fails before its dataset is created
+        self.dset = None
 
         if mode != "adaptive":
             # Certain adaptive visualization features leave undesired effects
@@ -266,6 +378,8 @@ class MeasurementControl(Instrument):
 
         # used for determining data writing indices and soft averages
         self.total_nr_acquired_values = 0
+        # time spent in the stages of a pipelined hard sweep
+        self.hard_sweep_timings = {}
 
         # needs to be defined here because of the with statement below
         return_dict = {}
@@ -278,8 +392,12 @@ class MeasurementControl(Instrument):
 
                 check_keyboard_interrupt()
                 self.get_measurement_begintime()
+                self.add_to_measurement_catalog()
                 if not disable_snapshot_metadata:
-                    self.save_instrument_settings(self.data_object)
+                    self.save_instrument_settings(
+                        self.data_object,
+                        background=self.cfg_background_snapshot_saving(),
+                    )
                 self.create_experimentaldata_dataset()
 
                 self.plotting_bins = None
@@ -306,11 +424,24 @@ class MeasurementControl(Instrument):
                     raise ValueError('Mode "{}" not recognized.'.format(self.mode))
             except KeyboardFinish as e:
                 print(e)
-            result = self.dset[()]
+            finally:
+                # Data held in memory is also written if the measurement
+                # is interrupted by an exception.
+                try:
+                    self.finalize_experimentaldata_dataset()
+                finally:
+                    # The datafile is complete before MC.run returns
+                    self.wait_for_instrument_settings()
+            # The data of streaming detectors is not read back into memory,
+            # it is only available in the datafile.
+            if getattr(self.detector_function, "streaming", False):
+                result = None
+            else:
+                result = self.dset[()]
             self.get_measurement_endtime()
             self.save_MC_metadata(self.data_object)  # timing labels etc
 
-            return_dict = self.create_experiment_result_dict()
+            return_dict = self.create_experiment_result_dict(result)
 
         self.finish(result)
         return return_dict
@@ -334,24 +465,14 @@ class MeasurementControl(Instrument):
             self.get_measurement_preparetime()
             sweep_points = self.get_sweep_points()
 
-            while self.get_percdone() < 100:
-                start_idx = self.get_datawriting_start_idx()
-                if len(self.sweep_functions) == 1:
-                    self.sweep_functions[0].set_parameter(sweep_points[start_idx])
-                    self.detector_function.prepare(
-                        sweep_points=self.get_sweep_points().astype(np.float64)
-                    )
-                    self.measure_hard()
-                else:  # If mode is 2D
-                    for i, sweep_function in enumerate(self.sweep_functions):
-                        swf_sweep_points = sweep_points[:, i]
-                        val = swf_sweep_points[start_idx]
-                        sweep_function.set_parameter(val)
-                    self.detector_function.prepare(
-                        sweep_points=sweep_points[
-                            start_idx : start_idx + self.xlen, 0
-                        ].astype(np.float64)
-                    )
+            if self.cfg_pipelined_hard_sweeps() and not getattr(
+                self.detector_function, "streaming", False
+            ):
+                self.measure_hard_pipelined()
+            else:
+                while self.get_percdone() < 100:
+                    start_idx = self.get_datawriting_start_idx()
+                    self.prepare_hard_chunk(start_idx, sweep_points)
                     self.measure_hard()
         else:
             raise Exception(
@@ -595,8 +716,117 @@ class MeasurementControl(Instrument):
         self.update_plotmon_adaptive(force_update=True)
         return
 
-    def measure_hard(self):
-        new_data = np.array(self.detector_function.get_values()).astype(np.float64).T
+    def prepare_hard_chunk(self, start_idx, sweep_points):
+        """
+        Sets the sweep points and prepares the detector for the chunk of a
+        hard sweep starting at datapoint start_idx.
+        """
+        if len(self.sweep_functions) == 1:
+            self.sweep_functions[0].set_parameter(sweep_points[start_idx])
+            self.detector_function.prepare(
+                sweep_points=self.get_sweep_points().astype(np.float64)
+            )
+        else:  # If mode is 2D
+            for i, sweep_function in enumerate(self.sweep_functions):
+                swf_sweep_points = sweep_points[:, i]
+                val = swf_sweep_points[start_idx]
+                sweep_function.set_parameter(val)
+            self.detector_function.prepare(
+                sweep_points=sweep_points[
+                    start_idx : start_idx + self.xlen, 0
+                ].astype(np.float64)
+            )
+
+    def measure_hard_pipelined(self):
+        """
+        Measures a hard sweep, acquiring the next chunk of data while the
+        previous chunk is being stored and plotted.
+
+        The chunks are acquired (setting the sweep points, preparing the
+        detector and getting the values) in a worker thread and stored in
+        order by `measure_hard`, such that soft averaging is identical to
+        the sequential mode. At most `cfg_pipeline_depth` acquired chunks
+        wait to be stored. The time spent in the different stages is
+        stored in self.hard_sweep_timings and saved in the MC metadata.
+        """
+        sweep_points = self.get_sweep_points()
+        nr_sweep_points = np.shape(sweep_points)[0]
+        nr_values = nr_sweep_points * self.soft_avg()
+        chunks = queue.Queue(maxsize=self.cfg_pipeline_depth())
+        stop = threading.Event()
+
+        def put(item):
+            # waits for space in the queue unless the measurement stopped
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def acquire():
+            nr_acquired = self.total_nr_acquired_values
+            try:
+                while nr_acquired < nr_values and not stop.is_set():
+                    t0 = time.time()
+                    self.prepare_hard_chunk(nr_acquired % nr_sweep_points, sweep_points)
+                    t1 = time.time()
+                    new_data = self.get_hard_values()
+                    self.add_hard_sweep_timing("prepare", t1 - t0)
+                    self.add_hard_sweep_timing("acquisition", time.time() - t1)
+                    nr_acquired += self.get_nr_new_values(new_data)
+                    if not put(new_data):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(None)
+
+        worker = threading.Thread(
+            target=acquire, name="{}_acquisition".format(self.name), daemon=True
+        )
+        worker.start()
+        try:
+            while True:
+                t0 = time.time()
+                new_data = chunks.get()
+                self.add_hard_sweep_timing("waiting", time.time() - t0)
+                if new_data is None:
+                    break
+                if isinstance(new_data, Exception):
+                    raise new_data
+                t0 = time.time()
+                self.measure_hard(new_data=new_data)
+                self.add_hard_sweep_timing("storing", time.time() - t0)
+        finally:
+            stop.set()
+            worker.join()
+
+    def add_hard_sweep_timing(self, stage: str, duration: float):
+        timing = self.hard_sweep_timings.setdefault(
+            stage, {"total": 0.0, "count": 0, "max": 0.0}
+        )
+        timing["total"] += duration
+        timing["count"] += 1
+        timing["max"] = max(timing["max"], duration)
+
+    def get_hard_values(self):
+        """
+        Returns the values of the hard detector as a float array with
+        the datapoints along the first axis.
+        """
+        return np.array(self.detector_function.get_values()).astype(np.float64).T
+
+    def measure_hard(self, new_data=None):
+        """
+        Stores a chunk of data of a hard detector, new_data is acquired
+        from the detector if not specified.
+        """
+        if getattr(self.detector_function, "streaming", False):
+            return self.measure_hard_streaming()
+        if new_data is None:
+            new_data = self.get_hard_values()
         ###########################
         # Shape determining block #
         ###########################
@@ -649,6 +879,7 @@ class MeasurementControl(Instrument):
                 # There are some cases where the sweep points are not
                 # specified that you don't want to crash (e.g. on -off seq)
                 pass
+        self.flush_data_buffer()
 
         check_keyboard_interrupt()
         self.update_instrument_monitor()
@@ -659,6 +890,52 @@ class MeasurementControl(Instrument):
         self.print_progress(stop_idx)
         return new_data
 
+    def measure_hard_streaming(self):
+        """
+        Measures a hard sweep using a detector that yields its data in
+        chunks through `get_values_chunks`.
+
+        Every chunk is written to the dataset as it arrives. The chunks are
+        not soft averaged, which avoids reading back the stored data and
+        keeps the memory used independent of the number of datapoints.
+        """
+        if self.soft_avg() != 1:
+            raise ValueError(
+                "Soft averaging is not supported for streaming detectors "
+                "(soft_avg is {}).".format(self.soft_avg())
+            )
+        nr_sweep_cols = len(self.sweep_functions)
+        sweep_points = self.get_sweep_points()
+        stop_idx = None
+        for chunk in self.detector_function.get_values_chunks():
+            new_data = np.atleast_2d(np.array(chunk, dtype=np.float64)).T
+            start_idx, stop_idx = self.get_datawriting_indices_update_ctr(new_data)
+            if stop_idx > self.dset.shape[0]:
+                self.dset.resize((stop_idx, self.dset.shape[1]))
+            self.dset[start_idx:stop_idx, nr_sweep_cols:] = new_data
+            try:
+                if nr_sweep_cols == 1:
+                    self.dset[start_idx:stop_idx, 0] = sweep_points[
+                        start_idx:stop_idx
+                    ].astype(np.float64)
+                else:
+                    self.dset[start_idx:stop_idx, 0:nr_sweep_cols] = sweep_points[
+                        start_idx:stop_idx
+                    ].astype(np.float64)
+            except Exception:
+                # There are some cases where the sweep points are not
+                # specified that you don't want to crash (e.g. on -off seq)
+                pass
+            self.flush_data_buffer()
+
+            check_keyboard_interrupt()
+            self.update_instrument_monitor()
+            self.update_plotmon()
+            self.print_progress(stop_idx)
+        if self.mode == "2D":
+            self.update_plotmon_2D_hard()
+        self.iteration += 1
+
     def measurement_function(self, x):
         """
         Core measurement function used for soft sweeps
@@ -724,6 +1001,7 @@ class MeasurementControl(Instrument):
         )
 
         self.dset[start_idx:stop_idx, :] = new_vals.astype(np.float64)
+        self.flush_data_buffer()
         # update plotmon
         check_keyboard_interrupt()
         self.update_instrument_monitor()
@@ -917,6 +1195,17 @@ class MeasurementControl(Instrument):
     def initialize_plot_monitor(self):
         if self.main_QtPlot.traces != []:
             self.main_QtPlot.clear()
+        # The buffer holds all plotted datapoints in memory, the data of
+        # streaming detectors is not plotted to keep the memory bounded.
+        if getattr(self.detector_function, "streaming", False):
+            self._plotmon_buffer = None
+        else:
+            self._plotmon_buffer = mch.PlotmonBuffer(
+                nr_cols=len(self.sweep_function_names)
+                + len(self.detector_function.value_names),
+                max_pts=self.plotting_max_pts(),
+            )
+        self._plotmon_dirty_rows = None
         self.curves = []
         self.curves_mv_thresh = []
         xlabels = self.sweep_par_names
@@ -984,12 +1273,41 @@ class MeasurementControl(Instrument):
                 j += 1
             self.main_QtPlot.win.nextRow()
 
+    def _mark_plotmon_rows(self, start_idx, stop_idx):
+        """
+        Registers rows of the dataset that are (re)written and have to be
+        copied to the plotmon buffer on the next plotmon update.
+        """
+        dirty_rows = getattr(self, "_plotmon_dirty_rows", None)
+        if dirty_rows is not None:
+            start_idx = min(start_idx, dirty_rows[0])
+            stop_idx = max(stop_idx, dirty_rows[1])
+        self._plotmon_dirty_rows = (start_idx, stop_idx)
+
+    def _update_plotmon_buffer(self):
+        """
+        Copies the rows of the dataset written since the last update to the
+        plotmon buffer. Returns False if there was no new data.
+        """
+        if self._plotmon_dirty_rows is None or self._plotmon_buffer is None:
+            return False
+        start_idx, stop_idx = self._plotmon_dirty_rows
+        self._plotmon_dirty_rows = None
+        stop_idx = min(stop_idx, self.dset.shape[0])
+        self._plotmon_buffer.update(start_idx, self.dset[start_idx:stop_idx, :])
+        return True
+
     def update_plotmon(self, force_update=False):
-        # Note: plotting_max_pts takes precendence over force update
-        if self.live_plot_enabled() and (
-            self.dset.shape[0] < self.plotting_max_pts()
-            or (self.plotting_bins is not None)
-        ):
+        """
+        Updates the main plotmon.
+
+        Only the rows of the dataset written since the last update are read,
+        the plotted data is kept in self._plotmon_buffer. Traces longer than
+        plotting_max_pts are decimated. The data of streaming detectors is
+        not plotted.
+        """
+        if (self.live_plot_enabled()
+                and getattr(self, "_plotmon_buffer", None) is not None):
             i = 0
             try:
                 time_since_last_mon_update = time.time() - self._mon_upd_time
@@ -1002,17 +1320,21 @@ class MeasurementControl(Instrument):
                     time_since_last_mon_update > self.plotting_interval()
                     or force_update
                 ):
+                    if not self._update_plotmon_buffer() and not force_update:
+                        return
 
                     nr_sweep_funcs = len(self.sweep_function_names)
                     for y_ind in range(len(self.detector_function.value_names)):
                         for x_ind in range(nr_sweep_funcs):
-                            x = self.dset[:, x_ind]
-                            y = self.dset[:, nr_sweep_funcs + y_ind]
+                            x, y = self._plotmon_buffer.get_trace(
+                                x_ind, nr_sweep_funcs + y_ind)
 
                             # used to average e.g., single shot measuremnts
                             # can be specified in MC.run(exp_metadata['bins'])
                             if self.plotting_bins is not None:
                                 x = self.plotting_bins
+                                y = self._plotmon_buffer.column(
+                                    nr_sweep_funcs + y_ind)
                                 if len(y) % len(x) != 0:
                                     # nan's are appended if shapes do not match
                                     missing_vals = missing_vals = int(
@@ -1862,15 +2184,21 @@ class MeasurementControl(Instrument):
 
     def create_experimentaldata_dataset(self):
         data_group = self.data_object.create_group("Experimental Data")
-        self.dset = data_group.create_dataset(
+        nr_cols = len(self.sweep_functions) + len(self.detector_function.value_names)
+        nr_pts, nr_inner_pts = self.get_sweep_lengths()
+        # The full dataset is allocated in the file when the number of
+        # points is known, the rows in use are tracked by the
+        # PreallocatedDataset and the file is trimmed when the measurement
+        # ends.
+        h5_dset = data_group.create_dataset(
             "Data",
-            (0, len(self.sweep_functions) + len(self.detector_function.value_names)),
-            maxshape=(
-                None,
-                len(self.sweep_functions) + len(self.detector_function.value_names),
-            ),
+            (nr_pts or 0, nr_cols),
+            maxshape=(None, nr_cols),
+            chunks=self.get_data_chunk_shape(nr_cols, nr_pts, nr_inner_pts),
+            compression=self.cfg_data_compression(),
             dtype="float64",
         )
+        self.dset = h5d.PreallocatedDataset(h5_dset)
         self.get_column_names()
         self.dset.attrs["column_names"] = h5d.encode_to_utf8(self.column_names)
         # Added to tell analysis how to extract the data
@@ -1889,7 +2217,95 @@ class MeasurementControl(Instrument):
             self.detector_function.value_units
         )
 
-    def create_experiment_result_dict(self):
+        # The buffer holds all datapoints in memory, streaming detectors
+        # write to the datafile directly to keep the memory bounded
+        if self.cfg_buffered_datawriting() and not getattr(
+            self.detector_function, "streaming", False
+        ):
+            self.dset = h5d.BufferedDataset(
+                self.dset,
+                nr_rows_hint=nr_pts,
+                flush_interval=self.cfg_flush_interval(),
+                flush_nr_rows=self.cfg_flush_nr_rows(),
+            )
+
+    def get_sweep_lengths(self):
+        """
+        Returns the expected number of datapoints of the measurement and the
+        number of points in the inner sweep dimension. Returns (None, None)
+        if this cannot be determined before the measurement starts
+        (e.g., for adaptive measurements).
+        """
+        if self.mode == "adaptive":
+            return None, None
+        try:
+            sweep_points = self.get_sweep_points()
+            nr_pts = len(sweep_points)
+            nr_inner_pts = nr_pts
+            if self.mode == "2D":
+                nr_outer_pts = len(self.sweep_points_2D)
+                if np.size(sweep_points[0]) == 1:
+                    # sweep points are tiled in measure_2D
+                    nr_pts *= nr_outer_pts
+                else:
+                    nr_inner_pts = nr_pts // nr_outer_pts
+        except Exception:
+            # Some sweep functions only determine the sweep points in the
+            # prepare
+            return None, None
+        if nr_pts == 0:
+            return None, None
+        return nr_pts, max(nr_inner_pts, 1)
+
+    @staticmethod
+    def get_data_chunk_shape(nr_cols: int, nr_pts: int = None,
+                             nr_inner_pts: int = None):
+        """
+        Returns the chunk shape for the experimental data dataset.
+
+        Chunks contain a whole number of inner sweeps when these are
+        smaller than the target chunk size of 256 kB. If the number of
+        points is not known the chunk shape is determined by h5py.
+        """
+        if nr_pts is None:
+            return True
+        target_nr_rows = max(1, 2 ** 18 // (8 * nr_cols))
+        if nr_inner_pts >= target_nr_rows:
+            nr_rows = target_nr_rows
+        else:
+            nr_rows = nr_inner_pts * (target_nr_rows // nr_inner_pts)
+        return (min(nr_rows, nr_pts), nr_cols)
+
+    def flush_data_buffer(self, force: bool = False):
+        """
+        Writes the data held in memory to the datafile when
+        `cfg_buffered_datawriting` is enabled.
+
+        Args:
+            force (bool):
+                if False, the data is only written if the flush interval
+                or the maximum number of buffered rows is exceeded.
+        """
+        dset = getattr(self, "dset", None)
+        if isinstance(dset, h5d.BufferedDataset):
+            if force:
+                dset.flush()
+            else:
+                dset.flush_if_due()
+
+    def finalize_experimentaldata_dataset(self):
+        """
+        Writes all data held in memory and resizes the dataset in the
+        datafile to the number of acquired points.
+        """
+        self.flush_data_buffer(force=True)
+        dset = getattr(self, "dset", None)
+        if isinstance(dset, h5d.BufferedDataset):
+            dset = dset.dset
+        if isinstance(dset, h5d.PreallocatedDataset):
+            dset.trim()
+
+    def create_experiment_result_dict(self, dset):
         try:
             # only exists as an open dataset when running an
             # optimization
@@ -1901,7 +2317,7 @@ class MeasurementControl(Instrument):
         opt_res = getattr(self, "opt_res", None)
 
         result_dict = {
-            "dset": self.dset[()],
+            "dset": dset,
             "opt_res_dset": opt_res_dset,
             "sweep_parameter_names": self.sweep_par_names,
             "sweep_parameter_units": self.sweep_par_units,
@@ -2026,11 +2442,22 @@ class MeasurementControl(Instrument):
         self.opt_res = res_dict
         h5d.write_dict_to_hdf5(res_dict, entry_point=opt_res_grp)
 
-    def save_instrument_settings(self, data_object=None, *args):
+    def save_instrument_settings(
+        self, data_object=None, *args, background: bool = False
+    ):
         """
         Store the last known value of all parameters in the datafile.
 
         Datasaving is based on the snapshot of the QCoDeS station object.
+
+        Args:
+            data_object (h5py.File):
+                datafile to write to, defaults to the current datafile.
+            background (bool):
+                if True, the snapshot is taken immediately but written to
+                the datafile in a background thread. Use
+                "wait_for_instrument_settings" to ensure writing has finished
+                before closing the datafile.
         """
         if data_object is None:
             data_object = self.data_object
@@ -2040,31 +2467,67 @@ class MeasurementControl(Instrument):
             )
         else:
             # This saves the snapshot of the entire setup
-            snap_grp = data_object.create_group("Snapshot")
             snap = self.station.snapshot()
-            exclude_keys = {
-                "inter_delay",
-                "post_delay",
-                "vals",
-                "instrument",
-                "functions",
-                "__class__",
-                "raw_value",
-                "instrument_name",
-                "full_name",
-                "val_mapping",
-            }
-            cleaned_snapshot = delete_keys_from_dict(snap, exclude_keys)
 
+            par_snaps = None
+            if self.cfg_save_legacy_instrument_settings():
+                # The parameter snapshots of the instruments are contained
+                # in the station snapshot, they are only taken again for
+                # components that are not instruments.
+                ins_snaps = snap.get("instruments", {})
+                par_snaps = []
+                inslist = dict_to_ordered_tuples(self.station.components)
+                for (iname, ins) in inslist:
+                    if iname in ins_snaps:
+                        par_snaps.append((iname, ins_snaps[iname]["parameters"]))
+                    else:
+                        par_snaps.append((iname, ins.snapshot()["parameters"]))
+
+            if background:
+                self.wait_for_instrument_settings()
+                self._instrument_settings_exception = None
+                self._instrument_settings_thread = threading.Thread(
+                    target=self._write_instrument_settings_in_background,
+                    args=(data_object, snap, par_snaps),
+                    name="MC_save_instrument_settings",
+                    daemon=True,
+                )
+                self._instrument_settings_thread.start()
+            else:
+                self._write_instrument_settings(data_object, snap, par_snaps)
+
+    def _write_instrument_settings(self, data_object, snap, par_snaps=None):
+        snap_grp = data_object.create_group("Snapshot")
+        exclude_keys = {
+            "inter_delay",
+            "post_delay",
+            "vals",
+            "instrument",
+            "functions",
+            "__class__",
+            "raw_value",
+            "instrument_name",
+            "full_name",
+            "val_mapping",
+        }
+        cleaned_snapshot = delete_keys_from_dict(snap, exclude_keys)
+
+        if self.cfg_snapshot_deduplication():
+            self._snapshot_store.full_snapshot_interval = (
+                self.cfg_full_snapshot_interval()
+            )
+            self._snapshot_store.write(
+                cleaned_snapshot, snap_grp, filepath=data_object.filename
+            )
+        else:
             h5d.write_dict_to_hdf5(cleaned_snapshot, entry_point=snap_grp)
 
+        if par_snaps is not None:
             # Below is old style saving of snapshot, exists for the sake of
             # preserving deprecated functionality
             set_grp = data_object.create_group("Instrument settings")
-            inslist = dict_to_ordered_tuples(self.station.components)
-            for (iname, ins) in inslist:
+            for (iname, par_snap) in par_snaps:
                 instrument_grp = set_grp.create_group(iname)
-                par_snap = ins.snapshot()["parameters"]
                 parameter_list = dict_to_ordered_tuples(par_snap)
                 for (p_name, p) in parameter_list:
                     try:
@@ -2073,6 +2536,41 @@ class MeasurementControl(Instrument):
                         val = ""
                     instrument_grp.attrs[p_name] = str(val)
 
+    def _write_instrument_settings_in_background(self, *args):
+        try:
+            self._write_instrument_settings(*args)
+        except Exception as e:
+            # re-raised in the main thread by wait_for_instrument_settings
+            self._instrument_settings_exception = e
+
+    def wait_for_instrument_settings(self):
+        """
+        Blocks until the instrument settings that are being written in the
+        background are written to the datafile.
+        Raises the exception that occurred while writing, if any.
+        """
+        thread = getattr(self, "_instrument_settings_thread", None)
+        if thread is None:
+            return
+        thread.join()
+        self._instrument_settings_thread = None
+        exception = self._instrument_settings_exception
+        self._instrument_settings_exception = None
+        if exception is not None:
+            raise exception
+
+    def add_to_measurement_catalog(self):
+        """
+        Adds the folder of the current datafile to the measurement catalog
+        of the datadir, used by the analysis_toolbox to find measurements.
+        """
+        catalog = measurement_catalog.get_catalog(self.datadir())
+        if catalog is not None:
+            try:
+                catalog.add_measurement(self.data_object.folder)
+            except (sqlite3.Error, OSError) as e:
+                log.warning("Could not update measurement catalog: {}".format(e))
+
     def save_MC_metadata(self, data_object=None, *args):
         """
         Save metadata on the MC (such as timings)
@@ -2089,6 +2587,11 @@ class MeasurementControl(Instrument):
         set_grp.attrs["mode"] = self.mode
         set_grp.attrs["measurement_name"] = self.measurement_name
         set_grp.attrs["live_plot_enabled"] = self.live_plot_enabled()
+        if self.hard_sweep_timings:
+            h5d.write_dict_to_hdf5(
+                self.hard_sweep_timings,
+                entry_point=set_grp.create_group("hard sweep timings"),
+            )
 
     @classmethod
     def save_exp_metadata(self, metadata: dict, data_object):
@@ -2207,7 +2710,21 @@ class MeasurementControl(Instrument):
 
         N.B. this also updates the "total_nr_acquired_values" counter.
         """
+        xlen = self.get_nr_new_values(new_data)
+        start_idx = self.get_datawriting_start_idx()
+        stop_idx = start_idx + xlen
 
+        if update:
+            # Sometimes one wants to know the start/stop idx without
+            self.total_nr_acquired_values += xlen
+            self._mark_plotmon_rows(start_idx, stop_idx)
+
+        return start_idx, stop_idx
+
+    def get_nr_new_values(self, new_data):
+        """
+        Returns the number of datapoints in data returned by the detector.
+        """
         # This is the case if the detector returns a simple float or int
         if len(np.shape(new_data)) == 0:
             xlen = 1
@@ -2225,15 +2742,7 @@ class MeasurementControl(Instrument):
             else:
                 # in case of an N-D Hard detector dataset
                 xlen = np.shape(new_data)[0]
-
-        start_idx = self.get_datawriting_start_idx()
-        stop_idx = start_idx + xlen
-
-        if update:
-            # Sometimes one wants to know the start/stop idx without
-            self.total_nr_acquired_values += xlen
-
-        return start_idx, stop_idx
+        return xlen
 
     ####################################
     # Non-parameter get/set functions  #
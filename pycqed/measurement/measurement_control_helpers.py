@@ -35,3 +35,105 @@ def scale_bounds(af_pars, x_scale=None):
                     af_pars[b_name] = scaled_bounds
 
     return True
+
+
+class PlotmonBuffer:
+    """
+    In-memory copy of the data shown in the plotmon.
+
+    Rows are added as they are written to the dataset such that updating
+    the plotmon does not require reading back the whole dataset.
+    Traces longer than max_pts are reduced using min/max decimation: the
+    trace is split into segments of equal length of which only the points
+    with the minimum and maximum value are plotted. Unlike plain
+    subsampling this preserves the envelope (e.g., narrow peaks) of the
+    trace. The extrema of the segments are cached, such that the cost of an
+    update only depends on the number of new points.
+
+    Args:
+        nr_cols (int): number of columns of the dataset.
+        max_pts (int): maximum number of points returned per trace.
+    """
+
+    def __init__(self, nr_cols: int, max_pts: int):
+        self.nr_cols = nr_cols
+        self.max_pts = max(max_pts, 2)
+        self.nr_rows = 0
+        self._data = np.full((0, nr_cols), np.nan)
+        self._segment_len = 1
+        # indices of the minima and maxima of the complete segments,
+        # shape (nr_segments, 2, nr_cols)
+        self._extrema = np.zeros((0, 2, nr_cols), dtype=int)
+
+    def update(self, start_idx: int, rows):
+        """
+        Writes rows (shape (n, nr_cols)) starting at row start_idx.
+        Rows can be written more than once, e.g., when soft averaging.
+        """
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, self.nr_cols)
+        stop_idx = start_idx + len(rows)
+        if stop_idx > len(self._data):
+            data = np.full(
+                (max(stop_idx, 2 * len(self._data)), self.nr_cols), np.nan)
+            data[: self.nr_rows] = self._data[: self.nr_rows]
+            self._data = data
+        self._data[start_idx:stop_idx] = rows
+        self.nr_rows = max(self.nr_rows, stop_idx)
+        # invalidate the extrema of the segments that were modified
+        nr_valid_segments = start_idx // self._segment_len
+        self._extrema = self._extrema[:nr_valid_segments]
+
+    def column(self, col_idx: int):
+        """
+        Returns all values in a column.
+        """
+        return self._data[: self.nr_rows, col_idx].copy()
+
+    def get_trace(self, x_col: int, y_col: int):
+        """
+        Returns the x and y values of a trace, containing at most max_pts
+        points.
+        """
+        if self.nr_rows <= self.max_pts:
+            return self.column(x_col), self.column(y_col)
+
+        self._update_extrema()
+        seg_len = self._segment_len
+        nr_segments = len(self._extrema)
+        tail = self._data[nr_segments * seg_len : self.nr_rows, y_col]
+        idxs = [self._extrema[:, 0, y_col], self._extrema[:, 1, y_col]]
+        if len(tail):
+            tail_min, tail_max = _segment_extrema(tail.reshape(1, -1, 1))
+            idxs += [tail_min[0] + nr_segments * seg_len,
+                     tail_max[0] + nr_segments * seg_len]
+        idx = np.unique(np.concatenate(idxs))
+        return self._data[idx, x_col], self._data[idx, y_col]
+
+    def _update_extrema(self):
+        max_segments = self.max_pts // 2
+        if -(-self.nr_rows // self._segment_len) > max_segments:
+            while -(-self.nr_rows // self._segment_len) > max_segments:
+                self._segment_len *= 2
+            self._extrema = self._extrema[:0]
+
+        seg_len = self._segment_len
+        start_seg = len(self._extrema)
+        stop_seg = self.nr_rows // seg_len
+        if stop_seg > start_seg:
+            block = self._data[start_seg * seg_len : stop_seg * seg_len]
+            block = block.reshape(stop_seg - start_seg, seg_len, self.nr_cols)
+            mins, maxs = _segment_extrema(block)
+            offsets = (np.arange(start_seg, stop_seg) * seg_len)[:, None]
+            new_extrema = np.stack([mins + offsets, maxs + offsets], axis=1)
+            self._extrema = np.concatenate([self._extrema, new_extrema])
+
+
+def _segment_extrema(block):
+    """
+    Returns the indices of the minimum and maximum along axis 1 of block,
+    ignoring NaN values.
+    """
+    nans = np.isnan(block)
+    mins = np.where(nans, np.inf, block).argmin(axis=1)
+    maxs = np.where(nans, -np.inf, block).argmax(axis=1)
+    return mins, maxs
@@ -191,3 +191,143 @@ def randomized_benchmarking_sequence(
         rb_clifford_indices = np.append(rb_clifford_indices,
                                         recovery_clifford.idx)
     return rb_clifford_indices
+
+
+def randomized_benchmarking_sequences(
+        nr_cliffords,
+        nr_seeds: int = None,
+        desired_net_cl: int = 0,
+        number_of_qubits: int = 1,
+        max_clifford_idx: int = 11520,
+        interleaving_cl: int = None,
+        seeds: list = None):
+    """
+    Generates randomized benchmarking sequences for the one or two qubit
+    clifford group for several numbers of Cliffords and seeds at once.
+
+    For every seed a single random sequence is drawn for the largest number
+    of Cliffords, the sequences for smaller numbers of Cliffords are its
+    prefixes. This allows calculating the net cliffords of all sequences
+    of a seed in a single pass. For a seed in seeds, the sequences are
+    identical to those of "randomized_benchmarking_sequence" with that seed.
+
+    Args:
+        nr_cliffords (list) : numbers of Cliffords
+        nr_seeds       (int) : number of random sequences for every number
+            of Cliffords, drawn using np.random. Ignored if seeds is
+            specified, either nr_seeds or seeds is required.
+        desired_net_cl (int) : idx of the desired net clifford, if None is
+            specified no recovery Clifford is calculated
+        number_of_qubits(int): used to determine if Cliffords are drawn
+            from the single qubit or two qubit clifford group.
+        max_clifford_idx (int): used to set the index of the highest random
+            clifford generated.
+        interleaving_cl (int): interleaves the sequences with a specific
+            clifford if desired
+        seeds (list) : seeds used to initialize the random number generator,
+            one for every random sequence.
+    Returns:
+        sequences (list): sequences[i][j] is the array of clifford indices
+            (including the recovery Clifford) for seed i and
+            nr_cliffords[j].
+        recovery_cliffords (array): integer array of shape
+            (nr of seeds, len(nr_cliffords)) containing the recovery
+            Cliffords, None if desired_net_cl is None.
+    """
+    if seeds is None and nr_seeds is None:
+        raise ValueError('Either seeds or nr_seeds must be specified.')
+    if number_of_qubits == 1:
+        Cl = tqc.SingleQubitClifford
+        group_size = np.min([24, max_clifford_idx])
+    elif number_of_qubits == 2:
+        Cl = tqc.TwoQubitClifford
+        group_size = np.min([11520, max_clifford_idx])
+    else:
+        raise NotImplementedError()
+
+    if seeds is None:
+        seeds = [None]*nr_seeds
+    nr_cliffords = [int(n_cl) for n_cl in nr_cliffords]
+    max_n_cl = max(nr_cliffords)
+    # the net cliffords are calculated for increasing prefix lengths
+    prefix_lengths = sorted(set(nr_cliffords))
+    if interleaving_cl is not None:
+        prefix_lengths = [2*n_cl for n_cl in prefix_lengths]
+
+    sequences = []
+    recovery_cliffords = np.zeros((len(seeds), len(nr_cliffords)), dtype=int)
+    for i, seed in enumerate(seeds):
+        if seed is None:
+            rb_clifford_indices = np.random.randint(0, group_size, max_n_cl)
+        else:
+            rng_seed = np.random.RandomState(seed)
+            rb_clifford_indices = rng_seed.randint(0, group_size, max_n_cl)
+
+        if interleaving_cl is not None:
+            rb_clif_ind_intl = np.empty(rb_clifford_indices.size*2, dtype=int)
+            rb_clif_ind_intl[0::2] = rb_clifford_indices
+            rb_clif_ind_intl[1::2] = interleaving_cl
+            rb_clifford_indices = rb_clif_ind_intl
+
+        if desired_net_cl is not None:
+            net_cliffords = dict(zip(prefix_lengths, calculate_net_cliffords(
+                rb_clifford_indices, prefix_lengths, Cl)))
+
+        seed_sequences = []
+        for j, n_cl in enumerate(nr_cliffords):
+            length = 2*n_cl if interleaving_cl is not None else n_cl
+            cl_seq = rb_clifford_indices[:length]
+            if desired_net_cl is not None:
+                # determine the inverse of the sequence
+                recovery_to_idx_clifford = Cl(
+                    net_cliffords[length]).get_inverse()
+                recovery_clifford = Cl(desired_net_cl)*recovery_to_idx_clifford
+                recovery_cliffords[i, j] = recovery_clifford.idx
+                cl_seq = np.append(cl_seq, recovery_clifford.idx)
+            seed_sequences.append(cl_seq)
+        sequences.append(seed_sequences)
+
+    if desired_net_cl is None:
+        recovery_cliffords = None
+    return sequences, recovery_cliffords
+
+
+def calculate_net_cliffords(rb_clifford_indices, prefix_lengths,
+                            Clifford=tqc.SingleQubitClifford):
+    '''
+    Calculate the net-cliffords of several prefixes of a list of cliffords
+    indices in a single pass.
+
+    Args:
+        rb_clifford_indices: list or array of integers specifying the cliffords.
+        prefix_lengths: increasing lengths of the prefixes.
+        Clifford : Clifford object used to determine what
+            inversion technique to use and what indices are valid.
+
+    Returns:
+        net_cliffords: list of the indices of the net-cliffords of the
+            prefixes, identical to calculate_net_clifford(
+            rb_clifford_indices[:length], Clifford).idx
+    '''
+    # abs is to remove the sign that is used to treat CZ ac CZ
+    clifford_indices = np.abs(rb_clifford_indices).tolist()
+    net_cliffords = []
+    start = 0
+    if Clifford is tqc.SingleQubitClifford:
+        products, _ = tqc.get_single_qubit_clifford_product_table()
+        net_idx = 0  # assumes element 0 is the Identity
+        for length in prefix_lengths:
+            for idx in clifford_indices[start:length]:
+                net_idx = products[idx][net_idx]
+            net_cliffords.append(net_idx)
+            start = length
+    else:
+        # the product of the pauli transfer matrices is only hashed for
+        # the prefixes
+        net_ptm = Clifford(0).pauli_transfer_matrix
+        for length in prefix_lengths:
+            for idx in clifford_indices[start:length]:
+                net_ptm = np.dot(Clifford(idx).pauli_transfer_matrix, net_ptm)
+            net_cliffords.append(tqc.get_clifford_id(net_ptm))
+            start = length
+    return net_cliffords
@@ -104,6 +104,10 @@ common_cliffords = {'I':  0, 'X':  3, 'Y':  6, 'Z':  9,
                     }
 
 
+# cache of the pauli transfer matrices of the two qubit Cliffords
+_two_qubit_PTMs = {}
+
+
 class Clifford(object):
 
     def __mul__(self, other):
@@ -138,6 +142,20 @@ class SingleQubitClifford(Clifford):
         self.idx = idx
         self.pauli_transfer_matrix = C1[idx]
 
+    def __mul__(self, other):
+        """
+        Product of two single qubit clifford gates, uses the precomputed
+        table of products (see get_single_qubit_clifford_product_table).
+        """
+        if not isinstance(other, SingleQubitClifford):
+            return super().__mul__(other)
+        products, _ = get_single_qubit_clifford_product_table()
+        return self.__class__(products[self.idx][other.idx])
+
+    def get_inverse(self):
+        _, inverses = get_single_qubit_clifford_product_table()
+        return self.__class__(inverses[self.idx])
+
     @property
     def gate_decomposition(self):
         """
@@ -156,14 +174,21 @@ class TwoQubitClifford(Clifford):
         assert(idx < 11520)
         self.idx = idx
 
-        if idx < 576:
-            self.pauli_transfer_matrix = single_qubit_like_PTM(idx)
-        elif idx < 576 + 5184:
-            self.pauli_transfer_matrix = CNOT_like_PTM(idx-576)
-        elif idx < 576 + 2*5184:
-            self.pauli_transfer_matrix = iSWAP_like_PTM(idx-(576+5184))
-        elif idx < 11520:
-            self.pauli_transfer_matrix = SWAP_like_PTM(idx-(576+2*5184))
+        # the PTMs are cached as they are expensive to construct
+        pauli_transfer_matrix = _two_qubit_PTMs.get(idx)
+        if pauli_transfer_matrix is None:
+            if idx < 576:
+                pauli_transfer_matrix = single_qubit_like_PTM(idx)
+            elif idx < 576 + 5184:
+                pauli_transfer_matrix = CNOT_like_PTM(idx-576)
+            elif idx < 576 + 2*5184:
+                pauli_transfer_matrix = iSWAP_like_PTM(idx-(576+5184))
+            elif idx < 11520:
+                pauli_transfer_matrix = SWAP_like_PTM(idx-(576+2*5184))
+            # the cached PTM is shared by all instances
+            pauli_transfer_matrix.setflags(write=False)
+            _two_qubit_PTMs[idx] = pauli_transfer_matrix
+        self.pauli_transfer_matrix = pauli_transfer_matrix
 
     @property
     def gate_decomposition(self):
@@ -422,16 +447,61 @@ def get_two_qubit_clifford_hash_table():
     return hash_table
 
 
+# hash tables, loaded from disk on first use, see get_clifford_hash_index
+_hash_indices = {}
+
+
+def get_clifford_hash_index(nr_qubits: int):
+    """
+    Returns a dict that maps the hash of the pauli transfer matrix of a
+    clifford to its index. The hash tables are only read from disk once.
+    """
+    if nr_qubits not in _hash_indices:
+        if nr_qubits == 1:
+            hash_table = get_single_qubit_clifford_hash_table()
+        elif nr_qubits == 2:
+            hash_table = get_two_qubit_clifford_hash_table()
+        else:
+            raise NotImplementedError()
+        _hash_indices[nr_qubits] = {
+            h: idx for idx, h in enumerate(hash_table)}
+    return _hash_indices[nr_qubits]
+
+
 def get_clifford_id(pauli_transfer_matrix):
     """
     returns the unique Id of a Clifford.
     """
     unique_hash = crc32(pauli_transfer_matrix.astype(int))
     if np.array_equal(np.shape(pauli_transfer_matrix), (4, 4)):
-        hash_table = get_single_qubit_clifford_hash_table()
+        hash_index = get_clifford_hash_index(1)
     elif np.array_equal(np.shape(pauli_transfer_matrix), (16, 16)):
-        hash_table = get_two_qubit_clifford_hash_table()
+        hash_index = get_clifford_hash_index(2)
     else:
         raise NotImplementedError()
-    idx = hash_table.index(unique_hash)
+    try:
+        idx = hash_index[unique_hash]
+    except KeyError:
+        raise ValueError('{} is not in the clifford hash table'.format(
+            unique_hash))
     return idx
+
+
+_single_qubit_product_table = []
+
+
+def get_single_qubit_clifford_product_table():
+    """
+    Returns the table of products and inverses of the single qubit
+    clifford group, computed on first use.
+
+    Returns:
+        products (list): products[i][j] is the index of C1[i]*C1[j]
+        inverses (list): inverses[i] is the index of the inverse of C1[i]
+    """
+    if not _single_qubit_product_table:
+        products = [[get_clifford_id(np.dot(C1[i], C1[j]))
+                     for j in range(24)] for i in range(24)]
+        inverses = [row.index(0) for row in products]
+        _single_qubit_product_table.extend([products, inverses])
+    return _single_qubit_product_table
@@ -1,3 +1,6 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pycqed.measurement import measurement_control as mc
 
 import adaptive
@@ -351,6 +354,90 @@ def compute_propagator(arglist):
     return [U_final, t_final]
 
 
+# Parameters that are forwarded to another instrument (the AWG), these are
+# not copied to the instruments in the worker processes
+_forwarded_parameters = {'cfg_awg_channel_amplitude'}
+
+
+def serialize_instrument(instrument):
+    """
+    Returns the class of an instrument and the latest values of its
+    settable parameters that can be pickled, such that a copy of the
+    instrument can be created in another process (see
+    deserialize_instrument).
+    """
+    values = {}
+    for par_name, par in instrument.parameters.items():
+        if (par_name in _forwarded_parameters or
+                not getattr(par, 'settable', hasattr(par, 'set'))):
+            continue
+        try:
+            value = par.get_latest()
+            pickle.dumps(value)
+        except Exception:
+            # e.g., a cost function defined as a lambda
+            continue
+        values[par_name] = value
+    return type(instrument), instrument.name, values
+
+
+# copies of the instruments in a worker process, see deserialize_instrument
+_worker_instruments = {}
+
+
+def deserialize_instrument(instrument_class, name, values):
+    """
+    Returns a copy of a serialized instrument in the current process.
+
+    The copy is created once per process, its name is suffixed with the
+    process id to avoid conflicts with the instruments of the parent
+    process. Raises a RuntimeError if a parameter cannot be set, as the
+    simulation would otherwise silently use a different value.
+    """
+    instrument = _worker_instruments.get(name)
+    if instrument is None:
+        instrument = instrument_class('{}_{}'.format(name, os.getpid()))
+        _worker_instruments[name] = instrument
+    for par_name, value in values.items():
+        try:
+            instrument.set(par_name, value)
+        except Exception as e:
+            raise RuntimeError(
+                'Could not set {}.{} in worker process: {}'.format(
+                    name, par_name, e)) from e
+    return instrument
+
+
+# serialized state of the instruments that is currently applied to the
+# copies in a worker process
+_worker_state = {'state': None, 'instruments': None}
+
+
+def compute_propagator_from_state(state, fluxbias_q0, fluxbias_q1):
+    """
+    Worker function for computing the propagator in another process.
+
+    Args:
+        state (bytes): pickled dict containing the serialized fluxlutman,
+            fluxlutman_static and sim_control_CZ (see serialize_instrument)
+            and the fitted_stepresponse_ty.
+        fluxbias_q0, fluxbias_q1 (float): flux biases of the qubits.
+    """
+    if state != _worker_state['state']:
+        instrument_state = pickle.loads(state)
+        _worker_state['instruments'] = {
+            key: deserialize_instrument(*instrument_state[key])
+            for key in ['fluxlutman', 'fluxlutman_static', 'sim_control_CZ']}
+        _worker_state['instruments']['fitted_stepresponse_ty'] = \
+            instrument_state['fitted_stepresponse_ty']
+        _worker_state['state'] = state
+
+    arglist = dict(_worker_state['instruments'])
+    arglist['fluxbias_q0'] = fluxbias_q0
+    arglist['fluxbias_q1'] = fluxbias_q1
+    return compute_propagator(arglist)
+
+
 def get_f_pulse_double_sided(fluxlutman,theta_i, which_gate: str = 'NE'):
     cz_lambda_2 = fluxlutman.get('cz_lambda_2_{}'.format(which_gate))
     cz_lambda_3 = fluxlutman.get('cz_lambda_3_{}'.format(which_gate))
@@ -393,7 +480,8 @@ class CZ_trajectory_superoperator(det.Soft_Detector):
         sim_control_CZ,
         fluxlutman_static,
         fitted_stepresponse_ty=None,
-        qois='all'
+        qois='all',
+        nr_processes: int = 1
     ):
         """
         Detector for simulating a CZ trajectory.
@@ -407,6 +495,10 @@ class CZ_trajectory_superoperator(det.Soft_Detector):
                 list of quantities of interest, this can be used to return
                 only a select set of values. The list should contain
                 entries of "value_names". if qois=='all', all quantities are returned.
+            nr_processes: number of processes used to compute the propagators
+                for the sampled flux biases. If > 1, the parameter values of the
+                instruments are sent to a pool of worker processes that each
+                compute the propagators using copies of the instruments.
         Structure: compute input parameters necessary to compute time evolution (propagator), then compute quantities of interest
         Returns: quantities of interest
         """
@@ -435,6 +527,38 @@ class CZ_trajectory_superoperator(det.Soft_Detector):
             # list of 2 elements: stepresponse (=y) as a function of time (=t)
             self.fitted_stepresponse_ty = fitted_stepresponse_ty
 
+        self.nr_processes = nr_processes
+        self._executor = None
+
+    def compute_propagators(self, input_to_parallelize):
+        """
+        Returns the results of compute_propagator for every entry of
+        input_to_parallelize, in the same order.
+        """
+        if self.nr_processes <= 1 or len(input_to_parallelize) <= 1:
+            return [compute_propagator(input_arglist)
+                    for input_arglist in input_to_parallelize]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.nr_processes)
+        state = pickle.dumps({
+            'fluxlutman': serialize_instrument(self.fluxlutman),
+            'fluxlutman_static': serialize_instrument(self.fluxlutman_static),
+            'sim_control_CZ': serialize_instrument(self.sim_control_CZ),
+            'fitted_stepresponse_ty': self.fitted_stepresponse_ty})
+        fluxbiases_q0 = [a['fluxbias_q0'] for a in input_to_parallelize]
+        fluxbiases_q1 = [a['fluxbias_q1'] for a in input_to_parallelize]
+        # map returns the results in the order of the input
+        return list(self._executor.map(
+            compute_propagator_from_state,
+            [state] * len(input_to_parallelize), fluxbiases_q0, fluxbiases_q1))
+
+    def finish(self, **kw):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
     def acquire_data_point(self, **kw):
 
         # Discretize average (integral) over a Gaussian distribution
@@ -468,8 +592,8 @@ class CZ_trajectory_superoperator(det.Soft_Detector):
                 delta_x_q1 = 1
                 values_gaussian_q1 = np.array([1])
 
-            # This is actually the input that was parallelized in an old version.
-            # Currently it just creates a list that is provided sequentially to compute_propagator
+            # This is the input that is provided to compute_propagator, either
+            # sequentially or in parallel (see nr_processes)
             input_to_parallelize = []
 
             weights=[]
@@ -494,8 +618,7 @@ class CZ_trajectory_superoperator(det.Soft_Detector):
 
             U_final_vec = []
             t_final_vec = []
-            for input_arglist in input_to_parallelize:
-                result_list = compute_propagator(input_arglist)
+            for result_list in self.compute_propagators(input_to_parallelize):
                 if self.sim_control_CZ.double_cz_pi_pulses() != '':
                     # Experimenting with single qubit ideal pi pulses
                     if self.sim_control_CZ.double_cz_pi_pulses() == 'with_pi_pulses':
@@ -2,6 +2,7 @@
 import numpy as np
 import qutip as qtp
 import scipy
+import scipy.linalg
 
 from scipy.interpolate import interp1d
 import matplotlib.pyplot as plt
@@ -925,6 +926,12 @@ def time_evolution_new(c_ops, sim_control_CZ, fluxlutman, fluxlutman_static, flu
         U_final(Qobj): propagator
 
     """
+    if sim_control_CZ.propagator_engine() == 'numpy':
+        return time_evolution_dense(
+            c_ops=c_ops, sim_control_CZ=sim_control_CZ, fluxlutman=fluxlutman,
+            fluxlutman_static=fluxlutman_static, fluxbias_q1=fluxbias_q1,
+            amp=amp, sim_step=sim_step, intervals_list=intervals_list,
+            which_gate=which_gate)
 
     q_freq_10 = fluxlutman.get('q_freq_10_{}'.format(which_gate))
 
@@ -992,6 +999,173 @@ def time_evolution_new(c_ops, sim_control_CZ, fluxlutman, fluxlutman_static, flu
     return U_final
 
 
+def calc_hamiltonian_dense(amp, fluxlutman, fluxlutman_static, which_gate: str = 'NE'):
+    """
+    Vectorized version of calc_hamiltonian.
+
+    Args:
+        amp (array): amplitudes in voltage
+
+    Returns
+        H (array): hamiltonians of shape (len(amp), n_levels, n_levels),
+            H[i] is equal to calc_hamiltonian(amp[i]).full()
+    """
+    amp = np.asarray(amp, dtype=float)
+    w_q0 = fluxlutman.calc_amp_to_freq(amp, '01', which_gate=which_gate)
+    w_q1 = fluxlutman.calc_amp_to_freq(amp, '10', which_gate=which_gate) * np.ones(np.shape(amp))
+    alpha_q0 = fluxlutman.calc_amp_to_freq(amp, '02', which_gate=which_gate) - 2 * w_q0
+    alpha_q1 = fluxlutman_static.q_polycoeffs_anharm()[-1]
+    w_q0_intpoint = w_q1 - alpha_q0
+
+    q_J2 = fluxlutman.get('q_J2_{}'.format(which_gate))
+    J = q_J2 / np.sqrt(2)
+    bus_freq = fluxlutman.get('bus_freq_{}'.format(which_gate))
+
+    delta_q1 = w_q1 - bus_freq
+    delta_q0_intpoint = (w_q0_intpoint) - bus_freq
+    delta_q0 = (w_q0) - bus_freq
+    J_temp = J / ((delta_q1 + delta_q0_intpoint) / (delta_q1 * delta_q0_intpoint)) * ((delta_q1 + delta_q0) / (delta_q1 * delta_q0))
+
+    # same terms as in coupled_transmons_hamiltonian_new
+    adag = a.dag()
+    bdag = b.dag()
+    terms = [(w_q0, n_q0), (w_q1, n_q1),
+             (1 / 2 * alpha_q0, adag * adag * a * a),
+             (1 / 2 * alpha_q1 * np.ones(np.shape(amp)), bdag * bdag * b * b),
+             (-J_temp, adag * b + a * bdag)]
+
+    H = np.zeros((np.size(amp),) + n_q0.shape, dtype=complex)
+    for coeff, op in terms:
+        H += np.reshape(coeff, (-1, 1, 1)) * op.full()
+    H *= 2 * np.pi
+    return H
+
+
+def _liouvillian_dense(H, c_ops):
+    """
+    Returns the Liouvillians (column stacking convention, as in qutip) for
+    a batch of hamiltonians H of shape (N, d, d) and a list of batches of
+    jump operators of the same shape.
+    """
+    N, d, _ = H.shape
+    I = np.eye(d)
+
+    def spre(A):
+        return np.einsum('ij,nkl->nikjl', I, A).reshape(N, d**2, d**2)
+
+    def spost(A):
+        return np.einsum('nji,kl->nikjl', A, I).reshape(N, d**2, d**2)
+
+    L = -1j * (spre(H) - spost(H))
+    for c in c_ops:
+        cdc = np.conj(np.swapaxes(c, 1, 2)) @ c
+        L += np.einsum('nij,nkl->nikjl', np.conj(c), c).reshape(N, d**2, d**2)
+        L -= 0.5 * (spre(cdc) + spost(cdc))
+    return L
+
+
+def _expm_dense(M):
+    """
+    Matrix exponential of a batch of matrices of shape (N, d, d).
+    """
+    try:
+        return scipy.linalg.expm(M)
+    except ValueError:
+        # scipy < 1.9 does not support batches of matrices
+        return np.array([scipy.linalg.expm(m) for m in M])
+
+
+def time_evolution_dense(c_ops, sim_control_CZ, fluxlutman, fluxlutman_static, fluxbias_q1, amp, sim_step=None, intervals_list=None, which_gate: str = 'NE', chunk_size: int = 256):
+    """
+    Calculates the propagator (either unitary or superoperator), same as
+    time_evolution_new but on dense numpy arrays instead of qutip objects.
+
+    The hamiltonians for all time steps are computed at once. Without
+    jump operators the propagators of the time steps are computed from the
+    eigendecomposition of the hamiltonians, otherwise from the matrix
+    exponential of the Liouvillians. The time steps are processed in chunks
+    of chunk_size to limit the memory usage.
+
+    Args:
+        see time_evolution_new
+
+    Returns
+        U_final(Qobj): propagator
+    """
+    q_freq_10 = fluxlutman.get('q_freq_10_{}'.format(which_gate))
+
+    if intervals_list is None:
+        intervals_list = np.zeros(np.size(amp)) + sim_step
+    intervals_list = np.asarray(intervals_list, dtype=float)
+
+    H_0 = calc_hamiltonian(0, fluxlutman, fluxlutman_static, which_gate=which_gate)
+    if sim_control_CZ.dressed_compsub():
+        S = matrix_change_of_variables(H_0)
+    else:
+        S = np.eye(n_levels_q1 * n_levels_q0)
+    S_dag = np.conj(S.T)
+
+    w_q1 = q_freq_10    # we 'save' the input value of w_q1
+    if sim_control_CZ.sigma_q1() != 0:
+        w_q1_sweetspot = sim_control_CZ.w_q1_sweetspot()
+        if w_q1 > w_q1_sweetspot:
+            log.warning('Operating frequency of q1 should be lower than its sweet spot frequency.')
+            w_q1 = w_q1_sweetspot
+
+        w_q1_biased = shift_due_to_fluxbias_q0_singlefrequency(
+            f_pulse=w_q1,
+            omega_0=w_q1_sweetspot,
+            fluxbias=fluxbias_q1,
+            positive_branch=True)
+    else:
+        w_q1_biased = w_q1
+
+    log.debug('Changing fluxlutman q_freq_10_{} value to {}'.format(which_gate, w_q1_biased))
+    fluxlutman.set('q_freq_10_{}'.format(which_gate), w_q1_biased)     # we insert the change to w_q1 in this way because then J1 is also tuned appropriately
+    try:
+        H = S_dag @ calc_hamiltonian_dense(amp, fluxlutman, fluxlutman_static, which_gate=which_gate) @ S
+    finally:
+        log.debug('Changing fluxlutman q_freq_10_{} value back to {}'.format(which_gate, w_q1))
+        fluxlutman.set('q_freq_10_{}'.format(which_gate), w_q1)
+
+    # jump operators are already in the H_0 basis
+    c_ops_dense = []
+    for c_op in c_ops:
+        if isinstance(c_op, list):
+            c_ops_dense.append(np.reshape(c_op[1], (-1, 1, 1)) * c_op[0].full())
+        else:
+            c_ops_dense.append(c_op.full()[np.newaxis])
+
+    nr_steps = len(H)
+    dim = H.shape[1] ** 2 if c_ops != [] else H.shape[1]
+    exp_L_total = np.eye(dim, dtype=complex)
+    buffer = np.empty_like(exp_L_total)
+    for start in range(0, nr_steps, chunk_size):
+        stop = min(start + chunk_size, nr_steps)
+        H_chunk = H[start:stop]
+        dt = intervals_list[start:stop]
+        if c_ops != []:
+            c_ops_chunk = [
+                np.broadcast_to(c, H_chunk.shape) if len(c) == 1 else c[start:stop]
+                for c in c_ops_dense]
+            L = _liouvillian_dense(H_chunk, c_ops_chunk)
+            exp_L = _expm_dense(L * dt[:, np.newaxis, np.newaxis])
+        else:
+            # H is hermitian, exp(-iHt) = V exp(-iEt) V^dag
+            E, V = np.linalg.eigh(H_chunk)
+            exp_L = (V * np.exp(-1j * E * dt[:, np.newaxis])[:, np.newaxis, :]) @ np.conj(np.swapaxes(V, 1, 2))
+        for exp_L_t in exp_L:
+            np.matmul(exp_L_t, exp_L_total, out=buffer)
+            exp_L_total, buffer = buffer, exp_L_total
+
+    dims = [n_levels_q1, n_levels_q0]
+    if c_ops != []:
+        U_final = qtp.Qobj(exp_L_total, dims=[[dims, dims], [dims, dims]], superrep='super')
+    else:
+        U_final = qtp.Qobj(exp_L_total, dims=[dims, dims])
+    return U_final
+
+
 def simulate_quantities_of_interest_superoperator_new(U, t_final, fluxlutman, fluxlutman_static, which_gate: str = 'NE'):
     """
     Calculates the quantities of interest from the propagator (either unitary or superoperator)
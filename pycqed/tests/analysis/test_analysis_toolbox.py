@@ -1,5 +1,7 @@
 import os
 import pytest
+import numpy as np
+import h5py
 import pycqed as pq
 from pycqed.analysis import analysis_toolbox as a_tools
 
@@ -37,3 +39,103 @@ def test_get_datafilepath_from_timestamp_raises_no_data():
     timestamp = '20170412_183929'
     with pytest.raises(ValueError):
         a_tools.get_datafilepath_from_timestamp(timestamp)
+
+
+def test_get_data_from_timestamp_list_parallel():
+    timestamps = ['20170412_183928', '20170412_185618']
+    param_names = {'folder': 'folder',
+                   'sweep_points': 'sweep_points',
+                   'measured_values': 'measured_values'}
+    data_serial = a_tools.get_data_from_timestamp_list(
+        list(timestamps), param_names=param_names, nr_workers=1)
+    data_parallel = a_tools.get_data_from_timestamp_list(
+        list(timestamps), param_names=param_names, nr_workers=2)
+
+    assert data_parallel['timestamps'] == timestamps
+    assert data_parallel['folder'] == data_serial['folder']
+    for key in ['sweep_points', 'measured_values']:
+        for val_serial, val_parallel in zip(data_serial[key],
+                                            data_parallel[key]):
+            np.testing.assert_array_equal(val_serial, val_parallel)
+
+
+def test_datafile_view_matches_measurement_analysis():
+    from pycqed.analysis import measurement_analysis as ma
+    param_names = ['folder', 'timestamp_string', 'measurementstring',
+                   'sweep_name', 'sweep_points', 'measured_values',
+                   'value_names', 'value_units', 'xlabel', 'ylabels',
+                   'MC.soft_avg', 'I', 'amp']
+    for timestamp in ['20170412_183928', '20170412_185618']:
+        view = a_tools._DatafileView(a_tools.data_from_time(timestamp))
+        ana = ma.MeasurementAnalysis(timestamp=timestamp, auto=False,
+                                     close_file=False, h5mode='r')
+        ana.get_naming_and_values()
+        data_view = a_tools.get_data_from_ma(view, param_names)
+        data_ma = a_tools.get_data_from_ma(ana, param_names)
+        view.finish()
+        ana.finish()
+
+        assert list(data_view.keys()) == list(data_ma.keys())
+        for param in param_names:
+            np.testing.assert_equal(data_view[param], data_ma[param])
+
+
+def test_datafile_view_reads_lazily():
+    timestamp = '20170412_183928'
+    view = a_tools._DatafileView(a_tools.data_from_time(timestamp))
+    data = a_tools.get_data_from_ma(view, ['timestamp_string', 'MC.soft_avg'])
+    assert data['timestamp_string'] == timestamp
+    assert data['MC.soft_avg'] == '10'
+    # the experimental data is only read when it is requested
+    assert 'measured_values' not in view.__dict__
+    assert 'measured_values' in dir(view)
+    assert view.measured_values.shape == (2, len(view.sweep_points))
+    view.finish()
+
+
+def test_datafile_view_version_1(tmp_path):
+    folder = os.path.join(str(tmp_path), '20180101', '120000_test')
+    os.makedirs(folder)
+    x = np.linspace(0, 1, 5)
+    with h5py.File(os.path.join(folder, '120000_test.hdf5'), 'w') as f:
+        g = f.create_group('Experimental Data')
+        g.attrs['sweep_parameter_name'] = 'x'
+        g.attrs['sweep_parameter_unit'] = 's'
+        g.attrs['value_names'] = np.array([b'y0', b'y1'])
+        g.attrs['value_units'] = np.array([b'V', b'V'])
+        g['x'] = x
+        g['y0'] = 2 * x
+        g['y1'] = 3 * x
+
+    view = a_tools._DatafileView(folder)
+    data = a_tools.get_data_from_ma(
+        view, ['sweep_points', 'measured_values', 'xlabel', 'ylabels'],
+        data_version=1)
+    view.finish()
+    np.testing.assert_array_equal(data['sweep_points'], x)
+    np.testing.assert_array_equal(data['measured_values'], [2 * x, 3 * x])
+    assert data['xlabel'] == 'x(s)'
+    assert data['ylabels'] == ['y0(V)', 'y1(V)']
+
+
+def test_content_signature_ignores_saved_analysis(tmp_path):
+    datafile = os.path.join(str(tmp_path), 'data.hdf5')
+    with h5py.File(a_tools.get_datafilepath_from_timestamp(
+            '20170412_183928'), 'r') as src, h5py.File(datafile, 'w') as dst:
+        for group_name in ['Experimental Data', 'Instrument settings']:
+            src.copy(group_name, dst)
+    param_names = ['sweep_points', 'measured_values', 'MC.soft_avg']
+    signature = a_tools._get_content_signature(datafile, param_names)
+
+    # e.g., BaseDataAnalysis.save_fit_results
+    with h5py.File(datafile, 'a') as data_file:
+        data_file.create_group('Analysis').attrs['chisqr'] = 1.
+    assert a_tools._get_content_signature(
+        datafile, param_names) == signature
+    assert a_tools._get_content_signature(
+        datafile, param_names, filter_no_analysis=True) != signature
+
+    with h5py.File(datafile, 'a') as data_file:
+        data_file['Instrument settings/MC'].attrs['soft_avg'] = '1'
+    assert a_tools._get_content_signature(
+        datafile, param_names) != signature
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import pytest
+import numpy as np
+from pycqed.analysis.tools.extraction_cache import ExtractionCache
+
+
+def test_extraction_cache_invalidation():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ExtractionCache(cache_dir=os.path.join(tmpdir, 'cache'))
+        datafile = os.path.join(tmpdir, 'data.hdf5')
+        with open(datafile, 'w') as f:
+            f.write('data')
+
+        key = ('20170412_183928', ('sweep_points',), False)
+        assert cache.get(key, datafile) is None
+        cache.put(key, datafile, {'sweep_points': np.arange(5)})
+        np.testing.assert_array_equal(
+            cache.get(key, datafile)['sweep_points'], np.arange(5))
+
+        # modifying the datafile invalidates the entry
+        with open(datafile, 'a') as f:
+            f.write('more data')
+        assert cache.get(key, datafile) is None
+
+
+def test_extraction_cache_eviction():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ExtractionCache(cache_dir=os.path.join(tmpdir, 'cache'))
+        datafile = os.path.join(tmpdir, 'data.hdf5')
+        with open(datafile, 'w') as f:
+            f.write('data')
+        for i in range(3):
+            cache.put(('ts', i), datafile, np.zeros(1000))
+            # ensure distinct access times of the entries
+            os.utime(cache._entry_path(('ts', i), datafile), ns=(i * 10**9, i * 10**9))
+        entry_size = os.path.getsize(cache._entry_path(('ts', 0), datafile))
+        cache.max_size = 2 * entry_size
+        cache.evict()
+        assert cache.get(('ts', 0), datafile) is None
+        assert cache.get(('ts', 2), datafile) is not None
+
+        cache.clear()
+        assert cache.get(('ts', 2), datafile) is None
+
+
+def test_extraction_cache_datafile_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ExtractionCache(cache_dir=os.path.join(tmpdir, 'cache'))
+        datafiles = []
+        # the same timestamp in two datadirs
+        for datadir in ['datadir_0', 'datadir_1']:
+            os.makedirs(os.path.join(tmpdir, datadir))
+            datafile = os.path.join(tmpdir, datadir, 'data.hdf5')
+            with open(datafile, 'w') as f:
+                f.write('data')
+            datafiles.append(datafile)
+
+        key = ('20170412_183928', ('sweep_points',), False)
+        for i, datafile in enumerate(datafiles):
+            cache.put(key, datafile, i)
+        for i, datafile in enumerate(datafiles):
+            assert cache.get(key, datafile) == i
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX permissions')
+def test_extraction_cache_not_private():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = os.path.join(tmpdir, 'cache')
+        cache = ExtractionCache(cache_dir=cache_dir)
+        datafile = os.path.join(tmpdir, 'data.hdf5')
+        with open(datafile, 'w') as f:
+            f.write('data')
+        cache.put('key', datafile, 1)
+        assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+        assert cache.get('key', datafile) == 1
+
+        # entries in a directory writable by others are not loaded
+        os.chmod(cache_dir, 0o777)
+        assert cache.get('key', datafile) is None
+
+
+def test_extraction_cache_content_signature():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ExtractionCache(cache_dir=os.path.join(tmpdir, 'cache'))
+        datafile = os.path.join(tmpdir, 'data.hdf5')
+        with open(datafile, 'w') as f:
+            f.write('data')
+        content = ['signature']
+
+        key = ('20170412_183928', ('sweep_points',), False)
+        cache.put(key, datafile, 1, lambda: content[0])
+        assert cache.get(key, datafile, lambda: content[0]) == 1
+        assert (cache.nr_hits, cache.nr_misses) == (1, 0)
+
+        # the entry stays valid if the extracted part did not change
+        with open(datafile, 'a') as f:
+            f.write('analysis results')
+        assert cache.get(key, datafile, lambda: content[0]) == 1
+        # the entry is updated for the new version of the datafile
+        assert cache.get(key, datafile) == 1
+
+        with open(datafile, 'a') as f:
+            f.write('more data')
+        content[0] = 'new signature'
+        assert cache.get(key, datafile, lambda: content[0]) is None
+        assert (cache.nr_hits, cache.nr_misses) == (3, 1)
+
+
+def test_extraction_cache_write_failure():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ExtractionCache(cache_dir=os.path.join(tmpdir, 'cache'))
+        datafile = os.path.join(tmpdir, 'data.hdf5')
+        with open(datafile, 'w') as f:
+            f.write('data')
+        cache.put('key', datafile, 1)
+
+        # replacing the entry by a directory makes writing it fail
+        entry_path = cache._entry_path('key', datafile)
+        os.remove(entry_path)
+        os.mkdir(entry_path)
+        with pytest.raises(OSError):
+            cache.put('key', datafile, 2)
+        # the temporary file is removed
+        assert sorted(os.listdir(cache.cache_dir)) == [
+            os.path.basename(entry_path)]
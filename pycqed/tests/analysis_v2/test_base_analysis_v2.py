@@ -3,11 +3,13 @@ import h5py
 import json
 import numpy as np
 import os
+import tempfile
 import pycqed as pq
 import matplotlib.pyplot as plt
 import pycqed.analysis.analysis_toolbox as a_tools
 import pycqed.analysis_v2.base_analysis as ba
 import pycqed.analysis_v2.measurement_analysis as ma2
+from pycqed.analysis.tools.extraction_cache import ExtractionCache
 
 
 class Test_base_analysis(unittest.TestCase):
@@ -53,6 +55,22 @@ class Test_base_analysis(unittest.TestCase):
 
         assert saved_val == 5
 
+    def test_extraction_cache_fitting_analysis(self):
+        # the fit results saved to the datafile do not invalidate the
+        # cached data extracted from it
+        extraction_cache = a_tools.extraction_cache
+        with tempfile.TemporaryDirectory() as tmpdir:
+            a_tools.extraction_cache = ExtractionCache(cache_dir=tmpdir)
+            try:
+                for i in range(2):
+                    a = ma2.FlippingAnalysis(
+                        t_start='20170726_164507',
+                        options_dict={'use_extraction_cache': True})
+                    assert 'cos_fit' in a.fit_res
+                assert a_tools.extraction_cache.nr_misses == 1
+                assert a_tools.extraction_cache.nr_hits == 1
+            finally:
+                a_tools.extraction_cache = extraction_cache
 
     def test_save_load_json(self):
         # Load data from file
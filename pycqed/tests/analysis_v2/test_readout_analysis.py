@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 import pycqed as pq
 import os
+import h5py
 import matplotlib.pyplot as plt
 from pycqed.analysis_v2 import measurement_analysis as ma
 from pycqed.analysis_v2 import readout_analysis as ra
@@ -216,3 +217,86 @@ class Test_multiplexed_readout_analysis(unittest.TestCase):
     #     a = ma.Multiplexed_Readout_Analysis(t_start=t_start, t_stop=t_stop,
     #                                         qubit_names=['QR', 'QL'])
     #     np.testing.assert_equal(a.proc_data_dict['qubit_names'], ['QR', 'QL'])
+
+
+def assignment_prob_matrix_reference(combinations, digitized_data):
+    """
+    Reference implementation of calc_assignment_prob_matrix and
+    calc_cross_fidelity_matrix, comparing all shots for every entry.
+    """
+    nr_qubits = len(combinations[0])
+    channels = list(digitized_data)
+    matrix = np.zeros((len(combinations), len(combinations)))
+    for i, prep in enumerate(combinations):
+        nr_shots = len(digitized_data[channels[0]][prep])
+        for j, decl in enumerate(combinations):
+            check = np.ones(nr_shots, dtype=bool)
+            for k, ch in enumerate(channels):
+                check &= digitized_data[ch][prep] == int(decl[k])
+            matrix[i, j] = np.mean(check)
+    cross_fid = np.zeros((nr_qubits, nr_qubits))
+    for i in range(nr_qubits):
+        for j in range(nr_qubits):
+            P_eiIj = sum(matrix[p, d] for p in range(len(combinations))
+                         for d in range(len(combinations))
+                         if combinations[d][i] == '1' and
+                         combinations[p][j] == '0')
+            P_giPj = sum(matrix[p, d] for p in range(len(combinations))
+                         for d in range(len(combinations))
+                         if combinations[d][i] == '0' and
+                         combinations[p][j] == '1')
+            cross_fid[i, j] = 1 - (P_eiIj + P_giPj)/(len(combinations)/2)
+    return matrix, cross_fid
+
+
+class Test_assignment_prob_matrix(unittest.TestCase):
+
+    def check_against_reference(self, combinations, digitized_data):
+        from pycqed.analysis_v2 import multiplexed_readout_analysis as mra
+        expected, expected_cross_fid = assignment_prob_matrix_reference(
+            combinations, digitized_data)
+
+        assignment_prob_matrix = mra.calc_assignment_prob_matrix(
+            combinations, digitized_data)
+        np.testing.assert_array_equal(assignment_prob_matrix, expected)
+        sparse_matrix = mra.calc_assignment_prob_matrix(
+            combinations, digitized_data, sparse=True)
+        np.testing.assert_array_equal(sparse_matrix.toarray(), expected)
+
+        for matrix in [assignment_prob_matrix, sparse_matrix]:
+            np.testing.assert_almost_equal(
+                mra.calc_cross_fidelity_matrix(combinations, matrix),
+                expected_cross_fid)
+
+    def test_synthetic_data(self):
+        rng = np.random.RandomState(0)
+        combinations = ['00', '01', '10', '11']
+        digitized_data = {'ch0': {}, 'ch1': {}}
+        for comb in combinations:
+            for k, ch in enumerate(digitized_data):
+                p1 = 0.9 if comb[k] == '1' else 0.1
+                digitized_data[ch][comb] = np.array(
+                    rng.rand(100) < p1, dtype=int)
+        self.check_against_reference(combinations, digitized_data)
+
+    def test_stored_data(self):
+        # Multiplexed single shots of three channels, digitized at the mean
+        # of each channel as in Multiplexed_Readout_Analysis
+        datadir = os.path.join(pq.__path__[0], 'tests', 'test_data')
+        data_fp = os.path.join(datadir, '20170606', '162250_SSRO_QL_QR',
+                               '162250_SSRO_QL_QR.hdf5')
+        with h5py.File(data_fp, 'r') as f:
+            shots = f['Experimental Data']['Data'][:, 1:]
+
+        for nr_qubits in [2, 3]:
+            combinations = ['{:0{}b}'.format(i, nr_qubits)
+                            for i in range(2**nr_qubits)]
+            digitized_data = {}
+            for k in range(nr_qubits):
+                ch_shots = shots[:, k]
+                th = np.mean(ch_shots)
+                digitized_data['ch{}'.format(k)] = {
+                    comb: np.array(
+                        ch_shots[i::len(combinations)] > th, dtype=int)
+                    for i, comb in enumerate(combinations)}
+            self.check_against_reference(combinations, digitized_data)
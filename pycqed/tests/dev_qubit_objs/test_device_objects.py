@@ -469,6 +469,47 @@ class Test_Device_obj(unittest.TestCase):
         exp_res_combs2 = [[2], [3], [0], [2, 3, 0]]
         assert res_combs2 == exp_res_combs2
 
+    def test_prepare_readout_parallel(self):
+        qubits = ["q2", "q3", "q0", "q13", "q16"]
+        self.device.cfg_prepare_parallel(True)
+        try:
+            self.device.prepare_readout(qubits=qubits)
+        finally:
+            self.device.cfg_prepare_parallel(False)
+
+        assert self.ro_lutman_0.resonator_combinations() == [[13], [16], [13, 16]]
+        assert self.ro_lutman_2.resonator_combinations() == [[2], [3], [0], [2, 3, 0]]
+
+        timings = self.device.prepare_timings
+        assert "readout" in timings
+        group_labels = [k for k in timings if k.startswith("readout: ")]
+        assert len(group_labels) == 2
+        assert any(self.UHFQC_0.name in k for k in group_labels)
+        assert any(self.UHFQC_2.name in k for k in group_labels)
+
+    def test_prepare_readout_skips_unchanged_weights(self):
+        qubits = ["q2", "q3", "q0"]
+        dev = self.device.name
+        self.device.ro_acq_weight_type("SSB")
+        self.device.prepare_readout(qubits=qubits)
+        stats = self.device.get_prepare_statistics(qubits)
+
+        # nothing changed, the weights are not uploaded again
+        self.device.prepare_readout(qubits=qubits)
+        new_stats = self.device.get_prepare_statistics(qubits)
+        assert new_stats[dev]["uploaded"] == stats[dev]["uploaded"]
+        assert new_stats[dev]["skipped"] == stats[dev]["skipped"] + len(qubits)
+
+        self.device.cfg_prepare_force_upload(True)
+        try:
+            self.device.prepare_readout(qubits=qubits)
+        finally:
+            self.device.cfg_prepare_force_upload(False)
+        forced_stats = self.device.get_prepare_statistics(qubits)
+        assert (forced_stats[dev]["uploaded"] ==
+                new_stats[dev]["uploaded"] + len(qubits))
+        assert forced_stats[dev]["skipped"] == new_stats[dev]["skipped"]
+
     def test_prepare_ro_pulses_lutman_pars_updated(self):
         q = self.device.find_instrument("q5")
         q.ro_pulse_amp(0.4)
@@ -634,3 +675,18 @@ def test_acq_ch_map_to_IQ_ch_map():
     }
 
     assert IQ_ch_map == exp_IQ_ch_map
+
+
+def test_group_by_instruments():
+    instr_names = {
+        "q0": ["UHFQC_0", "LO_0"],
+        "q1": ["UHFQC_1"],
+        "q2": ["UHFQC_2", None],
+        "q3": ["UHFQC_1"],
+        "q4": ["UHFQC_2", "LO_0"],
+    }
+    groups = do._group_by_instruments(list(instr_names), instr_names.get)
+    assert groups == [
+        (["LO_0", "UHFQC_0", "UHFQC_2"], ["q0", "q2", "q4"]),
+        (["UHFQC_1"], ["q1", "q3"]),
+    ]
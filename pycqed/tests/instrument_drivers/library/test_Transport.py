@@ -0,0 +1,110 @@
+import socket
+import threading
+import unittest
+import numpy as np
+
+from pycqed.instrument_drivers.library.Transport import IPTransport
+from pycqed.instrument_drivers.library.SCPIBase import SCPIBase
+
+
+class LoopbackSCPIServer:
+    """
+    Minimal SCPI server on the loopback interface, used to test (and
+    benchmark) transports without hardware. Supported commands:
+        *IDN?       replies an identity string
+        ECHO <text> replies <text>
+        DATA? <n>   replies a binblock of n bytes with values i % 256
+    """
+
+    def __init__(self):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(1)
+        self.port = self._server.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        try:
+            # wakes up the blocking accept()
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._server.close()
+        self._thread.join(timeout=5)
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:  # server socket closed
+                return
+            with conn, conn.makefile('rb') as f:
+                for line in f:
+                    conn.sendall(self._reply(line.decode().rstrip()))
+
+    @staticmethod
+    def _reply(cmd: str) -> bytes:
+        if cmd == '*IDN?':
+            return b'QuTech,Loopback,0,0\n'
+        elif cmd.startswith('ECHO '):
+            return cmd[5:].encode() + b'\n'
+        elif cmd.startswith('DATA? '):
+            byte_cnt = int(cmd[6:])
+            data = (np.arange(byte_cnt) % 256).astype(np.uint8).tobytes()
+            header = SCPIBase._build_header_string(byte_cnt)
+            return header.encode() + data + b'\r\n'
+        return b'ERROR\n'
+
+
+class Test_IPTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LoopbackSCPIServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def setUp(self):
+        self.transport = IPTransport('127.0.0.1', self.server.port,
+                                     rcv_buf_size=1024)
+        self.scpi = SCPIBase('loopback', self.transport)
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_readline(self):
+        assert self.scpi._ask('*IDN?') == 'QuTech,Loopback,0,0'
+        # replies to several commands arrive in a single receive, data
+        # following a line must not be lost
+        for i in range(3):
+            self.transport.write('ECHO line {}'.format(i))
+        for i in range(3):
+            assert self.transport.readline() == 'line {}\n'.format(i)
+
+    def test_readline_long(self):
+        line = 'x' * 100000
+        self.transport.write('ECHO ' + line)
+        assert self.transport.readline().rstrip() == line
+
+    def test_bin_block_read(self):
+        byte_cnt = 10**6 + 3
+        expected = (np.arange(byte_cnt) % 256).astype(np.uint8)
+
+        bin_block = self.scpi._ask_bin('DATA? {}'.format(byte_cnt))
+        assert isinstance(bin_block, bytes)
+        np.testing.assert_array_equal(
+            np.frombuffer(bin_block, dtype=np.uint8), expected)
+
+        self.transport.write('DATA? {}'.format(byte_cnt))
+        self.transport.write('*IDN?')
+        bin_block = self.scpi.bin_block_read_array()
+        np.testing.assert_array_equal(bin_block, expected)
+        assert self.transport.readline() == 'QuTech,Loopback,0,0\n'
+
+    def test_bin_block_read_array_dtype(self):
+        self.transport.write('DATA? 16')
+        bin_block = self.scpi.bin_block_read_array(dtype=np.uint32)
+        np.testing.assert_array_equal(
+            bin_block, np.arange(16, dtype=np.uint8).view(np.uint32))
@@ -402,6 +402,73 @@ class TestMultiQubitFluxLutMan:
         self.fluxlutman.render_wave('cz_SE', time_units='lut_index')
         self.fluxlutman.render_wave('cz_SE', time_units='s')
 
+    def test_time_evolution_dense(self):
+        pytest.importorskip('qutip')
+        from pycqed.simulations import cz_superoperator_simulation_new_functions as czf
+        self.sim_control_CZ_SE.which_gate('SE')
+        amp = np.linspace(0, 0.3, 50)
+        c_ops = [0.01 * czf.a, [czf.n_q0, np.linspace(0, 0.02, 50)]]
+        for ops in [[], c_ops]:
+            U = {}
+            for engine in ['qutip', 'numpy']:
+                self.sim_control_CZ_SE.propagator_engine(engine)
+                U[engine] = czf.time_evolution_new(
+                    c_ops=ops, sim_control_CZ=self.sim_control_CZ_SE,
+                    fluxlutman=self.fluxlutman,
+                    fluxlutman_static=self.fluxlutman_static,
+                    fluxbias_q1=0, amp=amp, sim_step=1/2.4e9,
+                    which_gate='SE')
+            self.sim_control_CZ_SE.propagator_engine('qutip')
+            assert U['numpy'].dims == U['qutip'].dims
+            np.testing.assert_allclose(U['numpy'].full(), U['qutip'].full(),
+                                       atol=1e-8)
+
+    def test_cz_trajectory_parallel_propagators(self):
+        # The propagators computed by a pool of worker processes are equal
+        # to the propagators computed serially and in the same order.
+        pytest.importorskip('qutip')
+        from pycqed.simulations import cz_superoperator_simulation_new2 as czs
+        self.sim_control_CZ_SE.which_gate('SE')
+        pars = {'cz_length_SE': 20e-9, 'cz_lambda_2_SE': 0,
+                'cz_lambda_3_SE': 0, 'czd_double_sided_SE': False}
+        old_values = {par: self.fluxlutman.get(par) for par in pars}
+        for par, value in pars.items():
+            self.fluxlutman.set(par, value)
+        self.sim_control_CZ_SE.sigma_q0(1e-3)
+
+        input_to_parallelize = [
+            {'fluxbias_q0': fluxbias_q0, 'fluxbias_q1': 0,
+             'fluxlutman': self.fluxlutman,
+             'fluxlutman_static': self.fluxlutman_static,
+             'sim_control_CZ': self.sim_control_CZ_SE,
+             'fitted_stepresponse_ty': [np.array(1), np.array(1)]}
+            for fluxbias_q0 in [-5e-3, 0, 5e-3]]
+        propagators = {}
+        try:
+            for nr_processes in [1, 2]:
+                detector = czs.CZ_trajectory_superoperator(
+                    fluxlutman=self.fluxlutman,
+                    sim_control_CZ=self.sim_control_CZ_SE,
+                    fluxlutman_static=self.fluxlutman_static,
+                    nr_processes=nr_processes)
+                try:
+                    propagators[nr_processes] = detector.compute_propagators(
+                        input_to_parallelize)
+                finally:
+                    detector.finish()
+        finally:
+            self.sim_control_CZ_SE.sigma_q0(0)
+            for par, value in old_values.items():
+                self.fluxlutman.set(par, value)
+
+        for (U_serial, t_serial), (U_pool, t_pool) in zip(
+                propagators[1], propagators[2]):
+            assert t_serial == t_pool
+            np.testing.assert_allclose(U_pool.full(), U_serial.full())
+        # the flux bias changes the propagator, so the order is tested
+        assert not np.allclose(propagators[1][0][0].full(),
+                               propagators[1][-1][0].full())
+
     # [Victor, 2020-04-28] We are testing now the VCZ gate, this old
     # simulations are useless for now, not worth fixing tests
 
@@ -78,6 +78,36 @@ class Test_MW_LutMan(unittest.TestCase):
         uploaded_wf = self.AWG.get('wave_ch1_cw008')
         np.testing.assert_array_almost_equal(expected_wf_spec, uploaded_wf)
 
+    def test_skip_unchanged_uploads(self):
+        lm = self.AWG8_MW_LutMan
+        nr_wfs = 2*len(lm.LutMap())
+        lm.load_waveforms_onto_AWG_lookuptable()
+        stats = dict(lm.upload_statistics)
+
+        # nothing changed, no waveforms are uploaded
+        lm.load_waveforms_onto_AWG_lookuptable()
+        assert lm.upload_statistics['uploaded'] == stats['uploaded']
+        assert lm.upload_statistics['skipped'] == stats['skipped'] + nr_wfs
+
+        # only the waveforms that changed are uploaded
+        old_spec_amp = lm.spec_amp()
+        lm.spec_amp(old_spec_amp/2)
+        try:
+            stats = dict(lm.upload_statistics)
+            lm.load_waveforms_onto_AWG_lookuptable()
+            nr_uploaded = lm.upload_statistics['uploaded'] - stats['uploaded']
+            assert 0 < nr_uploaded < nr_wfs
+            assert (lm.upload_statistics['skipped'] - stats['skipped'] ==
+                    nr_wfs - nr_uploaded)
+        finally:
+            lm.spec_amp(old_spec_amp)
+            lm.load_waveforms_onto_AWG_lookuptable()
+
+        lm.invalidate_upload_cache()
+        stats = dict(lm.upload_statistics)
+        lm.load_waveforms_onto_AWG_lookuptable()
+        assert lm.upload_statistics['uploaded'] == stats['uploaded'] + nr_wfs
+
     def test_uploading_standard_pulses_QWG_lutman(self):
         # Tests that all waveforms are present and no error is raised.
         self.QWG_MW_LutMan.load_waveforms_onto_AWG_lookuptable(
@@ -20,6 +20,21 @@ class Test_UHFQC(unittest.TestCase):
     def test_instantiation(self):
         self.assertEqual(Test_UHFQC.uhf.devname, 'dev2109')
 
+    def test_snapshot(self):
+        # Node parameters are created lazily, the whitelisted ones must be
+        # part of the snapshot even if they were never accessed
+        snapshot = self.uhf.snapshot()['parameters']
+        for name in ['IDN', 'qas_0_integration_length',
+                     'qas_0_integration_mode', 'qas_0_delay',
+                     'qas_0_thresholds_9_level', 'qas_0_rotations_0',
+                     'qas_0_crosstalk_rows_9_cols_9', 'qas_0_result_source',
+                     'sigouts_1_on', 'sigouts_0_range', 'sigins_1_range',
+                     'awgs_0_userregs_15', 'awgs_0_outputs_1_amplitude']:
+            assert name in snapshot
+        assert self.uhf._snapshot_whitelist <= set(snapshot)
+        for name in self.uhf._params_to_exclude:
+            assert name not in snapshot
+
     def test_DIO_program(self):
         self.uhf.awg_sequence_acquisition_and_DIO_triggered_pulse(cases=[
                                                                   0, 2, 14])
@@ -61,6 +76,7 @@ class Test_UHFQC(unittest.TestCase):
 
         # resetting the compilation count to ensure test is self contained
         Test_UHFQC.uhf._awgModule._compilation_count[0] = 0
+        Test_UHFQC.uhf.invalidate_awg_program_cache()
         Test_UHFQC.uhf.awg_sequence_acquisition_and_pulse()
         Test_UHFQC.uhf.start()
         Test_UHFQC.uhf.stop()
@@ -90,6 +106,29 @@ class Test_UHFQC(unittest.TestCase):
         # Now the compilation must have been executed again
         self.assertEqual(Test_UHFQC.uhf._awgModule.get_compilation_count(0), 2)
 
+    def test_acquisition_poll_chunks(self):
+        self.uhf.awg_sequence_acquisition()
+        # Return the result vectors in chunks of 7 samples per poll
+        self.uhf.daq.poll_chunk_size = 7
+        try:
+            # the mock data is drawn using np.random
+            np.random.seed(0)
+            data = self.uhf.acquisition(samples=100, channels=(0, 1))
+
+            np.random.seed(0)
+            self.uhf.acquisition_initialize(
+                samples=100, averages=1, channels=(0, 1))
+            chunks = list(self.uhf.acquisition_poll_chunks(samples=100))
+            self.uhf.acquisition_finalize()
+        finally:
+            self.uhf.daq.poll_chunk_size = None
+        self.assertEqual(sorted(data.keys()), [0, 1])
+        for n in data:
+            self.assertEqual(len(data[n]), 100)
+            assert np.all((data[n] >= 0) & (data[n] < 1))
+            np.testing.assert_array_equal(
+                np.concatenate([chunk[n] for chunk in chunks]), data[n])
+
     def test_reset_waveforms_zeros(self):
         self.uhf.wave_ch1_cw003(np.ones(80))
         assert np.allclose(self.uhf.wave_ch1_cw003(), np.ones(80))
@@ -22,6 +22,26 @@ class Test_ZI_HDAWG8(unittest.TestCase):
     def test_instantiation(self):
         self.assertEqual(Test_ZI_HDAWG8.hd.devname, 'dev8026')
 
+    def test_lazy_node_parameters(self):
+        hd = Test_ZI_HDAWG8.hd
+        # Whitelisted parameters are created so they are in the snapshot
+        assert 'sigouts_0_on' in hd.parameters.keys()
+        assert 'sigouts_0_on' in hd.snapshot()['parameters']
+
+        name = sorted(hd.parameters.lazy_names)[0]
+        assert name in hd.parameters
+        assert name not in hd.parameters.keys()
+        par = getattr(hd, name)
+        assert name in hd.parameters.keys()
+        assert hd.parameters[name] is par
+
+        names = hd.create_node_parameters('sigouts_?_delay')
+        self.assertEqual(len(names), 8)
+        assert not set(names) & hd.parameters.lazy_names
+
+        with self.assertRaises(KeyError):
+            hd.parameters['not_a_node']
+
     def test_dynamic_waveform_upload(self):
         Test_ZI_HDAWG8.hd.system_clocks_referenceclock_source(1)
         Test_ZI_HDAWG8.hd.cfg_codeword_protocol('microwave')
@@ -56,3 +76,56 @@ class Test_ZI_HDAWG8(unittest.TestCase):
         # Now the compilation must have been executed again
         self.assertEqual(
             Test_ZI_HDAWG8.hd._awgModule.get_compilation_count(0), 2)
+
+    def test_compilation_cache(self):
+        program = 'while (1) {\n  waitDIOTrigger();\n}\n'
+        Test_ZI_HDAWG8.hd.configure_awg_from_string(1, program)
+        count = Test_ZI_HDAWG8.hd._awgModule.get_compilation_count(1)
+
+        # An unchanged program is not compiled again
+        Test_ZI_HDAWG8.hd.configure_awg_from_string(1, program)
+        self.assertEqual(
+            Test_ZI_HDAWG8.hd._awgModule.get_compilation_count(1), count)
+
+        # Unless explicitly requested
+        Test_ZI_HDAWG8.hd.configure_awg_from_string(1, program, force=True)
+        self.assertEqual(
+            Test_ZI_HDAWG8.hd._awgModule.get_compilation_count(1), count + 1)
+
+        Test_ZI_HDAWG8.hd.invalidate_awg_program_cache()
+        Test_ZI_HDAWG8.hd.configure_awg_from_string(1, program)
+        self.assertEqual(
+            Test_ZI_HDAWG8.hd._awgModule.get_compilation_count(1), count + 2)
+
+        # A changed program is compiled
+        Test_ZI_HDAWG8.hd.configure_awg_from_string(1, '// new\n' + program)
+        self.assertEqual(
+            Test_ZI_HDAWG8.hd._awgModule.get_compilation_count(1), count + 3)
+
+    def test_binary_waveform_files(self):
+        hd = Test_ZI_HDAWG8.hd
+        npy_fn = hd._get_waveform_filename('wave_ch1_cw001', '.npy')
+        csv_fn = hd._get_waveform_filename('wave_ch1_cw001', '.csv')
+        hd.upload_codeword_program()
+        hd.start()
+        hd.stop()
+
+        # Only the binary file is written when the waveform changes
+        csv_mtime = os.path.getmtime(csv_fn)
+        # a new length, such that the program is compiled on the next start
+        waveform = numpy.linspace(0, 1, len(hd.wave_ch1_cw001()) + 8)
+        hd.wave_ch1_cw001(waveform)
+        numpy.testing.assert_array_equal(numpy.load(npy_fn), waveform)
+        self.assertEqual(os.path.getmtime(csv_fn), csv_mtime)
+
+        # The CSV file is written before compiling
+        hd.start()
+        hd.stop()
+        numpy.testing.assert_array_almost_equal(
+            numpy.genfromtxt(csv_fn, delimiter=','), waveform)
+
+        # Waveforms that are only stored as CSV are converted
+        os.remove(npy_fn)
+        hd._awg_waveforms.pop('wave_ch1_cw001')
+        numpy.testing.assert_array_almost_equal(hd.wave_ch1_cw001(), waveform)
+        self.assertTrue(os.path.isfile(npy_fn))
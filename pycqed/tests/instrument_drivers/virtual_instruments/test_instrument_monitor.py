@@ -0,0 +1,105 @@
+import time
+import types
+import unittest
+
+from qcodes import station as st
+from qcodes.instrument.base import Instrument
+from qcodes.instrument.parameter import ManualParameter
+from pycqed.instrument_drivers.virtual_instruments import instrument_monitor as im
+
+
+class RecordingTree:
+    """
+    Replaces the snapshot widget, records the data that is sent to it.
+    """
+
+    def __init__(self):
+        self.data = []
+
+    def setData(self, data):
+        self.data.append(data)
+
+    def show(self):
+        pass
+
+    def setWindowTitle(self, title):
+        pass
+
+    def resize(self, *size):
+        pass
+
+
+class HeadlessInstrumentMonitor(im.InstrumentMonitor):
+    """
+    Instrument monitor that does not start the pyqtgraph process.
+    """
+    proc = True
+    rpg = types.SimpleNamespace(QcSnaphotWidget=RecordingTree)
+
+
+class Test_InstrumentMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.station = st.Station()
+        self.dummy = Instrument('dummy_instrument')
+        for name in ['a', 'b']:
+            self.dummy.add_parameter(name, initial_value=0,
+                                     parameter_class=ManualParameter)
+        self.station.add_component(self.dummy)
+        self.monitor = HeadlessInstrumentMonitor('IM', self.station)
+
+    def tearDown(self):
+        self.monitor.close()
+        self.dummy.close()
+
+    def test_get_snapshot_changes(self):
+        self.monitor.update_in_background(False)
+        # the monitor is updated when it is created, this sends all
+        # parameters to the widget
+        self.assertEqual(len(self.monitor.tree.data), 1)
+        first_changes = self.monitor.tree.data[0]
+        self.assertEqual(list(first_changes.keys()), ['dummy_instrument'])
+        self.assertEqual(
+            set(first_changes['dummy_instrument']['parameters'].keys()),
+            set(self.dummy.parameters.keys()))
+
+        self.assertEqual(self.monitor.get_snapshot_changes(), {})
+
+        self.dummy.b(5)
+        changes = self.monitor.get_snapshot_changes()
+        self.assertEqual(list(changes.keys()), ['dummy_instrument'])
+        self.assertEqual(
+            list(changes['dummy_instrument']['parameters'].keys()), ['b'])
+        self.assertEqual(
+            changes['dummy_instrument']['parameters']['b']['value'], 5)
+        self.assertEqual(self.monitor.get_snapshot_changes(), {})
+
+    def test_background_updates(self):
+        # a remote monitor is updated in the background by default
+        self.assertTrue(self.monitor.update_in_background())
+        thread = self.monitor._update_thread
+        self.assertTrue(thread.is_alive())
+
+        self.dummy.a(3)
+        # only requests an update from the background thread
+        self.monitor.update(force=True)
+        t0 = time.time()
+        while len(self.monitor.tree.data) < 2 and time.time() - t0 < 5:
+            time.sleep(0.01)
+        self.assertEqual(len(self.monitor.tree.data), 2)
+        self.assertEqual(
+            list(self.monitor.tree.data[1]['dummy_instrument'][
+                'parameters'].keys()), ['a'])
+
+        self.monitor.update_in_background(False)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.monitor.update_in_background())
+        self.assertIsNone(self.monitor._update_thread)
+
+        # without background updates, update updates the widget directly
+        self.dummy.a(4)
+        self.monitor.update(force=True)
+        self.assertEqual(len(self.monitor.tree.data), 3)
+
+        self.monitor.start_background_updates()
+        self.assertTrue(self.monitor._update_thread.is_alive())
@@ -2,6 +2,7 @@ import os
 import pycqed as pq
 import unittest
 import numpy as np
+import h5py
 from scipy.spatial import ConvexHull
 import adaptive
 import pycqed.analysis.analysis_toolbox as a_tools
@@ -162,6 +163,27 @@ class Test_MeasurementControl(unittest.TestCase):
         d = self.MC.detector_function
         self.assertEqual(d.times_called, 1)
 
+    def test_plotmon_decimation(self):
+        sweep_pts = np.linspace(0, 10, 5000)
+        self.MC.set_sweep_function(None_Sweep(sweep_control="hard"))
+        self.MC.set_sweep_points(sweep_pts)
+        self.MC.set_detector_function(det.Dummy_Detector_Hard())
+        old_max_pts = self.MC.plotting_max_pts()
+        self.MC.plotting_max_pts(100)
+        try:
+            dat = self.MC.run("1D_hard_decimated")
+        finally:
+            self.MC.plotting_max_pts(old_max_pts)
+        dset = dat["dset"]
+
+        x_plot = self.MC.curves[0]["config"]["x"]
+        y_plot = self.MC.curves[0]["config"]["y"]
+        assert 0 < len(y_plot) <= 100
+        assert np.all(np.diff(x_plot) > 0)
+        # min/max decimation preserves the extrema of the trace
+        assert np.max(y_plot) == np.max(dset[:, 1])
+        assert np.min(y_plot) == np.min(dset[:, 1])
+
     def test_soft_sweep_2D(self):
         sweep_pts = np.linspace(0, 10, 30)
         sweep_pts_2D = np.linspace(0, 10, 5)
@@ -287,6 +309,44 @@ class Test_MeasurementControl(unittest.TestCase):
         d = self.MC.detector_function
         self.assertEqual(d.times_called, 10)
 
+    def test_exception_before_dataset_creation(self):
+        sweep_pts = np.linspace(0, 10, 30)
+        self.MC.set_sweep_function(None_Sweep())
+        self.MC.set_sweep_points(sweep_pts)
+        self.MC.set_detector_function(det.Dummy_Detector_Soft())
+        self.MC.run("before_exception")
+
+        def raise_exception():
+            raise RuntimeError("catalog unavailable")
+
+        # the closed dataset of the previous run must not be finalized
+        self.MC.add_to_measurement_catalog = raise_exception
+        try:
+            with self.assertRaisesRegex(RuntimeError, "catalog unavailable"):
+                self.MC.run("exception")
+        finally:
+            del self.MC.add_to_measurement_catalog
+        self.assertIsNone(
+            getattr(self.MC, "_instrument_settings_thread", None))
+
+    def test_streaming_shots_hard_sweep(self):
+        sweep_pts = np.arange(50)
+        self.MC.set_sweep_function(None_Sweep(sweep_control="hard"))
+        self.MC.set_sweep_points(sweep_pts)
+        self.MC.set_detector_function(
+            det.Dummy_Shots_Detector(max_shots=10, streaming=True, chunk_size=3)
+        )
+        dat = self.MC.run("streaming_shots")
+        # the data of streaming detectors is only stored in the datafile
+        self.assertIsNone(dat["dset"])
+        with h5py.File(self.MC.data_object.filepath, "r") as f:
+            dset = f["Experimental Data"]["Data"][()]
+
+        self.assertEqual(np.shape(dset), (len(sweep_pts), 2))
+        np.testing.assert_array_almost_equal(dset[:, 0], sweep_pts)
+        np.testing.assert_array_almost_equal(dset[:, 1], sweep_pts)
+        self.assertEqual(self.MC.detector_function.times_called, 5)
+
     def test_variable_sized_return_values_hard_sweep(self):
         """
         Tests a detector that acquires data in chunks of varying sizes
@@ -501,6 +561,145 @@ class Test_MeasurementControl(unittest.TestCase):
         np.testing.assert_array_almost_equal(x, sweep_pts)
         np.testing.assert_array_almost_equal(y0, y_exp, decimal=5)
 
+    def test_buffered_datawriting(self):
+        self.mock_parabola.noise(0)
+        self.mock_parabola.x(0)
+        sweep_pts = np.linspace(0, 10, 30)
+        self.MC.soft_avg(3)
+        self.MC.set_sweep_function(self.mock_parabola.x)
+        self.MC.set_sweep_points(sweep_pts)
+        self.MC.set_detector_function(self.mock_parabola.parabola)
+        dat_ref = self.MC.run("1D_soft_unbuffered")
+
+        self.MC.cfg_buffered_datawriting(True)
+        self.MC.cfg_flush_nr_rows(7)
+        try:
+            self.MC.set_sweep_function(self.mock_parabola.x)
+            self.MC.set_sweep_points(sweep_pts)
+            self.MC.set_detector_function(self.mock_parabola.parabola)
+            dat = self.MC.run("1D_soft_buffered")
+        finally:
+            self.MC.cfg_buffered_datawriting(False)
+            self.MC.cfg_flush_nr_rows(1000)
+
+        with h5py.File(self.MC.data_object.filepath, "r") as f:
+            saved_dset = f["Experimental Data"]["Data"][()]
+        np.testing.assert_array_equal(saved_dset, dat["dset"])
+        np.testing.assert_array_almost_equal(saved_dset, dat_ref["dset"])
+
+    def test_buffered_datawriting_hard_sweep_soft_avg(self):
+        sweep_pts = np.arange(50)
+        self.MC.soft_avg(5)
+        self.MC.cfg_buffered_datawriting(True)
+        try:
+            self.MC.set_sweep_function(None_Sweep(sweep_control="hard"))
+            self.MC.set_sweep_points(sweep_pts)
+            self.MC.set_detector_function(det.Dummy_Detector_Hard())
+            dat = self.MC.run("1D_hard_buffered")
+        finally:
+            self.MC.cfg_buffered_datawriting(False)
+
+        with h5py.File(self.MC.data_object.filepath, "r") as f:
+            saved_dset = f["Experimental Data"]["Data"][()]
+        np.testing.assert_array_equal(saved_dset, dat["dset"])
+        x = saved_dset[:, 0]
+        np.testing.assert_array_almost_equal(x, sweep_pts)
+        np.testing.assert_array_almost_equal(saved_dset[:, 1], np.sin(x / np.pi))
+        np.testing.assert_array_almost_equal(saved_dset[:, 2], np.cos(x / np.pi))
+
+    def test_pipelined_hard_sweep_2D_soft_avg(self):
+        class Counting_Detector_Hard(det.Dummy_Detector_Hard):
+            # adds the number of previous calls to the values, such that
+            # the average depends on which calls are stored in which row
+            def get_values(self):
+                nr_calls = self.times_called
+                return super().get_values() + nr_calls
+
+        sweep_pts = np.arange(5)
+        sweep_pts_2D = np.linspace(5, 10, 4)
+        self.MC.soft_avg(3)
+        self.MC.live_plot_enabled(False)
+        self.MC.cfg_pipelined_hard_sweeps(True)
+        try:
+            self.MC.set_sweep_function(None_Sweep(sweep_control="hard"))
+            self.MC.set_sweep_function_2D(None_Sweep(sweep_control="soft"))
+            self.MC.set_sweep_points(sweep_pts)
+            self.MC.set_sweep_points_2D(sweep_pts_2D)
+            self.MC.set_detector_function(Counting_Detector_Hard())
+            dat = self.MC.run("2D_hard_pipelined", mode="2D")
+        finally:
+            self.MC.cfg_pipelined_hard_sweeps(False)
+            self.MC.live_plot_enabled(True)
+
+        dset = dat["dset"]
+        x = dset[:, 0]
+        np.testing.assert_array_almost_equal(
+            x, np.tile(sweep_pts, len(sweep_pts_2D)))
+        np.testing.assert_array_almost_equal(
+            dset[:, 1], np.repeat(sweep_pts_2D, len(sweep_pts)))
+        # The rows are acquired in order for every soft average, row i is
+        # the mean of the calls i, i + 4 and i + 8.
+        mean_nr_calls = np.repeat(
+            np.arange(len(sweep_pts_2D)) + len(sweep_pts_2D), len(sweep_pts))
+        np.testing.assert_array_almost_equal(
+            dset[:, 2], np.sin(x / np.pi) + mean_nr_calls)
+        np.testing.assert_array_almost_equal(
+            dset[:, 3], np.cos(x / np.pi) + mean_nr_calls)
+        d = self.MC.detector_function
+        self.assertEqual(d.times_called, 3 * len(sweep_pts_2D))
+
+        with h5py.File(self.MC.data_object.filepath, "r") as f:
+            timings = read_dict_from_hdf5(
+                {}, f["MC settings"]["hard sweep timings"])
+        for stage in ["prepare", "acquisition", "waiting", "storing"]:
+            assert stage in timings
+        assert timings["acquisition"]["count"] == 3 * len(sweep_pts_2D)
+
+    def test_preallocated_compressed_datafile(self):
+        self.MC.soft_avg(1)
+        self.MC.cfg_data_compression("lzf")
+        try:
+            self.MC.set_sweep_function(None_Sweep(sweep_control="soft"))
+            self.MC.set_sweep_function_2D(None_Sweep(sweep_control="soft"))
+            self.MC.set_sweep_points(np.linspace(0, 1, 7))
+            self.MC.set_sweep_points_2D(np.linspace(0, 1, 5))
+            self.MC.set_detector_function(det.Dummy_Detector_Soft())
+            dat = self.MC.run("2D_soft_lzf", mode="2D")
+        finally:
+            self.MC.cfg_data_compression(None)
+
+        with h5py.File(self.MC.data_object.filepath, "r") as f:
+            h5_dset = f["Experimental Data"]["Data"]
+            self.assertEqual(h5_dset.compression, "lzf")
+            self.assertEqual(h5_dset.chunks[0] % 7, 0)
+            saved_dset = h5_dset[()]
+        self.assertEqual(saved_dset.shape, (35, 4))
+        np.testing.assert_array_equal(saved_dset, dat["dset"])
+
+    def test_background_snapshot_saving(self):
+        self.MC.soft_avg(1)
+        for save_legacy in [True, False]:
+            self.MC.cfg_save_legacy_instrument_settings(save_legacy)
+            try:
+                self.MC.set_sweep_function(None_Sweep(sweep_control="soft"))
+                self.MC.set_sweep_points(np.arange(5))
+                self.MC.set_detector_function(det.Dummy_Detector_Soft())
+                self.MC.run("snapshot_saving")
+            finally:
+                self.MC.cfg_save_legacy_instrument_settings(True)
+
+            with h5py.File(self.MC.data_object.filepath, "r") as f:
+                self.assertIn(
+                    self.mock_parabola.name, f["Snapshot"]["instruments"].keys()
+                )
+                self.assertEqual("Instrument settings" in f, save_legacy)
+                if save_legacy:
+                    self.assertEqual(
+                        f["Instrument settings"][self.mock_parabola.name].attrs[
+                            "noise"],
+                        str(self.mock_parabola.noise()),
+                    )
+
     def test_adaptive_measurement_nelder_mead(self):
         self.MC.soft_avg(1)
         self.mock_parabola.noise(0)
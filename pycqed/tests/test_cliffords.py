@@ -251,6 +251,15 @@ class TestCliffordCalculus(unittest.TestCase):
             Cl_inv = Cl.get_inverse()
             self.assertTrue((Cl_inv*Cl).idx == 0)
 
+    def test_single_qubit_product_table(self):
+        products, inverses = tqc.get_single_qubit_clifford_product_table()
+        for i in range(24):
+            for j in range(24):
+                ptm = np.dot(clifford_group_single_qubit[i],
+                             clifford_group_single_qubit[j])
+                self.assertEqual(products[i][j], tqc.get_clifford_id(ptm))
+            self.assertEqual(products[inverses[i]][i], 0)
+
     def test_inverse_two_qubit_clifford(self):
         for i in test_indices_2Q:
             Cl = tqc.TwoQubitClifford(i)
@@ -343,6 +352,30 @@ class TestCliffordClassRBSeqs(unittest.TestCase):
                                           new_cliff)
 
 
+    def test_batched_randomized_benchmarking_sequences(self):
+        nr_cliffords = [20, 1, 5, 20]
+        seeds = [0, 100, 200]
+        for number_of_qubits in [1, 2]:
+            for interleaving_cl in [None, 0]:
+                sequences, recovery_cliffords = \
+                    rb.randomized_benchmarking_sequences(
+                        nr_cliffords, desired_net_cl=3,
+                        number_of_qubits=number_of_qubits,
+                        interleaving_cl=interleaving_cl, seeds=seeds)
+                for i, seed in enumerate(seeds):
+                    for j, n_cl in enumerate(nr_cliffords):
+                        cliffords = rb.randomized_benchmarking_sequence(
+                            n_cl=n_cl, desired_net_cl=3,
+                            number_of_qubits=number_of_qubits,
+                            interleaving_cl=interleaving_cl, seed=seed)
+                        assert_array_equal(sequences[i][j], cliffords)
+                        self.assertEqual(recovery_cliffords[i, j],
+                                         cliffords[-1])
+
+    def test_randomized_benchmarking_sequences_requires_seeds(self):
+        with self.assertRaises(ValueError):
+            rb.randomized_benchmarking_sequences([1, 5])
+
     def test_two_qubit_randomized_benchmarking_sequence(self):
         """
         """
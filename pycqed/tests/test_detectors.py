@@ -1,3 +1,5 @@
+import time
+import types
 import numpy as np
 import pytest
 
@@ -196,6 +198,44 @@ class TestDetectors:
         np.testing.assert_array_almost_equal(y[0], dset[:, 3])
         np.testing.assert_array_almost_equal(y[1], dset[:, 4])
 
+    def test_multi_detector_UHF_concurrent_retrieval(self):
+        def mock_UHFQC():
+            return types.SimpleNamespace(
+                sync=lambda: None, start=lambda: None, stop=lambda: None)
+
+        class SlowDetector(det.Hard_Detector):
+            def __init__(self, UHFQC, value, delay=0.3):
+                super().__init__()
+                self.UHFQC = UHFQC
+                self.AWG = UHFQC
+                self.value = value
+                self.delay = delay
+                self.value_names = ['v{}'.format(value)]
+                self.value_units = ['V']
+
+            def arm(self):
+                pass
+
+            def get_values(self, arm=True, is_single_detector=True):
+                time.sleep(self.delay)
+                return np.full((1, 4), self.value)
+
+        UHFQCs = [mock_UHFQC() for i in range(3)]
+        # the last two detectors share a UHFQC and are read sequentially
+        detectors = [SlowDetector(UHFQCs[0], 0), SlowDetector(UHFQCs[1], 1),
+                     SlowDetector(UHFQCs[2], 2), SlowDetector(UHFQCs[2], 3)]
+        dm = det.Multi_Detector_UHF(detectors)
+
+        t0 = time.time()
+        values = dm.get_values()
+        duration = time.time() - t0
+        np.testing.assert_array_equal(
+            values, np.repeat(np.arange(4)[:, None], 4, axis=1))
+        assert duration < 3 * 0.3
+
+        dm.parallel_retrieval = False
+        np.testing.assert_array_equal(dm.get_values(), values)
+
     def test_Mock_Detector(self):
         x = np.linspace(0, 20, 31)
         y = x**2
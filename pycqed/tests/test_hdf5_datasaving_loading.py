@@ -73,6 +73,47 @@ class Test_HDF5(unittest.TestCase):
             mock_parab_pars['array_like']['value'],
             np.linspace(0, 11, 23))
 
+    def test_deduplicated_snapshot_saving(self):
+        """
+        Only changed instruments are stored after the first full snapshot,
+        reading the snapshot reconstructs the full snapshot.
+        """
+        self.MC.soft_avg(1)
+        self.MC.cfg_snapshot_deduplication(True)
+        self.MC._snapshot_store.reset()
+        filepaths = []
+        try:
+            for x in [1, 1, 3]:
+                self.mock_parabola_2.x(x)
+                self.MC.set_sweep_function(self.mock_parabola.x)
+                self.MC.set_sweep_points(np.arange(3))
+                self.MC.set_detector_function(self.mock_parabola.parabola)
+                self.MC.run('test_snapshot_dedup')
+                filepaths.append(self.MC.data_object.filepath)
+        finally:
+            self.MC.cfg_snapshot_deduplication(False)
+
+        with h5py.File(filepaths[0], 'r') as f:
+            self.assertNotIn('reference_snapshot', f['Snapshot'].attrs)
+        with h5py.File(filepaths[1], 'r') as f:
+            self.assertIn('reference_snapshot', f['Snapshot'].attrs)
+            self.assertNotIn('mock_parabola_2',
+                             f['Snapshot']['instruments'].keys())
+        with h5py.File(filepaths[2], 'r') as f:
+            self.assertIn('mock_parabola_2',
+                          f['Snapshot']['instruments'].keys())
+
+        for filepath, x in zip(filepaths, [1, 1, 3]):
+            snap = h5d.read_snapshot(filepath)
+            self.assertEqual(snap['instruments'].keys(),
+                             self.station.snapshot()['instruments'].keys())
+            self.assertEqual(snap['instruments']['mock_parabola_2'][
+                'parameters']['x']['value'], x)
+            par_dict = h5d.extract_pars_from_datafile(filepath, {
+                'x': ('Snapshot/instruments/mock_parabola_2/parameters/x',
+                      'attr:value')})
+            self.assertEqual(par_dict['x'], x)
+
     def test_writing_and_reading_dicts_to_hdf5_int_keys(self):
         test_dict = {
             0: {"name": "I",        "theta": 0, "phi": 0, "type": "ge"},
@@ -7,6 +7,38 @@ import matplotlib.pyplot as plt
 import pycqed.measurement.kernel_functions_ZI as ZI_kf
 
 
+def first_order_bounce_corr_reference(sig, delay, amp, awg_sample_rate,
+                                      scope_sample_rate=None,
+                                      sim_hw_delay=False):
+    """
+    Sample by sample simulation of the real-time bounce correction
+    using a shift register, used as reference for
+    ZI_kf.first_order_bounce_corr.
+    """
+    delay_n_samples = int(round(awg_sample_rate*delay))
+    if scope_sample_rate is None:
+        scope_sample_rate = awg_sample_rate
+    shift_reg = np.zeros(delay_n_samples)
+    awg_sample_incr = awg_sample_rate/scope_sample_rate
+    previous_awg_sample_cnt = 0
+    present_awg_sample_cnt = 0
+    amp_hw = ZI_kf.coef_round(amp, force_bshift=0)
+    sigout = np.zeros(len(sig))
+
+    for i, s in enumerate(sig):
+        sigout[i] = s + amp_hw*shift_reg[-1]
+        present_awg_sample_cnt += awg_sample_incr
+        awg_sample_diff = int(present_awg_sample_cnt) - previous_awg_sample_cnt
+        if awg_sample_diff >= 1:
+            shift_reg[awg_sample_diff:] = shift_reg[:-awg_sample_diff]
+            shift_reg[:awg_sample_diff] = s*np.ones(awg_sample_diff)
+            previous_awg_sample_cnt = int(present_awg_sample_cnt)
+
+    if sim_hw_delay:
+        sigout = ZI_kf.sigdelay(sigout, int(round(8*(4+5)/awg_sample_incr)))
+    return sigout
+
+
 class Test_Kernel_functions_ZI(unittest.TestCase):
 
     @classmethod
@@ -41,6 +73,48 @@ class Test_Kernel_functions_ZI(unittest.TestCase):
         first_order_corr = signal.lfilter(b, 1.0, self.distorted_waveform)
         np.testing.assert_almost_equal(hw_corr, first_order_corr, 6)
 
+    def test_first_order_bounce_correction_reference(self):
+        # Compares to the sample by sample simulation of the hardware
+        rng = np.random.RandomState(0)
+        awg_sample_rate = 2.4e9
+        for scope_sample_rate in [awg_sample_rate, awg_sample_rate/3,
+                                  0.37*awg_sample_rate, 2.5*awg_sample_rate]:
+            for delay_n_samples in [1, 7, 100]:
+                # The reference cannot advance the shift register by more
+                # AWG samples than its length in a single scope sample.
+                if np.ceil(awg_sample_rate/scope_sample_rate) > delay_n_samples:
+                    continue
+                sig = rng.normal(size=500)
+                delay = delay_n_samples/awg_sample_rate
+                amp = rng.uniform(-0.9, 0.9)
+                for sim_hw_delay in [False, True]:
+                    hw_corr = ZI_kf.first_order_bounce_corr(
+                        sig, delay, amp, awg_sample_rate,
+                        scope_sample_rate=scope_sample_rate,
+                        sim_hw_delay=sim_hw_delay)
+                    ref_corr = first_order_bounce_corr_reference(
+                        sig, delay, amp, awg_sample_rate,
+                        scope_sample_rate=scope_sample_rate,
+                        sim_hw_delay=sim_hw_delay)
+                    np.testing.assert_array_equal(hw_corr, ref_corr)
+
+    def test_first_order_bounce_correction_short_delay(self):
+        # If every scope sample advances the AWG sample counter by at least
+        # the delay, the whole shift register holds the previous scope
+        # sample and the bounce is that sample scaled by the amplitude.
+        rng = np.random.RandomState(1)
+        awg_sample_rate = 2.4e9
+        delay = 1/awg_sample_rate
+        for scope_sample_rate in [awg_sample_rate/3, 0.37*awg_sample_rate]:
+            sig = rng.normal(size=500)
+            amp = rng.uniform(-0.9, 0.9)
+            hw_corr = ZI_kf.first_order_bounce_corr(
+                sig, delay, amp, awg_sample_rate,
+                scope_sample_rate=scope_sample_rate)
+            expected = sig + ZI_kf.coef_round(amp, force_bshift=0)*np.concatenate(
+                ([0], sig[:-1]))
+            np.testing.assert_array_equal(hw_corr, expected)
+
     def test_ideal_bounce_correction(self):
         # Construct impulse response
         impulse = np.zeros(len(self.time))
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import pytest
+from pycqed.utilities.measurement_catalog import MeasurementCatalog
+
+
+def test_measurement_catalog_indexing():
+    with tempfile.TemporaryDirectory() as datadir, \
+            tempfile.TemporaryDirectory() as catalog_dir:
+        os.makedirs(os.path.join(datadir, '20200101', '120000_Rabi'))
+        os.makedirs(os.path.join(datadir, '20200101', '130000_T1'))
+        catalog = MeasurementCatalog(
+            datadir, os.path.join(catalog_dir, 'catalog.sqlite'))
+        try:
+            assert catalog.get_measdirs('20200101') == [
+                '120000_Rabi', '130000_T1']
+
+            new_folder = os.path.join(datadir, '20200101', '140000_Ramsey')
+            os.makedirs(new_folder)
+            catalog.add_measurement(new_folder)
+            assert catalog.get_measdirs('20200101') == [
+                '120000_Rabi', '130000_T1', '140000_Ramsey']
+
+            # folders that are not added through the catalog are found
+            # because the day folder was modified
+            os.makedirs(os.path.join(datadir, '20200102', '090000_Echo'))
+            assert catalog.get_measdirs('20200102') == ['090000_Echo']
+
+            catalog.rebuild()
+            assert catalog.get_measdirs('20200102') == ['090000_Echo']
+        finally:
+            catalog.close()
+
+
+def test_measurement_catalog_coarse_mtime():
+    with tempfile.TemporaryDirectory() as datadir, \
+            tempfile.TemporaryDirectory() as catalog_dir:
+        day_folder = os.path.join(datadir, '20200101')
+        os.makedirs(os.path.join(day_folder, '120000_Rabi'))
+        catalog = MeasurementCatalog(
+            datadir, os.path.join(catalog_dir, 'catalog.sqlite'))
+        try:
+            assert catalog.get_daydirs() == ['20200101']
+            assert catalog.get_measdirs('20200101') == ['120000_Rabi']
+
+            # folders created in the same mtime tick as the last indexing
+            day_stat = os.stat(day_folder)
+            for dirname in ['130000_T1', '140000_Ramsey']:
+                os.makedirs(os.path.join(day_folder, dirname))
+            os.utime(day_folder, ns=(day_stat.st_atime_ns,
+                                     day_stat.st_mtime_ns))
+            catalog.add_measurement(os.path.join(day_folder, '130000_T1'))
+            assert catalog.get_measdirs('20200101') == [
+                '120000_Rabi', '130000_T1']
+            assert catalog.get_measdirs('20200101', force=True) == [
+                '120000_Rabi', '130000_T1', '140000_Ramsey']
+
+            datadir_stat = os.stat(datadir)
+            os.makedirs(os.path.join(datadir, '20200102', '090000_Echo'))
+            os.utime(datadir, ns=(datadir_stat.st_atime_ns,
+                                  datadir_stat.st_mtime_ns))
+            catalog.add_measurement(
+                os.path.join(datadir, '20200102', '090000_Echo'))
+            assert catalog.get_daydirs() == ['20200101', '20200102']
+            assert catalog.get_measdirs('20200102') == ['090000_Echo']
+        finally:
+            catalog.close()
+
+
+def test_measurement_catalog_missing_day():
+    with tempfile.TemporaryDirectory() as datadir, \
+            tempfile.TemporaryDirectory() as catalog_dir:
+        catalog = MeasurementCatalog(
+            datadir, os.path.join(catalog_dir, 'catalog.sqlite'))
+        try:
+            with pytest.raises(FileNotFoundError):
+                catalog.get_measdirs('20200101')
+        finally:
+            catalog.close()
+
+
+def test_measurement_catalog_listdir_calls(monkeypatch):
+    with tempfile.TemporaryDirectory() as datadir, \
+            tempfile.TemporaryDirectory() as catalog_dir:
+        os.makedirs(os.path.join(datadir, '20200101', '120000_Rabi'))
+        catalog = MeasurementCatalog(
+            datadir, os.path.join(catalog_dir, 'catalog.sqlite'))
+        listed_dirs = []
+        listdir = os.listdir
+
+        def counting_listdir(path):
+            listed_dirs.append(os.path.abspath(path))
+            return listdir(path)
+
+        monkeypatch.setattr(os, 'listdir', counting_listdir)
+        try:
+            # the datadir and day folder are listed once, writing the
+            # catalog does not modify them
+            for _ in range(5):
+                assert catalog.get_daydirs() == ['20200101']
+                assert catalog.get_measdirs('20200101') == ['120000_Rabi']
+            assert listed_dirs == [os.path.abspath(datadir),
+                                   os.path.join(os.path.abspath(datadir),
+                                                '20200101')]
+        finally:
+            catalog.close()
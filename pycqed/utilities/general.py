@@ -1,4 +1,5 @@
 import time
+import hashlib
 from collections import MutableMapping
 import os
 import sys
@@ -7,7 +8,7 @@ import h5py
 import string
 import json
 import datetime
-from pycqed.measurement.hdf5_data import read_dict_from_hdf5
+from pycqed.measurement.hdf5_data import read_snapshot
 from pycqed.analysis import analysis_toolbox as a_tools
 import errno
 import pycqed as pq
@@ -252,8 +253,7 @@ def load_settings_onto_instrument_v2(instrument, load_from_instr: str = None,
         try:
 
             f = h5py.File(filepath, 'r')
-            snapshot = {}
-            read_dict_from_hdf5(snapshot, h5_group=f['Snapshot'])
+            snapshot = read_snapshot(f)
 
             if load_from_instr is None:
                 ins_group = snapshot['instruments'][instrument_name]
@@ -742,6 +742,41 @@ def get_module_name(obj, level=-1):
     """
     return obj.__module__.split(".")[level]
 
+
+def _update_fingerprint(hasher, value):
+    if isinstance(value, np.ndarray):
+        hasher.update(repr((value.dtype.str, value.shape)).encode('utf-8'))
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b'{')
+        for key, val in value.items():
+            _update_fingerprint(hasher, key)
+            _update_fingerprint(hasher, val)
+        hasher.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b'[' if isinstance(value, list) else b'(')
+        for val in value:
+            _update_fingerprint(hasher, val)
+        hasher.update(b']')
+    else:
+        hasher.update(repr(value).encode('utf-8'))
+    hasher.update(b',')
+
+
+def get_fingerprint(*values) -> str:
+    """
+    Returns a hash of the given values, e.g., parameter values and
+    waveforms. Used to detect whether the inputs of an expensive operation
+    (such as uploading waveforms) changed since it was last executed.
+
+    Numpy arrays are hashed by their content, containers recursively and
+    all other values by their repr.
+    """
+    hasher = hashlib.sha1()
+    for value in values:
+        _update_fingerprint(hasher, value)
+    return hasher.hexdigest()
+
 # Handy things to print the traceback of exceptions
 
 
@@ -0,0 +1,211 @@
+"""
+Persistent catalog of the measurement folders in a datadir.
+
+The datadir is structured as "datadir/YYYYMMDD/hhmmss_label/". Listing
+these folders is slow on large (network mounted) datadirs. The catalog
+stores the measurement folders of every day folder in an SQLite database,
+together with the modification time of the day folder when it was indexed.
+A day folder is only listed again when its modification time changed, e.g.,
+when a measurement folder was added by a process that does not update the
+catalog. The day folders themselves are stored in the same way, keyed on
+the modification time of the datadir.
+
+As the modification time of (network mounted) folders can be coarse, a
+folder added by another process in the same tick as the last indexing is
+not seen. Lookups that miss should therefore index again with force=True.
+
+The database is stored in the cache directory of the user and not in the
+datadir, as writing it would change the modification time of the datadir
+(and the datadir may be read-only).
+
+The MeasurementControl adds every new measurement to the catalog and the
+timestamp lookup functions in the analysis_toolbox use it as a fast path.
+"""
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+from pycqed.utilities.user_cache_dir import get_user_cache_dir
+
+log = logging.getLogger(__name__)
+
+default_catalog_dir = get_user_cache_dir('measurement_catalog')
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(datadir: str):
+    """
+    Returns the catalog of a datadir or None if no catalog can be
+    opened.
+    """
+    datadir = os.path.abspath(datadir)
+    with _catalogs_lock:
+        if datadir not in _catalogs:
+            try:
+                _catalogs[datadir] = MeasurementCatalog(datadir)
+            except (sqlite3.Error, OSError) as e:
+                log.warning('Could not open measurement catalog in '
+                            '"{}": {}'.format(datadir, e))
+                _catalogs[datadir] = None
+        return _catalogs[datadir]
+
+
+class MeasurementCatalog:
+    """
+    Catalog of the measurement folders in a datadir.
+
+    Args:
+        datadir (str): data directory containing the day folders.
+        filepath (str): path of the SQLite database, by default a file
+            named after the hash of the datadir in default_catalog_dir.
+    """
+
+    def __init__(self, datadir: str, filepath: str = None):
+        self.datadir = os.path.abspath(datadir)
+        if filepath is None:
+            os.makedirs(default_catalog_dir, mode=0o700, exist_ok=True)
+            filepath = os.path.join(
+                default_catalog_dir, hashlib.sha1(
+                    self.datadir.encode('utf-8')).hexdigest() + '.sqlite')
+        self.filepath = filepath
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.filepath, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS days ('
+                'daystamp TEXT PRIMARY KEY, mtime INTEGER)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS measurements ('
+                'daystamp TEXT, timemark TEXT, dirname TEXT, '
+                'PRIMARY KEY (daystamp, dirname))')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS daydirs ('
+                'daystamp TEXT PRIMARY KEY)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS datadir ('
+                'id INTEGER PRIMARY KEY CHECK (id = 0), mtime INTEGER)')
+
+    def close(self):
+        self._conn.close()
+
+    def get_daydirs(self, force: bool = False):
+        """
+        Returns the sorted names of the folders in the datadir, listing the
+        datadir if it changed since it was last listed.
+
+        Args:
+            force (bool): list the datadir even if it did not change.
+        """
+        with self._lock:
+            mtime = os.stat(self.datadir).st_mtime_ns
+            row = self._conn.execute(
+                'SELECT mtime FROM datadir WHERE id=0').fetchone()
+            if force or row is None or row[0] != mtime:
+                daydirs = os.listdir(self.datadir)
+                with self._conn:
+                    self._conn.execute('DELETE FROM daydirs')
+                    self._conn.executemany(
+                        'INSERT INTO daydirs VALUES (?)',
+                        [(d,) for d in daydirs])
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO datadir VALUES (0, ?)',
+                        (mtime,))
+            rows = self._conn.execute(
+                'SELECT daystamp FROM daydirs ORDER BY daystamp').fetchall()
+        return [row[0] for row in rows]
+
+    def get_measdirs(self, daystamp: str, force: bool = False):
+        """
+        Returns the names of the folders in a day folder, indexing the
+        day folder if it changed since it was last indexed.
+
+        Args:
+            daystamp (str): name of the day folder (YYYYMMDD).
+            force (bool): index the day folder even if it did not change.
+
+        Raises FileNotFoundError if the day folder does not exist.
+        """
+        with self._lock:
+            self.index_day(daystamp, force=force)
+            rows = self._conn.execute(
+                'SELECT dirname FROM measurements WHERE daystamp=? '
+                'ORDER BY dirname', (daystamp,)).fetchall()
+        return [row[0] for row in rows]
+
+    def index_day(self, daystamp: str, force: bool = False):
+        """
+        Indexes the folders in a day folder if its modification time
+        differs from the modification time when it was last indexed.
+
+        Args:
+            daystamp (str): name of the day folder (YYYYMMDD).
+            force (bool): index the day folder even if it did not change.
+        """
+        day_path = os.path.join(self.datadir, daystamp)
+        with self._lock:
+            try:
+                mtime = os.stat(day_path).st_mtime_ns
+            except FileNotFoundError:
+                with self._conn:
+                    self._conn.execute(
+                        'DELETE FROM days WHERE daystamp=?', (daystamp,))
+                    self._conn.execute(
+                        'DELETE FROM measurements WHERE daystamp=?',
+                        (daystamp,))
+                raise
+            row = self._conn.execute(
+                'SELECT mtime FROM days WHERE daystamp=?',
+                (daystamp,)).fetchone()
+            if not force and row is not None and row[0] == mtime:
+                return
+            measdirs = os.listdir(day_path)
+            with self._conn:
+                self._conn.execute(
+                    'DELETE FROM measurements WHERE daystamp=?', (daystamp,))
+                self._conn.executemany(
+                    'INSERT INTO measurements VALUES (?, ?, ?)',
+                    [(daystamp, d[:6], d) for d in measdirs])
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO days VALUES (?, ?)',
+                    (daystamp, mtime))
+
+    def add_measurement(self, folder: str):
+        """
+        Adds a new measurement folder ("datadir/YYYYMMDD/hhmmss_label")
+        to the catalog.
+
+        The folder is inserted directly, as the modification time of the
+        day folder need not change when it is created (coarse timestamps).
+        """
+        folder = os.path.abspath(folder)
+        dirname = os.path.basename(folder)
+        daystamp = os.path.basename(os.path.dirname(folder))
+        with self._lock:
+            # a day folder that was never indexed is indexed as a whole
+            row = self._conn.execute(
+                'SELECT mtime FROM days WHERE daystamp=?',
+                (daystamp,)).fetchone()
+            if row is None:
+                self.index_day(daystamp)
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO measurements VALUES (?, ?, ?)',
+                    (daystamp, dirname[:6], dirname))
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO daydirs VALUES (?)', (daystamp,))
+
+    def rebuild(self):
+        """
+        Indexes all day folders in the datadir.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute('DELETE FROM days')
+                self._conn.execute('DELETE FROM measurements')
+            for daystamp in self.get_daydirs(force=True):
+                if (daystamp[0].isdigit() and
+                        os.path.isdir(os.path.join(self.datadir, daystamp))):
+                    self.index_day(daystamp, force=True)
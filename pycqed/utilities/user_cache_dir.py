@@ -0,0 +1,16 @@
+import os
+
+
+def get_user_cache_dir(*subdirs: str):
+    """
+    Returns the path of a directory in the cache directory of the user
+    (LOCALAPPDATA on Windows, XDG_CACHE_HOME or ~/.cache otherwise),
+    e.g., get_user_cache_dir('extraction_cache') returns
+    "~/.cache/pycqed/extraction_cache". The directory is not created.
+    """
+    if os.name == 'nt':
+        base_dir = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        base_dir = os.environ.get(
+            'XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base_dir, 'pycqed', *subdirs)